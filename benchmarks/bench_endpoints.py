@@ -0,0 +1,83 @@
+"""
+Latency, throughput and SQL query counts of the API endpoints at a seeded volume.
+
+Runs in process against the pytest-django test database, with Celery in eager mode and the
+locmem email backend, so nothing but PostgreSQL is needed. Every endpoint must stay within
+its query budget from tasks/tests/helpers.py:
+
+    pytest benchmarks/bench_endpoints.py --bench-tasks 100000 --bench-users 1000 \
+        --bench-requests 200 --bench-concurrency 4
+"""
+
+import statistics
+import threading
+import time
+from contextlib import ExitStack
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tasks.tests.conftest import sign_in
+from tasks.tests.helpers import ENDPOINTS, SEED_PASSWORD, build_request
+
+
+def run_client(send, count: int, latencies: list, errors: list) -> None:
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            status_code = send(APIClient())
+            latencies.append(time.perf_counter() - started)
+            if status_code not in (200, 201):
+                errors.append(status_code)
+    finally:
+        connections.close_all()
+
+
+@pytest.mark.parametrize("name", ENDPOINTS)
+def test_endpoint(name, seeded, bench_options, bench_results):
+    endpoint = ENDPOINTS[name]
+    url, data, user = build_request(endpoint, seeded, SEED_PASSWORD)
+    headers = {}
+    if endpoint.authenticated:
+        headers["Authorization"] = f"Bearer {sign_in(APIClient(), user.email, SEED_PASSWORD)}"
+
+    def send(client: APIClient) -> int:
+        return getattr(client, endpoint.method)(url, data=data, headers=headers).status_code
+
+    # Warms the role cache, then counts the queries of one request on every database.
+    send(APIClient())
+    with ExitStack() as stack:
+        captured = [stack.enter_context(CaptureQueriesContext(db)) for db in connections.all()]
+        send(APIClient())
+    queries = sum(len(queries) for queries in captured)
+
+    concurrency = bench_options["concurrency"]
+    per_client = max(bench_options["requests"] // concurrency, 1)
+    latencies: list[float] = []
+    errors: list = []
+    threads = [
+        threading.Thread(target=run_client, args=(send, per_client, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    bench_results[name] = {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "queries": queries,
+        "budget": endpoint.budget,
+    }
+
+    assert not errors
+    assert queries <= endpoint.budget
@@ -0,0 +1,82 @@
+import pytest
+from django.core import mail
+from django.db import connections
+
+from task_manager.celery import app
+from tasks.tests.helpers import SEED_PASSWORD, seed_volume
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "endpoint benchmark (benchmarks/bench_endpoints.py)")
+    group.addoption("--bench-users", type=int, default=1000, help="users to seed")
+    group.addoption("--bench-roles", type=int, default=20, help="roles to seed")
+    group.addoption("--bench-tasks", type=int, default=100_000, help="tasks to seed")
+    group.addoption("--bench-requests", type=int, default=200, help="requests per endpoint")
+    group.addoption("--bench-concurrency", type=int, default=1, help="client threads")
+    group.addoption(
+        "--bench-response-cache",
+        action="store_true",
+        help="keep the response cache on instead of measuring uncached requests",
+    )
+
+
+@pytest.fixture(scope="session")
+def bench_options(request) -> dict:
+    return {
+        name: request.config.getoption(f"bench_{name}")
+        for name in ("users", "roles", "tasks", "requests", "concurrency", "response_cache")
+    }
+
+
+@pytest.fixture(scope="session")
+def bench_results(request) -> dict:
+    request.config.bench_results = {}
+    return request.config.bench_results
+
+
+@pytest.fixture(scope="session")
+def seeded(django_db_setup, django_db_blocker, bench_options) -> dict:
+    # Committed to the test database, which is dropped at the end of the session.
+    with django_db_blocker.unblock():
+        yield seed_volume(
+            users=bench_options["users"],
+            roles=bench_options["roles"],
+            tasks=bench_options["tasks"],
+            password=SEED_PASSWORD,
+        )
+        # Replica aliases mirror the test database and would keep it open.
+        connections.close_all()
+
+
+@pytest.fixture(autouse=True)
+def local_services(settings, django_db_blocker, bench_options):
+    # Everything runs in process: Celery tasks execute on .delay() and emails go to
+    # django.core.mail.outbox (pytest-django installs the locmem backend).
+    assert settings.EMAIL_BACKEND == "django.core.mail.backends.locmem.EmailBackend"
+    app.conf.task_always_eager = True
+    if not bench_options["response_cache"]:
+        settings.RESPONSE_CACHE_TIMEOUT = 0
+
+    with django_db_blocker.unblock():
+        yield
+
+    app.conf.task_always_eager = False
+    mail.outbox = []
+
+
+def pytest_terminal_summary(terminalreporter):
+    results = getattr(terminalreporter.config, "bench_results", None)
+    if not results:
+        return
+
+    terminalreporter.section("endpoint benchmark")
+    terminalreporter.write_line(
+        f"{'endpoint':>15} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'queries':>8} {'budget':>7}"
+    )
+    for name, result in results.items():
+        terminalreporter.write_line(
+            f"{name:>15} {result['requests']:>9} {result['rps']:>8.1f} {result['p50_ms']:>8.1f} "
+            f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['queries']:>8} "
+            f"{result['budget']:>7}"
+        )
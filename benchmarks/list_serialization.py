@@ -0,0 +1,100 @@
+"""
+Rows per second of the list serialization paths: DRF serializers and values() rows.
+
+Both paths read the same rows from the database and render them to JSON. The rows are
+inserted inside a transaction that is rolled back at the end:
+
+    DJANGO_SETTINGS_MODULE=task_manager.settings python benchmarks/list_serialization.py \
+        --rows 5000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from tasks.models import Role, Task, User  # noqa: E402
+from tasks.representation import ValuesRepresentation  # noqa: E402
+from tasks.serializers import TaskSerializer, UserSerializer  # noqa: E402
+
+
+def serializer_path(serializer_class, queryset) -> bytes:
+    return JSONRenderer().render(serializer_class(list(queryset), many=True).data)
+
+
+def values_path(serializer_class, queryset) -> bytes:
+    representation = ValuesRepresentation(serializer_class())
+    rows = list(queryset.values("id", *representation.columns))
+    return JSONRenderer().render(representation.to_representation(rows))
+
+
+def measure(path, serializer_class, queryset, repeat: int) -> tuple[float, bytes]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        content = path(serializer_class, queryset)
+        best = min(best, time.perf_counter() - started)
+    return best, content
+
+
+def create_rows(rows: int) -> None:
+    role = Role.objects.order_by("id").first()
+    users = User.objects.bulk_create(
+        User(email=f"bench{index}@mail.com", first_name=f"User {index}")
+        for index in range(max(rows // 10, 1))
+    )
+    User.roles.through.objects.bulk_create(
+        User.roles.through(user_id=user.id, role_id=role.id) for user in users
+    )
+    Task.objects.bulk_create(
+        (
+            Task(
+                title=f"task {index}",
+                description="description " * 10,
+                status="NIC"[index % 3],
+                created_by=users[index % len(users)],
+                assigned_to=users[(index + 1) % len(users)],
+            )
+            for index in range(rows)
+        ),
+        batch_size=1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("tasks", TaskSerializer, Task.objects.order_by("id")),
+        ("users", UserSerializer, User.objects.order_by("id")),
+    ]
+    with transaction.atomic():
+        create_rows(args.rows)
+        print(f"{'list':>6} {'rows':>7} {'serializer rows/s':>18} {'values rows/s':>14} {'x':>5}")
+        for name, serializer_class, queryset in cases:
+            count = queryset.count()
+            slow, expected = measure(serializer_path, serializer_class, queryset, args.repeat)
+            fast, content = measure(values_path, serializer_class, queryset, args.repeat)
+            assert content == expected, f"{name}: the paths render different JSON"
+            print(
+                f"{name:>6} {count:>7} {count / slow:>18.0f} {count / fast:>14.0f} "
+                f"{slow / fast:>5.1f}"
+            )
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Payload size and encode time of the task list in every response format and encoding.
+
+Renders the same list with each renderer, then compresses the body the way
+CompressionMiddleware does. The rows are inserted inside a transaction that is rolled back:
+
+    DJANGO_SETTINGS_MODULE=task_manager.settings python benchmarks/response_formats.py \
+        --rows 5000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import transaction  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from benchmarks.list_serialization import create_rows  # noqa: E402
+from tasks.middleware import COMPRESSORS  # noqa: E402
+from tasks.models import Task  # noqa: E402
+from tasks.renderers import MessagePackRenderer, ORJSONRenderer  # noqa: E402
+from tasks.representation import ValuesRepresentation  # noqa: E402
+from tasks.serializers import TaskSerializer  # noqa: E402
+
+RENDERERS = {
+    "json (drf)": JSONRenderer(),
+    "json (orjson)": ORJSONRenderer(),
+    "msgpack": MessagePackRenderer(),
+}
+
+
+def timed(function, argument, repeat: int) -> tuple[float, bytes]:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(argument)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with transaction.atomic():
+        create_rows(args.rows)
+        representation = ValuesRepresentation(TaskSerializer())
+        rows = list(Task.objects.order_by("id").values("id", *representation.columns))
+        data = representation.to_representation(rows)
+        transaction.set_rollback(True)
+
+    print(f"{len(data)} tasks")
+    print(f"{'format':>14} {'encoding':>9} {'bytes':>10} {'encode ms':>10} {'compress ms':>12}")
+    for name, renderer in RENDERERS.items():
+        encode, body = timed(renderer.render, data, args.repeat)
+        print(f"{name:>14} {'identity':>9} {len(body):>10} {encode * 1000:>10.1f} {0:>12.1f}")
+        for encoding, compress in COMPRESSORS.items():
+            elapsed, compressed = timed(compress, body, args.repeat)
+            print(
+                f"{name:>14} {encoding:>9} {len(compressed):>10} {encode * 1000:>10.1f} "
+                f"{elapsed * 1000:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Throughput and latency of an endpoint under a growing number of concurrent clients.
+
+Start the app in both serving modes on the same machine and run the script against each:
+
+    python manage.py runserver 0.0.0.0:8000 --noreload                  # WSGI, sync views
+    uvicorn task_manager.asgi:application --port 8001 --workers 1       # ASGI, async views
+
+    python benchmarks/serving_modes.py --url http://localhost:8000/api/tasks/ \
+        --email admin@mail.com --password admin
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def get_token(url: str, email: str, password: str) -> str:
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port)
+    connection.request(
+        "POST",
+        "/api/token/",
+        body=json.dumps({"email": email, "password": password}),
+        headers={"Content-Type": "application/json"},
+    )
+    response = connection.getresponse()
+    return json.loads(response.read())["access"]
+
+
+def run_client(url: str, token: str, count: int, latencies: list, errors: list) -> None:
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    for _ in range(count):
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path, headers={"Authorization": f"Bearer {token}"})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as exc:
+            errors.append(type(exc).__name__)
+            connection.close()
+            connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        latencies.append(time.perf_counter() - started)
+
+
+def run(url: str, token: str, concurrency: int, requests: int) -> dict:
+    latencies: list[float] = []
+    errors: list = []
+    per_client = max(requests // concurrency, 1)
+    threads = [
+        threading.Thread(target=run_client, args=(url, token, per_client, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", default="1,8,32,128")
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    token = get_token(args.url, args.email, args.password)
+    print(f"{'clients':>8} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for concurrency in map(int, args.concurrency.split(",")):
+        result = run(args.url, token, concurrency, args.requests)
+        print(
+            f"{result['concurrency']:>8} {result['requests']:>9} {result['errors']:>7} "
+            f"{result['rps']:>9.1f} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Production serving profile: gunicorn -c gunicorn.conf.py
+import multiprocessing
+import os
+import shutil
+
+wsgi_app = "task_manager.wsgi:application"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+# Django keeps one persistent connection per thread (DB_CONN_MAX_AGE), so the number of
+# threads is the size of each worker's connection pool.
+threads = int(os.getenv("DB_POOL_SIZE", 4))
+preload_app = True
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = max_requests // 10
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+accesslog = "-"
+
+# Each worker writes its request metrics to files here and /metrics merges them, so a scrape
+# that lands on any worker sees the whole server. Set before the app is loaded.
+metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/task_manager_metrics")
+
+
+def on_starting(server):
+    from django.db import connections
+
+    from task_manager.db import check_connection_capacity
+
+    if not os.getenv("METRICS_TOKEN"):
+        raise SystemExit(
+            "METRICS_TOKEN must be set: /metrics and the outbox lag are public without it"
+        )
+    # Metrics of a previous run are not carried over.
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+    required = workers * threads
+    try:
+        available = check_connection_capacity(required)
+    except Exception as exc:
+        raise SystemExit(f"Database connection pool can't be filled: {exc}")
+    finally:
+        # Forked workers must not share the master's sockets.
+        connections.close_all()
+    server.log.info(
+        "Database pool: %s workers x %s connections, %s available", workers, threads, available
+    )
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    # The counters of a dead worker still count; only its live gauges are dropped.
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,29 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+
+AVAILABLE_CONNECTIONS_SQL = """
+SELECT current_setting('max_connections')::int
+    - current_setting('superuser_reserved_connections')::int
+    - (SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend')
+"""
+
+
+def check_connection_capacity(required: int, using: str = DEFAULT_DB_ALIAS) -> int:
+    """
+    Fail unless Postgres can accept ``required`` more connections.
+
+    Raises ``OperationalError`` when the database is unreachable and
+    ``ImproperlyConfigured`` when the connection slots left are fewer than required.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(AVAILABLE_CONNECTIONS_SQL)
+        # The caller is expected to close the connection running the check.
+        available = cursor.fetchone()[0] + 1
+
+    if available < required:
+        raise ImproperlyConfigured(
+            f"The database accepts {available} more connections, {required} are required "
+            f"by the configured workers and threads."
+        )
+
+    return available
@@ -0,0 +1,64 @@
+import datetime
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tasks.cache import bump_generation
+from tasks.models import ArchivedTask, Task
+
+COMPLETED = "C"
+COLUMNS = ", ".join(field.column for field in Task._meta.concrete_fields)
+
+# One batch per transaction: rows locked by concurrent writes are skipped and picked up by a
+# later run. Deleting from the tasks table runs the counter trigger, so the stats leave
+# archived tasks out like the task list does.
+ARCHIVE_BATCH_SQL = f"""
+WITH batch AS (
+    SELECT id, created_at FROM {Task._meta.db_table}
+    WHERE status = %s AND updated_at < %s
+    ORDER BY updated_at, id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+), moved AS (
+    DELETE FROM {Task._meta.db_table} task USING batch
+    WHERE task.id = batch.id AND task.created_at = batch.created_at
+    RETURNING task.*
+)
+INSERT INTO {ArchivedTask._meta.db_table} ({COLUMNS}, archived_at)
+SELECT {COLUMNS}, now() FROM moved
+"""
+
+
+def archive_batch(before: datetime.datetime, batch_size: int) -> int:
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(ARCHIVE_BATCH_SQL, [COMPLETED, before, batch_size])
+        archived = cursor.rowcount
+        if archived:
+            bump_generation(Task)
+
+    return archived
+
+
+def archive_completed_tasks(
+    after_days: int | None = None, batch_size: int | None = None, pause: float | None = None
+) -> int:
+    """
+    Moves tasks completed more than ``after_days`` days ago to ``ArchivedTask``.
+
+    The age is counted from the last update. Works in batches of ``batch_size`` rows with
+    ``pause`` seconds between them; returns the number of tasks archived.
+    """
+    after_days = settings.TASK_ARCHIVE_AFTER_DAYS if after_days is None else after_days
+    batch_size = batch_size or settings.TASK_ARCHIVE_BATCH_SIZE
+    pause = settings.TASK_ARCHIVE_BATCH_PAUSE if pause is None else pause
+    before = timezone.now() - datetime.timedelta(days=after_days)
+
+    archived = 0
+    while True:
+        count = archive_batch(before, batch_size)
+        archived += count
+        if count < batch_size:
+            return archived
+        time.sleep(pause)
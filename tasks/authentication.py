@@ -0,0 +1,85 @@
+from typing import Any
+
+from django.utils.functional import cached_property
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from tasks.constants import SystemRole
+from tasks.models import User
+
+ROLES_CLAIM = "roles"
+IS_ACTIVE_CLAIM = "is_active"
+
+
+def set_user_claims(token: Token, user: User) -> Token:
+    token[ROLES_CLAIM] = sorted(user.role_names)
+    token[IS_ACTIVE_CLAIM] = user.is_active
+    return token
+
+
+class ClaimsUser(TokenUser):
+    """User built from access token claims; the ``User`` row is loaded only on demand."""
+
+    @cached_property
+    def role_names(self) -> frozenset[str]:
+        return frozenset(self.token.get(ROLES_CLAIM, ()))
+
+    @property
+    def is_admin(self) -> bool:
+        return SystemRole.ADMIN in self.role_names
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.token.get(IS_ACTIVE_CLAIM, False))
+
+    @cached_property
+    def instance(self) -> User:
+        return User.objects.get(**{api_settings.USER_ID_FIELD: self.id})
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Trusts the ``roles``/``is_active`` claims instead of reading the users table.
+
+    Role changes and deactivation are picked up when the access token is refreshed, so they
+    take effect within ``SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"]``.
+    """
+
+    def get_user(self, validated_token: Token) -> TokenUser | User:
+        if ROLES_CLAIM not in validated_token:
+            # Tokens issued before the claims were added.
+            return super().get_user(validated_token)
+
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise exceptions.AuthenticationFailed(
+                "Token contained no recognizable user identification", code="token_not_valid"
+            )
+
+        user = ClaimsUser(validated_token)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return user
+
+
+class RoleClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user: User) -> Token:
+        return set_user_claims(super().get_token(user), user)
+
+
+class RoleClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs: dict[str, Any]) -> dict[str, str]:
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM], "is_active": True}
+        ).first()
+        if user is None:
+            raise exceptions.AuthenticationFailed("User is inactive", code="user_inactive")
+
+        set_user_claims(refresh, user)
+        return super().validate({**attrs, "refresh": str(refresh)})
@@ -0,0 +1,80 @@
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+
+from tasks.metrics import RESPONSE_CACHE_REQUESTS
+
+GENERATION_KEY = "tasks:generation:{label}"
+RESPONSE_KEY = "tasks:response:{view}:{scope}:{digest}"
+
+
+def new_version() -> str:
+    # Unique, and tells when it was made; see ``version_age``.
+    return f"{time.time():.6f}:{uuid.uuid4().hex}"
+
+
+def version_age(version: str) -> float:
+    """Seconds since ``version`` was made."""
+    try:
+        return time.time() - float(version.partition(":")[0])
+    except ValueError:
+        return float("inf")
+
+
+def bump_version(key: str) -> None:
+    # Bump now for the current connection and again after commit, so other processes
+    # can't cache the pre-commit state under the new version.
+    cache.set(key, new_version(), timeout=None)
+    transaction.on_commit(lambda: cache.set(key, new_version(), timeout=None))
+
+
+def bump_generation(*model_classes: type[models.Model]) -> None:
+    for model_class in model_classes:
+        bump_version(GENERATION_KEY.format(label=model_class._meta.label_lower))
+
+
+def get_generations(*model_classes: type[models.Model]) -> list[str]:
+    keys = [GENERATION_KEY.format(label=model._meta.label_lower) for model in model_classes]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, new_version(), timeout=None)
+            generations[key] = cache.get(key)
+
+    return [generations[key] for key in keys]
+
+
+def response_cache_key(view: str, scope: str, generations: list, request) -> str:
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    raw = repr((request.build_absolute_uri(request.path), generations, params))
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return RESPONSE_KEY.format(view=view, scope=scope, digest=digest)
+
+
+def get_cached_response(view: str, key: str):
+    data = cache.get(key)
+    record_response_cache(view, hit=data is not None)
+    return data
+
+
+def set_cached_response(key: str, data) -> None:
+    cache.set(key, data, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+
+
+def record_response_cache(view: str, hit: bool) -> None:
+    RESPONSE_CACHE_REQUESTS.labels(view, "hits" if hit else "misses").inc()
+
+
+def response_cache_stats() -> dict[str, dict[str, int]]:
+    """Hits and misses of the response cache in this process, by view."""
+    stats: dict[str, dict[str, int]] = {}
+    for metric in RESPONSE_CACHE_REQUESTS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total"):
+                view, result = sample.labels["view"], sample.labels["result"]
+                stats.setdefault(view, {"hits": 0, "misses": 0})[result] = int(sample.value)
+    return stats
@@ -0,0 +1,96 @@
+import csv
+import itertools
+import json
+from typing import AsyncIterator, Iterable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+from tasks.representation import get_converter
+from tasks.serializers import TaskSerializer
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "due_date",
+    "created_at",
+    "updated_at",
+    "created_by",
+    "assigned_to",
+    "updated_by",
+)
+
+
+def stream_queryset(queryset: QuerySet, chunk_size: int) -> Iterator:
+    """
+    Rows of ``queryset`` read through a server-side cursor while the response is sent.
+
+    Outside a transaction the named cursor is opened ``WITH HOLD`` and Postgres materializes
+    the whole result when the implicit transaction commits; inside one it streams the rows.
+    """
+    with transaction.atomic(using=queryset.db):
+        rows = queryset.iterator(chunk_size=chunk_size)
+        try:
+            yield from rows
+        finally:
+            rows.close()
+
+
+async def aiterate(content: Iterator[str], chunk_size: int) -> AsyncIterator[str]:
+    """
+    ``content`` pulled ``chunk_size`` items at a time through ``sync_to_async``.
+
+    Django buffers a sync iterator in full under ASGI. Thread-sensitive calls of a request run
+    on one thread, so the cursor and the transaction of ``stream_queryset`` stay on the thread
+    that opened them, and are closed there.
+    """
+    chunk = sync_to_async(lambda: "".join(itertools.islice(content, chunk_size)))
+    try:
+        while part := await chunk():
+            yield part
+    finally:
+        await sync_to_async(content.close)()
+
+
+def export_rows(rows: Iterable[tuple]) -> Iterator[list]:
+    # Same output as TaskSerializer; relations are exported as ids, like the serializer does.
+    fields = TaskSerializer().fields
+    converters = [
+        (index, converter)
+        for index, name in enumerate(EXPORT_FIELDS)
+        if not isinstance(fields[name], serializers.RelatedField)
+        and (converter := get_converter(fields[name]))
+    ]
+    for row in rows:
+        row = list(row)
+        for index, converter in converters:
+            if row[index] is not None:
+                row[index] = converter(row[index])
+        yield row
+
+
+def stream_ndjson(rows: Iterable[tuple]) -> Iterator[str]:
+    for row in export_rows(rows):
+        yield json.dumps(
+            dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + "\n"
+
+
+class _Echo:
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(rows: Iterable[tuple]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in export_rows(rows):
+        yield writer.writerow(row)
+
+
+STREAMS = {"ndjson": stream_ndjson, "csv": stream_csv}
@@ -1,6 +1,15 @@
+import datetime
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, Q
+from django.utils import timezone
 from django_filters import rest_framework as filters
 
-from tasks.models import TASK_STATUS_CHOICES, Task, User
+from tasks.models import TASK_SEARCH_CONFIG, TASK_STATUS_CHOICES, Task, TaskWithArchived, User
+
+
+def start_of_day(value: datetime.date) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(value, datetime.time.min))
 
 
 class UserFilter(filters.FilterSet):
@@ -19,10 +28,33 @@ class TaskFilter(filters.FilterSet):
     due_date = filters.DateFilter(field_name="due_date")
     due_date_from = filters.DateFilter(field_name="due_date", lookup_expr="gte")
     due_date_to = filters.DateFilter(field_name="due_date", lookup_expr="lte")
+    created_from = filters.DateFilter(method="filter_created_from")
+    created_to = filters.DateFilter(method="filter_created_to")
+    search = filters.CharFilter(method="filter_search")
+
+    # created_at is compared with timestamps, not cast to a date, so that the planner prunes
+    # the partitions of the tasks table.
+    def filter_created_from(self, queryset, name, value):
+        return queryset.filter(created_at__gte=start_of_day(value))
+
+    def filter_created_to(self, queryset, name, value):
+        return queryset.filter(created_at__lt=start_of_day(value + datetime.timedelta(days=1)))
 
     def filter_title(self, queryset, name, value):
         return queryset.filter(title__icontains=value)
 
+    def filter_search(self, queryset, name, value):
+        # Full-text match over title and description, or a typo-tolerant match on the title;
+        # both are served by GIN indexes.
+        query = SearchQuery(value, config=TASK_SEARCH_CONFIG, search_type="websearch")
+        return (
+            queryset.filter(Q(search_vector=query) | Q(title__trigram_word_similar=value))
+            .annotate(
+                rank=SearchRank(F("search_vector"), query) + TrigramWordSimilarity(value, "title")
+            )
+            .order_by("-rank", "-id")
+        )
+
     class Meta:
         model = Task
         fields = [
@@ -30,3 +62,8 @@ class TaskFilter(filters.FilterSet):
             "status",
             "due_date",
         ]
+
+
+class TaskWithArchivedFilter(TaskFilter):
+    class Meta(TaskFilter.Meta):
+        model = TaskWithArchived
@@ -1,7 +1,28 @@
+import datetime
+import logging
+import time
+import uuid
+from itertools import groupby
+
 from celery import shared_task
-from django.core.mail import send_mail
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from tasks.archive import archive_completed_tasks
+from tasks.models import Notification
+from tasks.outbox import relay_lag, relay_task_events
+from tasks.partitions import analyze_tasks_table, create_task_partitions
+from tasks.purge import purge_users, schedule_deactivated_purges
+from tasks.retention import delete_delivered
+from tasks.stats import rebucket_task_counters
+
+logger = logging.getLogger(__name__)
 
-from task_manager import settings
+FLUSH_SCHEDULED_KEY = "tasks:notifications:flush_scheduled"
 
 
 @shared_task
@@ -12,3 +33,189 @@ def celery_send_email(subject, message, target_mail):
         from_email=settings.EMAIL_HOST_USER,
         recipient_list=[target_mail],
     )
+
+
+def queue_notifications(notifications: list[tuple[str, str, str]]) -> None:
+    """Store ``(subject, message, recipient)`` notifications for the next batched send."""
+    save_notifications(
+        [
+            Notification(subject=subject, message=message, recipient=recipient)
+            for subject, message, recipient in notifications
+        ]
+    )
+
+
+def save_notifications(notifications: list[Notification]) -> None:
+    # Notifications for an event that already has one are dropped, see Notification.event_id.
+    Notification.objects.bulk_create(notifications, ignore_conflicts=True)
+    transaction.on_commit(schedule_notifications_flush)
+
+
+def schedule_notifications_flush() -> None:
+    pending = Notification.objects.filter(sent_at__isnull=True).count()
+    if pending >= settings.NOTIFICATIONS_BATCH_SIZE:
+        celery_flush_notifications.delay()
+    elif cache.add(FLUSH_SCHEDULED_KEY, True, timeout=settings.NOTIFICATIONS_BATCH_WINDOW):
+        celery_flush_notifications.apply_async(countdown=settings.NOTIFICATIONS_BATCH_WINDOW)
+
+
+def build_message(recipient: str, notifications: list[Notification]) -> EmailMessage:
+    subjects = {notification.subject for notification in notifications}
+    subject = (
+        subjects.pop() if len(subjects) == 1 else f"You have {len(notifications)} notifications"
+    )
+    return EmailMessage(
+        subject=subject,
+        body="\n".join(notification.message for notification in notifications),
+        from_email=settings.EMAIL_HOST_USER,
+        to=[recipient],
+    )
+
+
+def claim_notifications(claim: uuid.UUID) -> list[Notification]:
+    """
+    Marks a batch of pending notifications with ``claim`` in a short transaction.
+
+    Rows locked or claimed by another flush are skipped, unless the claim is older than
+    ``NOTIFICATIONS_CLAIM_TIMEOUT``.
+    """
+    now = timezone.now()
+    expired = now - datetime.timedelta(seconds=settings.NOTIFICATIONS_CLAIM_TIMEOUT)
+    with transaction.atomic():
+        ids = list(
+            Notification.objects.filter(sent_at__isnull=True)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=expired))
+            .select_for_update(skip_locked=True)
+            .order_by("recipient", "id")
+            .values_list("id", flat=True)[: settings.NOTIFICATIONS_BATCH_SIZE]
+        )
+        Notification.objects.filter(id__in=ids).update(claim=claim, claimed_at=now)
+    return list(Notification.objects.filter(claim=claim).order_by("recipient", "id"))
+
+
+@shared_task
+def celery_flush_notifications() -> dict:
+    cache.delete(FLUSH_SCHEDULED_KEY)
+    started = time.monotonic()
+    sent_messages = sent_notifications = 0
+    connection = get_connection()
+
+    with connection:
+        while True:
+            claim = uuid.uuid4()
+            batch = claim_notifications(claim)
+            if not batch:
+                break
+
+            # Sent outside of any transaction, so a slow SMTP server holds no locks. Several
+            # notifications for the same recipient become one message.
+            sent = []
+            try:
+                for recipient, notifications in groupby(batch, key=lambda n: n.recipient):
+                    notifications = list(notifications)
+                    connection.send_messages([build_message(recipient, notifications)])
+                    sent += notifications
+                    sent_messages += 1
+            finally:
+                with transaction.atomic():
+                    Notification.objects.filter(id__in=[n.id for n in sent]).update(
+                        sent_at=timezone.now()
+                    )
+                    # Left for the next flush after a failed send.
+                    Notification.objects.filter(claim=claim, sent_at__isnull=True).update(
+                        claim=None, claimed_at=None
+                    )
+            sent_notifications += len(sent)
+
+    elapsed = time.monotonic() - started
+    metrics = {
+        "messages": sent_messages,
+        "notifications": sent_notifications,
+        "seconds": round(elapsed, 3),
+        "messages_per_second": round(sent_messages / elapsed, 1) if elapsed else 0.0,
+    }
+    logger.info("Sent notifications: %s", metrics)
+    return metrics
+
+
+@shared_task
+def celery_process_task_events(events: list[tuple[int, int, str, dict]]) -> None:
+    """
+    Handles one relayed batch of ``(event_id, task_id, kind, payload)`` task events.
+
+    A batch may be delivered again, so at most one notification is stored per event.
+    """
+    notifications = [
+        Notification(
+            subject="You have been assigned a new task",
+            message=f"Task id - {task_id}",
+            recipient=payload["email"],
+            event_id=event_id,
+        )
+        for event_id, task_id, kind, payload in events
+        if kind == "assigned" and payload.get("email")
+    ]
+    if notifications:
+        save_notifications(notifications)
+
+
+@shared_task
+def celery_relay_task_events() -> dict:
+    relayed = 0
+    while True:
+        count = relay_task_events()
+        relayed += count
+        if count < settings.TASK_EVENTS_RELAY_BATCH_SIZE:
+            break
+
+    metrics = {"relayed": relayed, **relay_lag()}
+    logger.info("Relayed task events: %s", metrics)
+    return metrics
+
+
+@shared_task
+def celery_delete_delivered() -> dict:
+    started = time.monotonic()
+    metrics = {**delete_delivered(), "seconds": round(time.monotonic() - started, 3)}
+    logger.info("Deleted delivered rows: %s", metrics)
+    return metrics
+
+
+@shared_task
+def celery_create_task_partitions() -> list[str]:
+    created = create_task_partitions()
+    analyze_tasks_table()
+    if created:
+        logger.info("Created task partitions: %s", ", ".join(created))
+    return created
+
+
+@shared_task
+def celery_archive_completed_tasks() -> dict:
+    started = time.monotonic()
+    archived = archive_completed_tasks()
+    metrics = {"archived": archived, "seconds": round(time.monotonic() - started, 3)}
+    logger.info("Archived completed tasks: %s", metrics)
+    return metrics
+
+
+@shared_task
+def celery_rebucket_task_counters() -> int:
+    moved = rebucket_task_counters()
+    logger.info("Moved %s tasks to the due buckets of today", moved)
+    return moved
+
+
+@shared_task
+def celery_purge_users() -> dict:
+    started = time.monotonic()
+    scheduled = schedule_deactivated_purges()
+    processed = purge_users()
+    metrics = {
+        "scheduled": scheduled,
+        "processed": processed,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+    if scheduled or processed:
+        logger.info("Purged deactivated users: %s", metrics)
+    return metrics
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.partitions import create_task_partitions
+
+
+class Command(BaseCommand):
+    help = "Create the monthly partitions of the tasks table ahead of time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=settings.TASK_PARTITIONS_AHEAD)
+
+    def handle(self, *args, ahead: int, **options):
+        created = create_task_partitions(ahead)
+        self.stdout.write(
+            f"Created {len(created)} partitions{': ' + ', '.join(created) if created else ''}."
+        )
@@ -0,0 +1,35 @@
+import math
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.models import User
+from tasks.purge import purge_users, schedule_user_purge
+
+
+class Command(BaseCommand):
+    help = "Schedule the purge of a deactivated user: their tasks are reassigned or deleted."
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_id", type=int)
+        parser.add_argument(
+            "--reassign-to", type=int, help="Id of the user to give the tasks to instead."
+        )
+        parser.add_argument(
+            "--now", action="store_true", help="Run the scheduled purges here instead of Celery."
+        )
+
+    def handle(self, *args, user_id: int, reassign_to: int | None, now: bool, **options):
+        try:
+            user = User.objects.get(id=user_id)
+            target = User.objects.get(id=reassign_to) if reassign_to else None
+            purge = schedule_user_purge(user, target)
+        except (User.DoesNotExist, ValueError) as error:
+            raise CommandError(error)
+
+        self.stdout.write(f"Scheduled the purge of user {user_id}.")
+        if now:
+            processed = purge_users(max_seconds=math.inf)
+            purge.refresh_from_db()
+            self.stdout.write(
+                self.style.SUCCESS(f"Processed {processed} rows, purge {purge.step}.")
+            )
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from tasks.models import Task, TaskCounter, TaskCounterState
+
+EXPECTED_SQL = f"""
+SELECT created_by_id, assigned_to_id, status,
+    tasks_task_due_bucket(due_date, (SELECT as_of FROM {TaskCounterState._meta.db_table}))
+        AS due_bucket,
+    count(*) AS count
+FROM {Task._meta.db_table}
+GROUP BY 1, 2, 3, 4
+"""
+
+DRIFT_SQL = f"""
+WITH expected AS ({EXPECTED_SQL})
+SELECT count(*)
+FROM expected
+FULL JOIN {TaskCounter._meta.db_table} counter
+    ON counter.created_by_id = expected.created_by_id
+    AND counter.assigned_to_id IS NOT DISTINCT FROM expected.assigned_to_id
+    AND counter.status = expected.status
+    AND counter.due_bucket = expected.due_bucket
+WHERE COALESCE(counter.count, 0) <> COALESCE(expected.count, 0)
+"""
+
+
+class Command(BaseCommand):
+    help = "Recount TaskCounter rows from the tasks table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Task writes and the rebucketing wait for the rebuild, reads go on.
+            cursor.execute(f"LOCK TABLE {Task._meta.db_table} IN SHARE MODE")
+            cursor.execute(f"SELECT 1 FROM {TaskCounterState._meta.db_table} FOR UPDATE")
+            cursor.execute(DRIFT_SQL)
+            drifted = cursor.fetchone()[0]
+
+            cursor.execute(f"DELETE FROM {TaskCounter._meta.db_table}")
+            cursor.execute(
+                f"INSERT INTO {TaskCounter._meta.db_table} "
+                f"(created_by_id, assigned_to_id, status, due_bucket, count) {EXPECTED_SQL}"
+            )
+            rows = cursor.rowcount
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} counters, {drifted} had drifted."))
@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.outbox import relay_lag, relay_task_events
+
+
+class Command(BaseCommand):
+    help = "Publish pending task events from the outbox table to Celery."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.TASK_EVENTS_RELAY_BATCH_SIZE
+        )
+        parser.add_argument("--interval", type=float, default=settings.TASK_EVENTS_RELAY_INTERVAL)
+        parser.add_argument("--once", action="store_true", help="Drain the outbox and exit.")
+
+    def handle(self, *args, batch_size: int, interval: float, once: bool, **options):
+        while True:
+            relayed = 0
+            while count := relay_task_events(batch_size):
+                relayed += count
+
+            if relayed or once:
+                # Left behind by this pass, e.g. events committed while it ran.
+                lag = relay_lag()
+                self.stdout.write(
+                    f"Relayed {relayed} events, pending {lag['pending']}, "
+                    f"lag {lag['lag_seconds']:.1f}s"
+                )
+            if once:
+                return
+
+            time.sleep(interval)
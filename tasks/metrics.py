@@ -0,0 +1,121 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Upper bounds in seconds of the latency histogram buckets.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    """
+    SQL and serialization cost of one request.
+
+    The instance is installed as an execute wrapper on every connection for the duration of
+    the request, so it sees the queries of all database aliases.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialize_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.sql_count += 1
+
+    def server_timing(self, duration: float) -> str:
+        return (
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.sql_count} queries", '
+            f"serialize;dur={self.serialize_time * 1000:.1f}, "
+            f"total;dur={duration * 1000:.1f}"
+        )
+
+
+request_metrics: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+@contextmanager
+def measure_serialization():
+    """Adds the time spent in the block, minus its SQL time, to the current request."""
+    metrics = request_metrics.get()
+    if metrics is None:
+        yield
+        return
+
+    started, sql_time = time.perf_counter(), metrics.sql_time
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started - (metrics.sql_time - sql_time)
+        metrics.serialize_time += elapsed
+
+
+# Recorded by every process serving the app. With PROMETHEUS_MULTIPROC_DIR set, as the gunicorn
+# profile does, each process writes its values to files there and /metrics merges them.
+REQUESTS = Counter(
+    "tasks_http_requests", "Requests by route, method and status.", ("route", "method", "status")
+)
+REQUEST_DURATION = Histogram(
+    "tasks_http_request_duration_seconds",
+    "Request latency by route.",
+    ("route", "method"),
+    buckets=DURATION_BUCKETS,
+)
+SQL_DURATION = Histogram(
+    "tasks_http_request_sql_duration_seconds",
+    "Time spent in SQL per request by route.",
+    ("route", "method"),
+    buckets=DURATION_BUCKETS,
+)
+SQL_QUERIES = Counter(
+    "tasks_http_request_sql_queries", "SQL queries by route.", ("route", "method")
+)
+SERIALIZE_SECONDS = Counter(
+    "tasks_http_request_serialize_seconds",
+    "Time spent building and rendering response bodies by route.",
+    ("route", "method"),
+)
+RESPONSE_CACHE_REQUESTS = Counter(
+    "tasks_response_cache_requests",
+    "Response cache lookups by view and result.",
+    ("view", "result"),
+)
+
+
+def record_request(
+    route: str, method: str, status: int, metrics: RequestMetrics, duration: float
+) -> None:
+    REQUESTS.labels(route, method, str(status)).inc()
+    REQUEST_DURATION.labels(route, method).observe(duration)
+    SQL_DURATION.labels(route, method).observe(metrics.sql_time)
+    SQL_QUERIES.labels(route, method).inc(metrics.sql_count)
+    SERIALIZE_SECONDS.labels(route, method).inc(metrics.serialize_time)
+
+
+def render(extra: list[str] = ()) -> bytes:
+    """The metrics of every process serving the app in the Prometheus text format."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + "".join(f"{line}\n" for line in extra).encode()
+
+
+def gauge(name: str, help_text: str, value: float) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
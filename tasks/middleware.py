@@ -0,0 +1,259 @@
+import time
+from contextlib import ExitStack
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+from rest_framework.permissions import SAFE_METHODS
+
+from tasks.metrics import RequestMetrics, record_request, request_metrics
+from tasks.routers import stick_to_primary
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class ReplicaStickinessMiddleware:
+    """After a successful write, keeps the user's reads on the primary for a while."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.get_response(request)
+        if user_id := self.get_writer_id(request, response):
+            stick_to_primary(user_id)
+        return response
+
+    async def __acall__(self, request: HttpRequest):
+        response = await self.get_response(request)
+        if user_id := self.get_writer_id(request, response):
+            await sync_to_async(stick_to_primary)(user_id)
+        return response
+
+    @staticmethod
+    def get_writer_id(request: HttpRequest, response: HttpResponse) -> int | None:
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return None
+
+        # DRF sets the user it authenticated on the underlying request.
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user.id
+
+
+class RequestMetricsMiddleware:
+    """
+    Records SQL count, SQL time and serialization time of every request.
+
+    They are sent back in the ``Server-Timing`` header and aggregated per route for
+    ``/metrics``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = request_metrics.set(metrics)
+        try:
+            with self.wrap_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            request_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request: HttpRequest):
+        metrics = RequestMetrics()
+        token = request_metrics.set(metrics)
+        try:
+            # Connections are shared with the sync_to_async threads of this request.
+            with self.wrap_connections(metrics):
+                response = await self.get_response(request)
+        finally:
+            request_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    @staticmethod
+    def wrap_connections(metrics: RequestMetrics) -> ExitStack:
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(metrics))
+        return stack
+
+    def finish(
+        self, request: HttpRequest, response: HttpResponseBase, metrics: RequestMetrics
+    ) -> HttpResponseBase:
+        if settings.SERVER_TIMING:
+            # Sent before a streamed body, so it covers the work up to the first chunk.
+            response.headers["Server-Timing"] = metrics.server_timing(
+                time.perf_counter() - metrics.started
+            )
+
+        # A streamed body is produced after this returns; it is recorded once the stream ends
+        # or the server closes it.
+        if not response.streaming:
+            self.record(request, response, metrics)
+        elif response.is_async:
+            response.streaming_content = self.measure_async_stream(
+                request, response, metrics, response.streaming_content
+            )
+        else:
+            response.streaming_content = self.measure_stream(
+                request, response, metrics, response.streaming_content
+            )
+        return response
+
+    def measure_stream(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        metrics: RequestMetrics,
+        content: Iterable[bytes],
+    ) -> Iterator[bytes]:
+        chunks = iter(content)
+        try:
+            while True:
+                token = request_metrics.set(metrics)
+                try:
+                    with self.wrap_connections(metrics):
+                        chunk = next(chunks, None)
+                finally:
+                    request_metrics.reset(token)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self.record(request, response, metrics)
+
+    async def measure_async_stream(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        metrics: RequestMetrics,
+        content: AsyncIterable[bytes],
+    ) -> AsyncIterator[bytes]:
+        chunks = aiter(content)
+        try:
+            while True:
+                token = request_metrics.set(metrics)
+                try:
+                    with self.wrap_connections(metrics):
+                        chunk = await anext(chunks, None)
+                finally:
+                    request_metrics.reset(token)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self.record(request, response, metrics)
+
+    @staticmethod
+    def record(request: HttpRequest, response: HttpResponseBase, metrics: RequestMetrics) -> None:
+        duration = time.perf_counter() - metrics.started
+        match = request.resolver_match
+        # Unresolved paths share one label to keep the number of series bounded.
+        route = match.route if match is not None else "unmatched"
+        record_request(route, request.method, response.status_code, metrics, duration)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses response bodies of at least ``RESPONSE_COMPRESSION_MIN_SIZE`` bytes.
+
+    Brotli is preferred when the client accepts it and the package is installed, gzip
+    otherwise. Streaming responses are compressed chunk by chunk.
+    """
+
+    def process_response(self, request: HttpRequest, response: HttpResponseBase):
+        if response.has_header("Content-Encoding") or response.status_code != 200:
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.RESPONSE_COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = self.get_encoding(request)
+        if encoding is None or (response.streaming and response.is_async):
+            return response
+
+        if response.streaming:
+            response.streaming_content = STREAM_COMPRESSORS[encoding](response.streaming_content)
+            del response.headers["Content-Length"]
+        else:
+            compressed = COMPRESSORS[encoding](response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # The body differs byte for byte from the uncompressed one.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    @staticmethod
+    def get_encoding(request: HttpRequest) -> str | None:
+        """The supported coding with the highest q-value, brotli on a tie; ``q=0`` refuses it."""
+        weights = {}
+        for value in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+            coding, *params = (part.strip() for part in value.split(";"))
+            weight = 1.0
+            for param in params:
+                name, _, number = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        weight = float(number)
+                    except ValueError:
+                        weight = 0.0
+            if coding:
+                weights[coding.lower()] = weight
+
+        supported = ("br", "gzip") if brotli is not None else ("gzip",)
+        wildcard = weights.get("*", 0.0)
+        encoding = max(supported, key=lambda coding: weights.get(coding, wildcard))
+        return encoding if weights.get(encoding, wildcard) > 0 else None
+
+
+def compress_brotli(content: bytes) -> bytes:
+    return brotli.compress(content, quality=settings.RESPONSE_BROTLI_QUALITY)
+
+
+def compress_brotli_sequence(sequence: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = brotli.Compressor(quality=settings.RESPONSE_BROTLI_QUALITY)
+    for chunk in sequence:
+        # Flushed per chunk so the client can start decoding right away, like gzip below.
+        yield compressor.process(chunk) + compressor.flush()
+    yield compressor.finish()
+
+
+COMPRESSORS = {"br": compress_brotli, "gzip": compress_string}
+STREAM_COMPRESSORS = {"br": compress_brotli_sequence, "gzip": compress_sequence}
@@ -0,0 +1,182 @@
+# Generated by Django 4.2.4 on 2026-10-18 21:14
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+TASK_COUNTER_SQL = """
+CREATE FUNCTION tasks_task_due_bucket(due date, today date) RETURNS text AS $$
+    SELECT CASE
+        WHEN due IS NULL THEN 'none'
+        WHEN due < date_trunc('week', today)::date THEN 'past'
+        WHEN due < today THEN 'week_past'
+        WHEN due < date_trunc('week', today)::date + 7 THEN 'week'
+        ELSE 'later'
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE FUNCTION tasks_task_counter_update() RETURNS trigger AS $$
+DECLARE
+    today date;
+    old_bucket text;
+    new_bucket text;
+    counter_id bigint;
+    remaining integer;
+BEGIN
+    -- tasks_task_counter_rebucket() holds off task writes while it moves the day forward.
+    SELECT as_of INTO today FROM tasks_taskcounterstate;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        old_bucket := tasks_task_due_bucket(OLD.due_date, today);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        new_bucket := tasks_task_due_bucket(NEW.due_date, today);
+    END IF;
+
+    IF TG_OP = 'UPDATE'
+        AND (OLD.created_by_id, OLD.assigned_to_id, OLD.status, old_bucket)
+            IS NOT DISTINCT FROM (NEW.created_by_id, NEW.assigned_to_id, NEW.status, new_bucket)
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE tasks_taskcounter SET count = count - 1
+        WHERE created_by_id = OLD.created_by_id
+            AND COALESCE(assigned_to_id, 0) = COALESCE(OLD.assigned_to_id, 0)
+            AND status = OLD.status
+            AND due_bucket = old_bucket
+        RETURNING id, count INTO counter_id, remaining;
+
+        IF remaining = 0 THEN
+            DELETE FROM tasks_taskcounter WHERE id = counter_id;
+        END IF;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO tasks_taskcounter (created_by_id, assigned_to_id, status, due_bucket, count)
+        VALUES (NEW.created_by_id, NEW.assigned_to_id, NEW.status, new_bucket, 1)
+        ON CONFLICT (created_by_id, (COALESCE(assigned_to_id, 0)), status, due_bucket)
+        DO UPDATE SET count = tasks_taskcounter.count + 1;
+    END IF;
+
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+-- Moves the counters from the buckets of the current as_of day to those of ``today``. Only
+-- tasks due from the Monday of the old day to the Sunday of the new one can change bucket.
+CREATE FUNCTION tasks_task_counter_rebucket(today date, OUT bucketed_for date, OUT moved bigint)
+AS $$
+DECLARE
+    previous date;
+    batch record;
+BEGIN
+    moved := 0;
+    -- Nothing is locked unless the day moves.
+    SELECT as_of INTO previous FROM tasks_taskcounterstate;
+    IF today <= previous THEN
+        bucketed_for := previous;
+        RETURN;
+    END IF;
+
+    -- Task writes wait until the counters and the day move together, reads go on. Checked again
+    -- under the lock, another rebucketing may have moved the day meanwhile.
+    LOCK TABLE tasks_task IN SHARE MODE;
+    SELECT as_of INTO previous FROM tasks_taskcounterstate FOR UPDATE;
+    IF today <= previous THEN
+        bucketed_for := previous;
+        RETURN;
+    END IF;
+
+    FOR batch IN
+        SELECT created_by_id, assigned_to_id, status,
+            tasks_task_due_bucket(due_date, previous) AS old_bucket,
+            tasks_task_due_bucket(due_date, today) AS new_bucket,
+            count(*) AS count
+        FROM tasks_task
+        WHERE due_date >= date_trunc('week', previous)::date
+            AND due_date < date_trunc('week', today)::date + 7
+            AND tasks_task_due_bucket(due_date, previous)
+                <> tasks_task_due_bucket(due_date, today)
+        GROUP BY 1, 2, 3, 4, 5
+    LOOP
+        UPDATE tasks_taskcounter SET count = count - batch.count
+        WHERE created_by_id = batch.created_by_id
+            AND COALESCE(assigned_to_id, 0) = COALESCE(batch.assigned_to_id, 0)
+            AND status = batch.status
+            AND due_bucket = batch.old_bucket;
+
+        INSERT INTO tasks_taskcounter (created_by_id, assigned_to_id, status, due_bucket, count)
+        VALUES (batch.created_by_id, batch.assigned_to_id, batch.status, batch.new_bucket,
+                batch.count)
+        ON CONFLICT (created_by_id, (COALESCE(assigned_to_id, 0)), status, due_bucket)
+        DO UPDATE SET count = tasks_taskcounter.count + EXCLUDED.count;
+
+        moved := moved + batch.count;
+    END LOOP;
+
+    DELETE FROM tasks_taskcounter WHERE count = 0;
+    UPDATE tasks_taskcounterstate SET as_of = today;
+    bucketed_for := today;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER tasks_task_counter_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF created_by_id, assigned_to_id, status, due_date
+    ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_counter_update();
+
+INSERT INTO tasks_taskcounter (created_by_id, assigned_to_id, status, due_bucket, count)
+SELECT created_by_id, assigned_to_id, status,
+    tasks_task_due_bucket(due_date, (SELECT as_of FROM tasks_taskcounterstate)), count(*)
+FROM tasks_task
+GROUP BY 1, 2, 3, 4;
+"""
+
+DROP_TASK_COUNTER_SQL = """
+DROP TRIGGER tasks_task_counter_trigger ON tasks_task;
+DROP FUNCTION tasks_task_counter_update();
+DROP FUNCTION tasks_task_counter_rebucket(date);
+DROP FUNCTION tasks_task_due_bucket(date, date);
+"""
+
+
+def create_counter_state(apps, schema_editor):
+    apps.get_model("tasks", "TaskCounterState").objects.create(as_of=timezone.localdate())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('N', 'New'), ('P', 'Planning'), ('I', 'In progress'), ('C', 'Completed')], max_length=1)),
+                ('due_bucket', models.CharField(choices=[('none', 'No due date'), ('past', 'Before this week'), ('week_past', 'Earlier this week'), ('week', 'From today to the end of the week'), ('later', 'After this week')], max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('assigned_to', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='taskcounter',
+            constraint=models.UniqueConstraint(models.F('created_by'), django.db.models.functions.comparison.Coalesce(models.F('assigned_to'), models.Value(0)), models.F('status'), models.F('due_bucket'), name='taskcounter_key_uniq'),
+        ),
+        migrations.CreateModel(
+            name='TaskCounterState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField()),
+            ],
+        ),
+        migrations.RunPython(create_counter_state, migrations.RunPython.noop),
+        migrations.RunSQL(TASK_COUNTER_SQL, DROP_TASK_COUNTER_SQL),
+    ]
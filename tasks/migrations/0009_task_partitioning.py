@@ -0,0 +1,240 @@
+# Generated by Django 4.2.4 on 2026-10-18 22:05
+
+from django.db import migrations
+
+# Indexes, constraints and triggers of tasks_task, recreated on the new table in both directions.
+TASK_TABLE_SQL = """
+ALTER TABLE tasks_task
+    ADD CONSTRAINT tasks_task_created_by_id_1345568a_fk_tasks_user_id
+        FOREIGN KEY (created_by_id) REFERENCES tasks_user (id) DEFERRABLE INITIALLY DEFERRED,
+    ADD CONSTRAINT tasks_task_assigned_to_id_e8821f61_fk_tasks_user_id
+        FOREIGN KEY (assigned_to_id) REFERENCES tasks_user (id) DEFERRABLE INITIALLY DEFERRED,
+    ADD CONSTRAINT tasks_task_updated_by_id_12fd7445_fk_tasks_user_id
+        FOREIGN KEY (updated_by_id) REFERENCES tasks_user (id) DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX tasks_task_updated_by_id_12fd7445 ON tasks_task (updated_by_id);
+CREATE INDEX task_updated_at_id_idx ON tasks_task (updated_at, id);
+CREATE INDEX task_due_date_id_idx ON tasks_task (due_date, id);
+CREATE INDEX task_creator_status_due_idx ON tasks_task (created_by_id, status, due_date);
+CREATE INDEX task_assignee_status_due_idx ON tasks_task (assigned_to_id, status, due_date);
+CREATE INDEX task_search_vector_idx ON tasks_task USING gin (search_vector);
+CREATE INDEX task_title_trgm_idx ON tasks_task USING gin (title gin_trgm_ops);
+
+CREATE TRIGGER tasks_task_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_search_vector_update();
+
+CREATE TRIGGER tasks_task_counter_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF created_by_id, assigned_to_id, status, due_date
+    ON tasks_task
+    FOR EACH ROW EXECUTE FUNCTION tasks_task_counter_update();
+"""
+
+# Built without blocking writes; becomes the primary key of the history partition.
+HISTORY_KEY_SQL = """
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS tasks_task_history_tasks_task_pkey
+    ON tasks_task (id, created_at);
+"""
+
+# The existing rows become the history partition, which ends where the monthly partitions
+# start: the next month (UTC). Until the swap below, rows created after that would fail the
+# check, so the migration shouldn't be started in the last hours of a month.
+HISTORY_RANGE_SQL = """
+DO $$
+DECLARE
+    history_end timestamptz :=
+        (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '1 month') AT TIME ZONE 'UTC';
+BEGIN
+    EXECUTE format(
+        'CREATE OR REPLACE FUNCTION tasks_task_history_end() RETURNS timestamptz AS %L '
+        'LANGUAGE sql IMMUTABLE',
+        format('SELECT %L::timestamptz', history_end)
+    );
+    ALTER TABLE tasks_task DROP CONSTRAINT IF EXISTS tasks_task_history_range;
+    EXECUTE format(
+        'ALTER TABLE tasks_task ADD CONSTRAINT tasks_task_history_range '
+        'CHECK (created_at < %L) NOT VALID',
+        history_end
+    );
+END
+$$;
+"""
+
+DROP_HISTORY_RANGE_SQL = """
+ALTER TABLE tasks_task DROP CONSTRAINT IF EXISTS tasks_task_history_range;
+DROP FUNCTION IF EXISTS tasks_task_history_end();
+"""
+
+# Scans the table without blocking writes; the validated check spares ATTACH the scan.
+VALIDATE_HISTORY_RANGE_SQL = "ALTER TABLE tasks_task VALIDATE CONSTRAINT tasks_task_history_range;"
+
+# Catalog changes only: no row is copied and no index is built while the table is locked.
+PARTITION_SQL = f"""
+ALTER TABLE tasks_task RENAME TO tasks_task_history;
+ALTER TABLE tasks_task_history ALTER COLUMN id DROP IDENTITY;
+-- Recreated on tasks_task and cloned to the partition.
+DROP TRIGGER tasks_task_search_vector_trigger ON tasks_task_history;
+DROP TRIGGER tasks_task_counter_trigger ON tasks_task_history;
+ALTER TABLE tasks_task_history DROP CONSTRAINT tasks_task_pkey;
+ALTER TABLE tasks_task_history ADD CONSTRAINT tasks_task_history_tasks_task_pkey
+    PRIMARY KEY USING INDEX tasks_task_history_tasks_task_pkey;
+
+-- The indexes of the old table are attached to the same indexes of tasks_task below.
+DO $$
+DECLARE
+    item record;
+BEGIN
+    FOR item IN
+        SELECT index.relname AS name
+        FROM pg_index
+        JOIN pg_class index ON index.oid = pg_index.indexrelid
+        WHERE pg_index.indrelid = 'tasks_task_history'::regclass AND NOT pg_index.indisprimary
+    LOOP
+        EXECUTE format(
+            'ALTER INDEX %I RENAME TO %I', item.name, 'tasks_task_history_' || item.name
+        );
+    END LOOP;
+END
+$$;
+
+-- The partition key has to be part of the primary key; ids still come from one sequence.
+CREATE TABLE tasks_task (LIKE tasks_task_history) PARTITION BY RANGE (created_at);
+ALTER TABLE tasks_task ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+ALTER TABLE tasks_task ADD CONSTRAINT tasks_task_pkey PRIMARY KEY (id, created_at);
+ALTER TABLE tasks_task ATTACH PARTITION tasks_task_history
+    FOR VALUES FROM (MINVALUE) TO (tasks_task_history_end());
+ALTER TABLE tasks_task_history DROP CONSTRAINT tasks_task_history_range;
+-- Rows of months without a partition, e.g. when the partition job has not run.
+CREATE TABLE tasks_task_default PARTITION OF tasks_task DEFAULT;
+
+-- Partition indexes are named after the partition and the index of tasks_task they belong to,
+-- so query plans show which index is used.
+CREATE FUNCTION tasks_task_name_partition_indexes() RETURNS void AS $$
+DECLARE
+    item record;
+BEGIN
+    FOR item IN
+        SELECT child.relname AS name, partition.relname || '_' || parent.relname AS new_name
+        FROM pg_inherits inherits
+        JOIN pg_class parent ON parent.oid = inherits.inhparent
+        JOIN pg_class child ON child.oid = inherits.inhrelid
+        JOIN pg_index child_index ON child_index.indexrelid = child.oid
+        JOIN pg_class partition ON partition.oid = child_index.indrelid
+        JOIN pg_index parent_index ON parent_index.indexrelid = parent.oid
+        WHERE parent_index.indrelid = 'tasks_task'::regclass
+            AND child.relname <> partition.relname || '_' || parent.relname
+    LOOP
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', item.name, item.new_name);
+    END LOOP;
+END
+$$ LANGUAGE plpgsql;
+
+-- Creates the partition of the month of `month` (UTC) unless it exists or the month is in the
+-- history partition. Rows of that month in the default partition are moved to it; they are
+-- deleted and inserted again through tasks_task, so the counter trigger nets out.
+CREATE FUNCTION tasks_task_create_partition(month date) RETURNS boolean AS $$
+DECLARE
+    name text := 'tasks_task_' || to_char(month, 'YYYY_MM');
+    lower_bound timestamptz := date_trunc('month', month::timestamp) AT TIME ZONE 'UTC';
+    upper_bound timestamptz :=
+        (date_trunc('month', month::timestamp) + interval '1 month') AT TIME ZONE 'UTC';
+    moved boolean;
+BEGIN
+    IF to_regclass(name) IS NOT NULL OR lower_bound < tasks_task_history_end() THEN
+        RETURN false;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE tasks_task)', name);
+    EXECUTE format(
+        'ALTER TABLE %I ADD CONSTRAINT %I CHECK (created_at >= %L AND created_at < %L)',
+        name, name || '_range', lower_bound, upper_bound
+    );
+
+    moved := EXISTS (
+        SELECT FROM tasks_task_default
+        WHERE created_at >= lower_bound AND created_at < upper_bound
+    );
+    IF moved THEN
+        CREATE TEMP TABLE tasks_task_moved (LIKE tasks_task) ON COMMIT DROP;
+        WITH deleted AS (
+            DELETE FROM tasks_task_default
+            WHERE created_at >= lower_bound AND created_at < upper_bound
+            RETURNING *
+        )
+        INSERT INTO tasks_task_moved SELECT * FROM deleted;
+    END IF;
+
+    -- The range constraint spares ATTACH a scan of the new table.
+    EXECUTE format(
+        'ALTER TABLE tasks_task ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        name, lower_bound, upper_bound
+    );
+    EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', name, name || '_range');
+
+    IF moved THEN
+        INSERT INTO tasks_task SELECT * FROM tasks_task_moved;
+        DROP TABLE tasks_task_moved;
+    END IF;
+
+    PERFORM tasks_task_name_partition_indexes();
+    RETURN true;
+END
+$$ LANGUAGE plpgsql;
+
+SELECT tasks_task_create_partition(month::date)
+FROM generate_series(
+    date_trunc('month', tasks_task_history_end() AT TIME ZONE 'UTC'),
+    date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+    interval '1 month'
+) AS month;
+
+SELECT setval(pg_get_serial_sequence('tasks_task', 'id'), COALESCE(max(id), 0) + 1, false)
+FROM tasks_task;
+
+-- Existing indexes, foreign keys and the triggers of the history partition are attached to
+-- or cloned from these.
+{TASK_TABLE_SQL}
+SELECT tasks_task_name_partition_indexes();
+"""
+
+UNPARTITION_SQL = f"""
+ALTER TABLE tasks_task RENAME TO tasks_task_partitioned;
+CREATE TABLE tasks_task (LIKE tasks_task_partitioned);
+INSERT INTO tasks_task SELECT * FROM tasks_task_partitioned;
+DROP TABLE tasks_task_partitioned;
+DROP FUNCTION tasks_task_create_partition(date);
+DROP FUNCTION tasks_task_name_partition_indexes();
+
+ALTER TABLE tasks_task ADD CONSTRAINT tasks_task_pkey PRIMARY KEY (id);
+ALTER TABLE tasks_task ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+SELECT setval(pg_get_serial_sequence('tasks_task', 'id'), COALESCE(max(id), 0) + 1, false)
+FROM tasks_task;
+{TASK_TABLE_SQL}
+"""
+
+
+def partition(apps, schema_editor):
+    schema_editor.execute(PARTITION_SQL, params=None)
+
+
+def unpartition(apps, schema_editor):
+    schema_editor.execute(UNPARTITION_SQL, params=None)
+
+
+class Migration(migrations.Migration):
+    # The index is built and the range checked outside of a transaction, so neither blocks
+    # writes; only the swap to the partitioned table runs in one.
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0008_task_counter'),
+    ]
+
+    operations = [
+        migrations.RunSQL(HISTORY_KEY_SQL, "DROP INDEX IF EXISTS tasks_task_history_tasks_task_pkey;"),
+        migrations.RunSQL(HISTORY_RANGE_SQL, DROP_HISTORY_RANGE_SQL),
+        migrations.RunSQL(VALIDATE_HISTORY_RANGE_SQL, migrations.RunSQL.noop),
+        migrations.RunPython(partition, unpartition, atomic=True),
+        # Autovacuum never analyzes the partitioned table itself.
+        migrations.RunSQL("ANALYZE tasks_task;", migrations.RunSQL.noop),
+    ]
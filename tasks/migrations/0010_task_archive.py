@@ -0,0 +1,67 @@
+# Generated by Django 4.2.4 on 2026-10-18 22:34
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+COLUMNS = """
+    id, title, description, status, due_date, created_at, updated_at,
+    assigned_to_id, created_by_id, updated_by_id, search_vector
+"""
+
+TASK_WITH_ARCHIVED_SQL = f"""
+CREATE VIEW tasks_task_with_archived AS
+SELECT {COLUMNS}, NULL::timestamptz AS archived_at FROM tasks_task
+UNION ALL
+SELECT {COLUMNS}, archived_at FROM tasks_archivedtask;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=250)),
+                ('description', models.TextField()),
+                ('status', models.CharField(choices=[('N', 'New'), ('P', 'Planning'), ('I', 'In progress'), ('C', 'Completed')], max_length=1)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('archived_at', models.DateTimeField()),
+                ('assigned_to', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('updated_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['updated_at', 'id'], name='archivedtask_updated_at_id_idx'), models.Index(fields=['due_date', 'id'], name='archivedtask_due_date_id_idx'), models.Index(fields=['created_by', 'status', 'due_date'], name='archivedtask_creator_idx'), models.Index(fields=['assigned_to', 'status', 'due_date'], name='archivedtask_assignee_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskWithArchived',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=250)),
+                ('description', models.TextField()),
+                ('status', models.CharField(choices=[('N', 'New'), ('P', 'Planning'), ('I', 'In progress'), ('C', 'Completed')], max_length=1)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('archived_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'db_table': 'tasks_task_with_archived',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(TASK_WITH_ARCHIVED_SQL, 'DROP VIEW tasks_task_with_archived'),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.4 on 2026-10-18 22:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserPurge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.BigIntegerField(unique=True)),
+                ('step', models.CharField(choices=[('tasks', 'Created tasks'), ('archived_tasks', 'Created archived tasks'), ('assigned_tasks', 'Assigned tasks'), ('assigned_archived_tasks', 'Assigned archived tasks'), ('updated_tasks', 'Updated tasks'), ('updated_archived_tasks', 'Updated archived tasks'), ('updated_roles', 'Updated roles'), ('updated_users', 'Updated users'), ('user', 'User'), ('done', 'Done'), ('cancelled', 'Cancelled')], default='tasks', max_length=30)),
+                ('processed', models.BigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('retry_at', models.DateTimeField(blank=True, null=True)),
+                ('reassign_to', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('finished_at__isnull', True)), fields=['id'], name='userpurge_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-19 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_notification_claim'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='event_id',
+            field=models.BigIntegerField(blank=True, null=True, unique=True),
+        ),
+    ]
@@ -1,11 +1,36 @@
 from django.conf import settings
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractBaseUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 
 from tasks.constants import SystemRole
+from tasks.role_cache import role_cache
 
 TASK_STATUS_CHOICES = (("N", "New"), ("P", "Planning"), ("I", "In progress"), ("C", "Completed"))
+TASK_EVENT_CHOICES = (
+    ("created", "Created"),
+    ("assigned", "Assigned"),
+    ("status_changed", "Status changed"),
+)
+# Steps of a user purge, in the order ``tasks.purge`` runs them.
+USER_PURGE_STEP_CHOICES = (
+    ("tasks", "Created tasks"),
+    ("archived_tasks", "Created archived tasks"),
+    ("assigned_tasks", "Assigned tasks"),
+    ("assigned_archived_tasks", "Assigned archived tasks"),
+    ("updated_tasks", "Updated tasks"),
+    ("updated_archived_tasks", "Updated archived tasks"),
+    ("updated_roles", "Updated roles"),
+    ("updated_users", "Updated users"),
+    ("user", "User"),
+    ("done", "Done"),
+    ("cancelled", "Cancelled"),
+)
 
 
 class Role(models.Model):
@@ -74,10 +99,34 @@ class User(AbstractBaseUser):
             return f"{self.first_name}  {self.last_name}"
         return None
 
+    @cached_property
+    def role_names(self) -> frozenset[str]:
+        return role_cache.user_role_names(self.pk)
+
     @property
     def is_admin(self) -> bool:
-        admin_role = Role.objects.get(name=SystemRole.ADMIN)
-        return self.roles.contains(admin_role)
+        return SystemRole.ADMIN in self.role_names
+
+
+# Text search configuration used by the `tasks_task` search trigger and by the search filter.
+TASK_SEARCH_CONFIG = "simple"
+
+
+class TaskQuerySet(models.QuerySet):
+    def visible_to(self, user) -> "TaskQuerySet":
+        if user.is_admin:
+            return self
+
+        # Apply after the other filters: each branch of the union is then served by its own
+        # (created_by | assigned_to, status, due_date) index instead of an OR over two columns.
+        created = self.filter(created_by_id=user.id).order_by().values("id")
+        assigned = self.filter(assigned_to_id=user.id).order_by().values("id")
+        return self.filter(id__in=created.union(assigned))
+
+
+class TaskManager(models.Manager.from_queryset(TaskQuerySet)):
+    def get_queryset(self) -> TaskQuerySet:
+        return super().get_queryset().defer("search_vector")
 
 
 class Task(models.Model):
@@ -85,8 +134,9 @@ class Task(models.Model):
     description = models.TextField()
     status = models.CharField(max_length=1, choices=TASK_STATUS_CHOICES, default="N")
     due_date = models.DateField(null=True, blank=True)
+    # Indexed by the (created_by | assigned_to, status, due_date) composite indexes.
     created_by = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tasks"
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tasks", db_index=False
     )
     assigned_to = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -94,6 +144,7 @@ class Task(models.Model):
         null=True,
         on_delete=models.SET_NULL,
         related_name="assigned_tasks",
+        db_index=False,
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -104,3 +155,243 @@ class Task(models.Model):
         on_delete=models.SET_NULL,
         related_name="updated_tasks",
     )
+    # Maintained by a database trigger from title and description.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = TaskManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="task_updated_at_id_idx"),
+            models.Index(fields=["due_date", "id"], name="task_due_date_id_idx"),
+            models.Index(
+                fields=["created_by", "status", "due_date"], name="task_creator_status_due_idx"
+            ),
+            models.Index(
+                fields=["assigned_to", "status", "due_date"], name="task_assignee_status_due_idx"
+            ),
+            GinIndex(fields=["search_vector"], name="task_search_vector_idx"),
+            GinIndex(fields=["title"], opclasses=["gin_trgm_ops"], name="task_title_trgm_idx"),
+        ]
+
+
+class TaskRow(models.Model):
+    """Columns of ``Task`` for the tables and views that hold copies of its rows."""
+
+    # The id of the task.
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=250)
+    description = models.TextField()
+    status = models.CharField(max_length=1, choices=TASK_STATUS_CHOICES)
+    due_date = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = TaskManager()
+
+    class Meta:
+        abstract = True
+
+
+class ArchivedTask(TaskRow):
+    """Completed task moved out of ``Task`` by ``tasks.archive``; read-only."""
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        db_index=False,
+    )
+    updated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="archivedtask_updated_at_id_idx"),
+            models.Index(fields=["due_date", "id"], name="archivedtask_due_date_id_idx"),
+            models.Index(
+                fields=["created_by", "status", "due_date"], name="archivedtask_creator_idx"
+            ),
+            models.Index(
+                fields=["assigned_to", "status", "due_date"], name="archivedtask_assignee_idx"
+            ),
+        ]
+
+
+class TaskWithArchived(TaskRow):
+    """
+    Live and archived tasks, read through the ``tasks_task_with_archived`` UNION ALL view.
+
+    Filters, ordering and limits are pushed down into both tables, so their indexes are used.
+    """
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    updated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    # Null for live tasks.
+    archived_at = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = "tasks_task_with_archived"
+
+
+class Notification(models.Model):
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=250)
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # Set by the flush that is sending the notification; claims older than
+    # NOTIFICATIONS_CLAIM_TIMEOUT are taken over by the next flush.
+    claim = models.UUIDField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    # The task event the notification is for. Events are relayed at least once, so a
+    # notification for an event that already has one is dropped.
+    event_id = models.BigIntegerField(null=True, blank=True, unique=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(sent_at__isnull=True),
+                name="notification_pending_idx",
+            ),
+        ]
+
+
+class TaskEvent(models.Model):
+    # A plain column instead of a foreign key: events outlive deleted tasks and must not
+    # depend on the layout of the tasks table.
+    task_id = models.BigIntegerField()
+    kind = models.CharField(max_length=20, choices=TASK_EVENT_CHOICES)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(published_at__isnull=True),
+                name="taskevent_pending_idx",
+            ),
+        ]
+
+
+# Due dates relative to the day the counters are bucketed for; the week runs Monday to Sunday.
+# Computed by the tasks_task_due_bucket() SQL function.
+DUE_BUCKET_CHOICES = (
+    ("none", "No due date"),
+    ("past", "Before this week"),
+    ("week_past", "Earlier this week"),
+    ("week", "From today to the end of the week"),
+    ("later", "After this week"),
+)
+
+
+class TaskCounter(models.Model):
+    """
+    Number of tasks per (created_by, assigned_to, status, due_bucket), kept by a trigger.
+
+    Rows are deleted when their count drops to zero, so the table grows with the pairs of
+    users rather than with the tasks.
+    """
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    status = models.CharField(max_length=1, choices=TASK_STATUS_CHOICES)
+    due_bucket = models.CharField(max_length=10, choices=DUE_BUCKET_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Matched by the ON CONFLICT clause of the trigger, keep both in sync.
+            models.UniqueConstraint(
+                F("created_by"),
+                Coalesce(F("assigned_to"), Value(0)),
+                F("status"),
+                F("due_bucket"),
+                name="taskcounter_key_uniq",
+            ),
+        ]
+
+
+class UserPurge(models.Model):
+    """Progress of removing a deactivated user and their data, advanced by ``tasks.purge``."""
+
+    # A plain column: the purge deletes the user row and the record is kept afterwards.
+    user_id = models.BigIntegerField(unique=True)
+    # New creator of the user's tasks; the tasks are deleted when empty. Cleared when the purge
+    # finishes, so it doesn't keep that user from being purged in turn.
+    reassign_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name="+",
+    )
+    step = models.CharField(max_length=30, choices=USER_PURGE_STEP_CHOICES, default="tasks")
+    # Rows changed or deleted so far.
+    processed = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Last failed batch; the purge is skipped until retry_at.
+    error = models.TextField(blank=True)
+    retry_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(finished_at__isnull=True),
+                name="userpurge_pending_idx",
+            ),
+        ]
+
+
+class TaskCounterState(models.Model):
+    """
+    The day the due buckets of ``TaskCounter`` are computed for; a single row.
+
+    Moved forward daily by ``tasks.stats.rebucket_task_counters``.
+    """
+
+    as_of = models.DateField()
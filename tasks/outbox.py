@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from tasks.models import Task, TaskEvent
+
+
+def task_events(task: Task, previous: Task | None = None) -> list[TaskEvent]:
+    """Events for a task that was just created, or changed from the ``previous`` state."""
+    if previous is None:
+        return [
+            TaskEvent(task_id=task.id, kind="created", payload={"created_by": task.created_by_id})
+        ]
+
+    events = []
+    if task.assigned_to_id != previous.assigned_to_id:
+        events.append(
+            TaskEvent(
+                task_id=task.id,
+                kind="assigned",
+                payload={
+                    "assigned_to": task.assigned_to_id,
+                    "email": task.assigned_to.email if task.assigned_to_id else None,
+                    "previous": previous.assigned_to_id,
+                },
+            )
+        )
+    if task.status != previous.status:
+        events.append(
+            TaskEvent(
+                task_id=task.id,
+                kind="status_changed",
+                payload={"status": task.status, "previous": previous.status},
+            )
+        )
+
+    return events
+
+
+def record_events(events: list[TaskEvent]) -> None:
+    # Must run in the transaction that changed the tasks, so events commit or roll back
+    # together with them.
+    TaskEvent.objects.bulk_create(events)
+
+
+def relay_task_events(batch_size: int | None = None) -> int:
+    """
+    Publish one batch of pending events to Celery as a single job and mark them as published.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED``, so several relays can drain the table
+    in parallel. A failed publish or commit leaves the batch pending and it is published
+    again, so delivery is at least once and the consumer deduplicates on the event id.
+    """
+    from tasks.helpers import celery_process_task_events
+
+    batch_size = batch_size or settings.TASK_EVENTS_RELAY_BATCH_SIZE
+    with transaction.atomic():
+        events = list(
+            TaskEvent.objects.filter(published_at__isnull=True)
+            .select_for_update(skip_locked=True)
+            .order_by("id")[:batch_size]
+        )
+        if events:
+            celery_process_task_events.delay(
+                [(event.id, event.task_id, event.kind, event.payload) for event in events]
+            )
+        TaskEvent.objects.filter(id__in=[event.id for event in events]).update(
+            published_at=timezone.now()
+        )
+
+    return len(events)
+
+
+def relay_lag() -> dict[str, float | int]:
+    """Number of unpublished events and the age of the oldest one in seconds."""
+    stats = TaskEvent.objects.filter(published_at__isnull=True).aggregate(
+        pending=Count("id"), oldest=Min("created_at")
+    )
+    oldest = stats["oldest"]
+    return {
+        "pending": stats["pending"],
+        "lag_seconds": (timezone.now() - oldest).total_seconds() if oldest else 0.0,
+    }
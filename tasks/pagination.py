@@ -0,0 +1,171 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a ``(field, id)`` key.
+
+    Every page is fetched with ``WHERE (field, id) > cursor ORDER BY field, id LIMIT n``,
+    so it is served by the matching composite index no matter how deep the client is.
+    Pagination is opt-in: it is only applied when ``page_size`` or ``cursor`` is passed. Lists
+    that are not paginated get the same ordering, see ``order_unpaginated``.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering_query_param = "ordering"
+    # ordering value -> (field, descending)
+    orderings: dict[str, tuple[str, bool]] = {}
+    default_ordering: str = ""
+
+    def __init__(self):
+        self.page_size = settings.TASKS_PAGE_SIZE
+        self.max_page_size = settings.TASKS_MAX_PAGE_SIZE
+
+    def is_requested(self, request) -> bool:
+        return (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request)
+        if page_queryset is None:
+            return None
+
+        return self.set_page(list(page_queryset))
+
+    def get_page_queryset(self, queryset: QuerySet, request) -> QuerySet | None:
+        """Unevaluated queryset of the requested page plus one row to detect the next page."""
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        queryset = self.order_queryset(queryset, request)
+        self.nullable = queryset.model._meta.get_field(self.field).null
+        self.limit = self.get_page_size(request)
+
+        if cursor := self.decode_cursor(request, queryset.model):
+            queryset = queryset.filter(self.get_keyset_filter(*cursor))
+
+        return queryset[: self.limit + 1]
+
+    def order_queryset(self, queryset: QuerySet, request) -> QuerySet:
+        """``queryset`` in the requested ``(field, id)`` order."""
+        self.field, self.descending = self.get_ordering(request)
+        return queryset.order_by(*self.get_order_by())
+
+    def order_unpaginated(self, queryset: QuerySet, request) -> QuerySet:
+        """
+        ``queryset`` in the order of the pages, for lists that are not paginated.
+
+        A queryset that is already ordered, e.g. by search rank, keeps its order unless
+        ``ordering`` is passed. The ordering is validated either way.
+        """
+        ordered = self.order_queryset(queryset, request)
+        if queryset.ordered and self.ordering_query_param not in request.query_params:
+            return queryset
+        return ordered
+
+    def set_page(self, rows: list) -> list:
+        self.has_next = len(rows) > self.limit
+        self.page = rows[: self.limit]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_page_size(self, request) -> int:
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+
+        try:
+            page_size = int(raw)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: "A positive integer is required."})
+
+        if page_size < 1:
+            raise ValidationError({self.page_size_query_param: "A positive integer is required."})
+
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request) -> tuple[str, bool]:
+        ordering = request.query_params.get(self.ordering_query_param, self.default_ordering)
+        if ordering not in self.orderings:
+            raise ValidationError(
+                {self.ordering_query_param: f"Supported values: {', '.join(self.orderings)}."}
+            )
+
+        return self.orderings[ordering]
+
+    def get_order_by(self) -> tuple[str, str]:
+        prefix = "-" if self.descending else ""
+        return f"{prefix}{self.field}", f"{prefix}id"
+
+    def get_keyset_filter(self, value, pk: int) -> Q:
+        # PostgreSQL sorts NULLs as the largest value: last for ASC, first for DESC.
+        op = "lt" if self.descending else "gt"
+        if value is None:
+            after = Q(**{f"{self.field}__isnull": True, f"id__{op}": pk})
+            if self.descending:
+                after |= Q(**{f"{self.field}__isnull": False})
+            return after
+
+        after = Q(**{f"{self.field}__{op}e": value}) & (
+            Q(**{f"{self.field}__{op}": value}) | Q(**{f"id__{op}": pk})
+        )
+        if self.nullable and not self.descending:
+            after |= Q(**{f"{self.field}__isnull": True})
+
+        return after
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+
+        value, pk = self.get_position(self.page[-1])
+        position = [value.isoformat() if value is not None else None, pk]
+        cursor = urlsafe_b64encode(json.dumps(position).encode()).decode()
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, cursor
+        )
+
+    def get_position(self, row) -> tuple:
+        # Model instances, or values() rows on the fast list path.
+        if isinstance(row, dict):
+            return row[self.field], row["id"]
+        return getattr(row, self.field), row.pk
+
+    def decode_cursor(self, request, model) -> tuple | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            value, pk = json.loads(urlsafe_b64decode(encoded.encode()))
+            if value is not None:
+                value = model._meta.get_field(self.field).to_python(value)
+            return value, int(pk)
+        except (TypeError, ValueError, binascii.Error, DjangoValidationError):
+            raise NotFound("Invalid cursor")
+
+
+class TaskKeysetPagination(KeysetPagination):
+    orderings = {
+        "-updated_at": ("updated_at", True),
+        "updated_at": ("updated_at", False),
+        "due_date": ("due_date", False),
+        "-due_date": ("due_date", True),
+    }
+    default_ordering = "-updated_at"
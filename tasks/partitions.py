@@ -0,0 +1,58 @@
+import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from tasks.models import Task
+
+# Attaching a partition briefly locks the tasks table; rather fail and retry on the next run
+# than queue the API writes behind the lock.
+LOCK_TIMEOUT = "5s"
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"{Task._meta.db_table}_{month:%Y_%m}"
+
+
+def partition_months(ahead: int, today: datetime.date | None = None) -> list[datetime.date]:
+    """First days of the current month (UTC) and of the ``ahead`` months after it."""
+    month = (today or timezone.now().date()).replace(day=1)
+    months = []
+    for _ in range(ahead + 1):
+        months.append(month)
+        month = (month + datetime.timedelta(days=32)).replace(day=1)
+    return months
+
+
+def create_task_partitions(
+    ahead: int | None = None, today: datetime.date | None = None
+) -> list[str]:
+    """
+    Creates the monthly partitions of the tasks table that don't exist yet.
+
+    Months covered by the history partition, which holds the rows created before the tasks
+    table was partitioned, are skipped. Rows that went to the default partition because their
+    month had none are moved into the new partition. Returns the names of the partitions created.
+    """
+    ahead = settings.TASK_PARTITIONS_AHEAD if ahead is None else ahead
+    created = []
+    for month in partition_months(ahead, today):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL lock_timeout = %s", [LOCK_TIMEOUT])
+            cursor.execute("SELECT tasks_task_create_partition(%s)", [month])
+            if cursor.fetchone()[0]:
+                created.append(partition_name(month))
+
+    return created
+
+
+def analyze_tasks_table() -> None:
+    """
+    Gathers the statistics of the tasks table and its partitions.
+
+    Autovacuum analyzes the partitions but never the partitioned table itself, whose statistics
+    the planner needs for joins on it, such as the ``id IN (...)`` of ``visible_to``.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Task._meta.db_table}")
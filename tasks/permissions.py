@@ -11,8 +11,8 @@ class IsOwnerOrAssignedOrAdminOnly(permissions.BasePermission):
     def has_object_permission(self, request: Request, view: View, obj: Task) -> bool:
         if any(
             [
-                obj.created_by == request.user,
-                obj.assigned_to == request.user,
+                obj.created_by_id == request.user.id,
+                obj.assigned_to_id == request.user.id,
                 request.user.is_admin,
             ]
         ):
@@ -23,7 +23,7 @@ class IsOwnerOrAssignedOrAdminOnly(permissions.BasePermission):
 
 class IsOwnerOrAdminOnly(permissions.BasePermission):
     def has_object_permission(self, request: Request, view: View, obj: User) -> bool:
-        if request.user.is_admin or obj == request.user:
+        if request.user.is_admin or obj.id == request.user.id:
             return True
         return False
 
@@ -0,0 +1,235 @@
+import datetime
+import logging
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.models import Exists, Model, OuterRef, Q
+from django.utils import timezone
+
+from tasks.cache import bump_generation
+from tasks.models import ArchivedTask, Role, Task, User, UserPurge
+from tasks.role_cache import role_cache
+
+logger = logging.getLogger(__name__)
+
+# Step -> rows that reference the user. The rows of the first two steps are reassigned or
+# deleted, the references of the others are cleared, as ``on_delete=SET_NULL`` would. Role and
+# user ``updated_by`` cascade on delete, so they must be cleared before the user is deleted.
+PURGE_STEPS: dict[str, tuple[type[Model], str]] = {
+    "tasks": (Task, "created_by_id"),
+    "archived_tasks": (ArchivedTask, "created_by_id"),
+    "assigned_tasks": (Task, "assigned_to_id"),
+    "assigned_archived_tasks": (ArchivedTask, "assigned_to_id"),
+    "updated_tasks": (Task, "updated_by_id"),
+    "updated_archived_tasks": (ArchivedTask, "updated_by_id"),
+    "updated_roles": (Role, "updated_by_id"),
+    "updated_users": (User, "updated_by_id"),
+}
+STEP_ORDER = [*PURGE_STEPS, "user", "done"]
+OWNED_STEPS = ("tasks", "archived_tasks")
+
+# On a primary both LSN functions return NULL and the lag is 0. An idle replica has replayed
+# everything, so the age of its last replayed transaction is not lag.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def batch_sql(model: type[Model], column: str, change: str | None) -> str:
+    """
+    One batch of rows of ``model`` whose ``column`` is the user: ``SET change`` or delete them.
+
+    The rows are locked first and re-checked, so a row changed concurrently is not overwritten.
+    """
+    table = model._meta.db_table
+    # The partitioned tasks table is keyed by (id, created_at).
+    keys = ["id", "created_at"] if model is Task else ["id"]
+    join = " AND ".join(f"target.{key} = batch.{key}" for key in keys)
+    statement = (
+        f"UPDATE {table} target SET {change} FROM batch WHERE {join}"
+        if change
+        else f"DELETE FROM {table} target USING batch WHERE {join}"
+    )
+    return f"""
+    WITH batch AS (
+        SELECT {", ".join(keys)} FROM {table} WHERE {column} = %(user)s
+        LIMIT %(limit)s
+        FOR UPDATE
+    )
+    {statement}
+    """
+
+
+def schedule_user_purge(user: User, reassign_to: User | None = None) -> UserPurge:
+    """
+    Queues the purge of a deactivated user for ``purge_users``.
+
+    Tasks created by the user go to ``reassign_to``, or are deleted without it. Scheduling the
+    purge again starts it over; steps that are done have nothing left to do.
+    """
+    if user.is_active:
+        raise ValueError("Only deactivated users can be purged")
+    if reassign_to is not None and (reassign_to.id == user.id or not reassign_to.is_active):
+        raise ValueError("Tasks can only be reassigned to another active user")
+
+    purge, _ = UserPurge.objects.update_or_create(
+        user_id=user.id,
+        defaults={
+            "reassign_to": reassign_to,
+            "step": STEP_ORDER[0],
+            "processed": 0,
+            "finished_at": None,
+            "error": "",
+            "retry_at": None,
+        },
+    )
+    return purge
+
+
+def schedule_deactivated_purges(grace_days: int | None = None) -> int:
+    """
+    Schedules the purge of users deactivated more than ``grace_days`` days ago.
+
+    Users with a purge already scheduled are skipped, unless it was cancelled before they were
+    deactivated again. Their tasks are deleted; schedule the purge earlier to reassign them.
+    Returns the number of purges scheduled.
+    """
+    grace_days = settings.USER_PURGE_GRACE_DAYS if grace_days is None else grace_days
+    before = timezone.now() - datetime.timedelta(days=grace_days)
+    scheduled = UserPurge.objects.filter(user_id=OuterRef("id")).exclude(
+        step="cancelled", finished_at__lt=OuterRef("updated_at")
+    )
+    users = User.objects.filter(is_active=False, updated_at__lt=before).filter(~Exists(scheduled))
+
+    count = 0
+    for user in users.order_by("id"):
+        schedule_user_purge(user)
+        count += 1
+    return count
+
+
+def finish(purge: UserPurge, step: str) -> None:
+    purge.step = step
+    purge.finished_at = timezone.now()
+    # A finished purge must not keep the user it reassigned to from being deleted.
+    purge.reassign_to = None
+    purge.save()
+
+
+def run_step(purge: UserPurge, batch_size: int) -> int:
+    """Runs one batch of the current step of ``purge`` and moves it on; returns the rows."""
+    purge.error = ""
+    purge.retry_at = None
+    if purge.step == "user":
+        # Only the user row and its role links are left.
+        deleted, _ = User.objects.filter(id=purge.user_id).delete()
+        role_cache.invalidate()
+        purge.processed += deleted
+        finish(purge, "done")
+        return deleted
+
+    model, column = PURGE_STEPS[purge.step]
+    # Moving updated_at changes the ETags of the rows, like an update through the API; the
+    # lists follow the generation bumped below.
+    change = f"{column} = NULL, updated_at = now()"
+    if purge.step in OWNED_STEPS:
+        change = (
+            f"{column} = %(reassign_to)s, updated_at = now()" if purge.reassign_to_id else None
+        )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            batch_sql(model, column, change),
+            {"user": purge.user_id, "reassign_to": purge.reassign_to_id, "limit": batch_size},
+        )
+        processed = cursor.rowcount
+    if processed:
+        bump_generation(Task if model is ArchivedTask else model)
+
+    purge.processed += processed
+    if processed < batch_size:
+        purge.step = STEP_ORDER[STEP_ORDER.index(purge.step) + 1]
+    purge.save()
+    return processed
+
+
+def purge_batch(batch_size: int | None = None) -> int | None:
+    """
+    Runs one batch of the oldest unfinished purge in its own transaction.
+
+    Progress is saved in the same transaction, so a purge stopped at any point resumes where
+    it left off. A failed batch is rolled back and its purge set aside for
+    ``USER_PURGE_RETRY_DELAY`` seconds, so it doesn't hold up the purges queued after it.
+    Returns the number of rows processed, or None when no purge is pending.
+    """
+    batch_size = batch_size or settings.USER_PURGE_BATCH_SIZE
+    now = timezone.now()
+    with transaction.atomic():
+        # Purges claimed by other workers are skipped.
+        purge = (
+            UserPurge.objects.select_for_update(skip_locked=True)
+            .filter(Q(retry_at__isnull=True) | Q(retry_at__lte=now), finished_at__isnull=True)
+            .order_by("id")
+            .first()
+        )
+        if purge is None:
+            return None
+
+        # Reactivated while queued: leave the user and the rest of their data alone.
+        if User.objects.filter(id=purge.user_id, is_active=True).exists():
+            finish(purge, "cancelled")
+            return 0
+
+        try:
+            with transaction.atomic():
+                return run_step(purge, batch_size)
+        except DatabaseError as error:
+            logger.warning(
+                "Purge of user %s failed at step %s: %s", purge.user_id, purge.step, error
+            )
+            purge.refresh_from_db()
+            purge.error = str(error)
+            purge.retry_at = now + datetime.timedelta(seconds=settings.USER_PURGE_RETRY_DELAY)
+            purge.save()
+            return 0
+
+
+def replica_lag() -> float:
+    """Replay lag of the most lagging replica in seconds."""
+    lag = 0.0
+    for alias in settings.DATABASE_REPLICAS:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            lag = max(lag, float(cursor.fetchone()[0]))
+    return lag
+
+
+def purge_users(
+    batch_size: int | None = None, pause: float | None = None, max_seconds: float | None = None
+) -> int:
+    """
+    Advances the scheduled purges until none is left or ``max_seconds`` have passed.
+
+    Pauses ``pause`` seconds after every batch, and while a replica lags more than
+    ``USER_PURGE_MAX_REPLICA_LAG`` seconds. Returns the number of rows processed.
+    """
+    pause = settings.USER_PURGE_BATCH_PAUSE if pause is None else pause
+    max_seconds = settings.USER_PURGE_MAX_SECONDS if max_seconds is None else max_seconds
+    deadline = time.monotonic() + max_seconds
+
+    processed = 0
+    while time.monotonic() < deadline:
+        if replica_lag() > settings.USER_PURGE_MAX_REPLICA_LAG:
+            time.sleep(max(pause, 1))
+            continue
+
+        count = purge_batch(batch_size)
+        if count is None:
+            break
+        processed += count
+        time.sleep(pause)
+
+    return processed
@@ -0,0 +1,128 @@
+import csv
+import io
+import json
+import math
+import re
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from tasks.metrics import measure_serialization
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# orjson writes an exponent as 1e16 or 1e-7, or spells a small float out as 0.000015.
+ORJSON_EXPONENT = re.compile(rb"\de|0\.0000")
+
+
+def is_exponent_float(value: float) -> bool:
+    """Whether ``repr`` writes the float with an exponent: 1e+16, 1e-07."""
+    return value != 0 and not 1e-4 <= abs(value) < 1e16
+
+
+def has_float(data, test) -> bool:
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if test(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Same bytes as ``JSONRenderer``, encoded by orjson when it is installed.
+
+    Data orjson encodes differently goes through ``JSONRenderer``: integers wider than 64 bits,
+    which orjson refuses, NaN and infinities, which orjson writes as null, and floats Python
+    writes with an exponent (1e+16, 1e-07), which orjson writes as 1e16 and 1e-7.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure_serialization():
+            return self.encode(data, accepted_media_type, renderer_context)
+
+    def encode(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            # Dates go through the DRF encoder, orjson formats them differently.
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Only output with a null can hold a non-finite float.
+        if b"null" in ret and has_float(data, lambda value: not math.isfinite(value)):
+            return super().render(data, accepted_media_type, renderer_context)
+        if ORJSON_EXPONENT.search(ret) and has_float(data, is_exponent_float):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped by JSONRenderer to keep the output valid JavaScript.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        with measure_serialization():
+            return msgpack.packb(data, default=JSONRenderer.encoder_class().default)
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return "".join(
+            json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n" for row in rows
+        ).encode()
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        if not rows:
+            return b""
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode()
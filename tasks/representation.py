@@ -0,0 +1,122 @@
+from collections import defaultdict
+from typing import Callable, Iterable
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models import QuerySet
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# to_representation() returns database values of these fields unchanged.
+IDENTITY_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.EmailField,
+    serializers.IntegerField,
+)
+
+
+def get_converter(field: serializers.Field) -> Callable | None:
+    """``field.to_representation`` for non-null database values, with the settings bound."""
+    if type(field) in IDENTITY_FIELDS:
+        return None
+
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        timezone = getattr(field, "timezone", None) or field.default_timezone()
+        if output_format is not None and output_format.lower() == ISO_8601 and timezone:
+            # DRF looks the current timezone up for every value.
+            def convert_datetime(value):
+                value = value.astimezone(timezone).isoformat()
+                return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+            return convert_datetime
+
+    return field.to_representation
+
+
+class ValuesRepresentation:
+    """
+    Output of a model serializer built from ``values()`` rows.
+
+    Skips model instances and the per-field attribute lookups of ``Serializer``; converters
+    come from the serializer's own fields, so the rendered JSON is the same. Only
+    model columns, primary key relations and many-to-many primary key lists are supported.
+    """
+
+    def __init__(self, serializer: serializers.ModelSerializer):
+        model = serializer.Meta.model
+        # (name, column, converter); many-to-many fields have no column.
+        self.fields: list[tuple[str, str | None, Callable | None]] = []
+        # (name, owner column, through queryset of (owner id, related id) pairs)
+        self.many: list[tuple[str, str, QuerySet]] = []
+        for name, field in serializer.fields.items():
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                raise ImproperlyConfigured(f"{name}: {type(field).__name__} is not supported.")
+
+            if isinstance(field, serializers.ManyRelatedField):
+                self.many.append((name, *self.get_through_pairs(model_field)))
+                self.fields.append((name, None, None))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                if field.pk_field is not None:
+                    raise ImproperlyConfigured(f"{name}: pk_field is not supported.")
+                self.fields.append((name, model_field.attname, None))
+            elif model_field.concrete and not model_field.is_relation:
+                self.fields.append((name, model_field.attname, get_converter(field)))
+            else:
+                raise ImproperlyConfigured(f"{name}: {type(field).__name__} is not supported.")
+
+    @property
+    def columns(self) -> list[str]:
+        return [column for _, column, _ in self.fields if column is not None]
+
+    @staticmethod
+    def get_through_pairs(model_field) -> tuple[str, QuerySet]:
+        through = model_field.remote_field.through
+        owner = through._meta.get_field(model_field.m2m_field_name()).attname
+        related = through._meta.get_field(model_field.m2m_reverse_field_name()).attname
+        # The serializer reads the relation without an ORDER BY; primary key order keeps
+        # the lists stable.
+        return owner, through.objects.order_by(related).values_list(owner, related)
+
+    def to_representation(self, rows: list[dict]) -> list[dict]:
+        ids = [row["id"] for row in rows]
+        related = {
+            name: self.group(pairs.filter(**{f"{owner}__in": ids}))
+            for name, owner, pairs in self.many
+            if ids
+        }
+        return self.build(rows, related)
+
+    async def ato_representation(self, rows: list[dict]) -> list[dict]:
+        ids = [row["id"] for row in rows]
+        related = {}
+        for name, owner, pairs in self.many:
+            if ids:
+                pairs = pairs.filter(**{f"{owner}__in": ids})
+                related[name] = self.group([pair async for pair in pairs])
+        return self.build(rows, related)
+
+    @staticmethod
+    def group(pairs: Iterable[tuple]) -> dict[int, list]:
+        grouped = defaultdict(list)
+        for owner, related in pairs:
+            grouped[owner].append(related)
+        return grouped
+
+    def build(self, rows: list[dict], related: dict[str, dict[int, list]]) -> list[dict]:
+        fields = self.fields
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, converter in fields:
+                if column is None:
+                    item[name] = related.get(name, {}).get(row["id"], [])
+                    continue
+
+                value = row[column]
+                item[name] = value if converter is None or value is None else converter(value)
+            data.append(item)
+        return data
@@ -0,0 +1,62 @@
+import datetime
+import time
+
+from django.conf import settings
+from django.db.models import Model
+from django.utils import timezone
+
+from tasks.models import Notification, TaskEvent
+
+
+def delete_before(
+    model: type[Model], delivered: str, before: datetime.datetime, batch_size: int, pause: float
+) -> int:
+    """
+    Deletes the rows of ``model`` created before ``before`` whose ``delivered`` is set.
+
+    Ids grow with ``created_at``, so the batches walk the primary key up to the first row that
+    is kept instead of scanning the rows that are kept. Undelivered rows are left alone.
+    """
+    old = model.objects.filter(created_at__lt=before, **{f"{delivered}__isnull": False})
+    first_kept = (
+        model.objects.filter(created_at__gte=before).order_by("id").values_list("id", flat=True)
+    ).first()
+    if first_kept is not None:
+        old = old.filter(id__lt=first_kept)
+
+    deleted = 0
+    while True:
+        ids = list(old.order_by("id").values_list("id", flat=True)[:batch_size])
+        if ids:
+            deleted += model.objects.filter(id__in=ids).delete()[0]
+        if len(ids) < batch_size:
+            return deleted
+        time.sleep(pause)
+
+
+def delete_delivered(batch_size: int | None = None, pause: float | None = None) -> dict[str, int]:
+    """
+    Deletes task events published and notifications sent before their retention period.
+
+    Works in batches of ``batch_size`` rows with ``pause`` seconds between them; returns the
+    number of rows deleted per table.
+    """
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    pause = settings.RETENTION_BATCH_PAUSE if pause is None else pause
+    now = timezone.now()
+    return {
+        "task_events": delete_before(
+            TaskEvent,
+            "published_at",
+            now - datetime.timedelta(days=settings.TASK_EVENTS_RETENTION_DAYS),
+            batch_size,
+            pause,
+        ),
+        "notifications": delete_before(
+            Notification,
+            "sent_at",
+            now - datetime.timedelta(days=settings.NOTIFICATIONS_RETENTION_DAYS),
+            batch_size,
+            pause,
+        ),
+    }
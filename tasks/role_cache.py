@@ -0,0 +1,89 @@
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from tasks.cache import bump_version
+
+VERSION_KEY = "tasks:roles:version"
+# Roles are read from the primary even while the request reads from a replica: a lagging
+# replica would put the roles before a change into the cache under the new version.
+ROLES_DB = DEFAULT_DB_ALIAS
+
+
+class RoleCache:
+    """
+    Process-level copy of the role table and of the users' role sets.
+
+    The local copy is tagged with a version token kept in the shared Django cache; any change
+    of a ``Role`` row or of ``User.roles`` replaces the token, and every process drops its
+    copy the next time it notices the token moved. Role sets are kept for the
+    ``ROLE_CACHE_MAX_USERS`` most recently seen users.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: str | None = None
+        self._names: dict[int, str] | None = None
+        self._user_roles: OrderedDict[int, frozenset[int]] = OrderedDict()
+
+    def _sync(self) -> None:
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, uuid.uuid4().hex)
+            version = cache.get(VERSION_KEY)
+
+        if version != self._version:
+            with self._lock:
+                self._version = version
+                self._names = None
+                self._user_roles = OrderedDict()
+
+    @property
+    def version(self) -> str | None:
+        self._sync()
+        return self._version
+
+    def role_names(self) -> dict[int, str]:
+        from tasks.models import Role
+
+        self._sync()
+        names = self._names
+        if names is None:
+            names = dict(Role.objects.using(ROLES_DB).values_list("id", "name"))
+            self._names = names
+
+        return names
+
+    def user_role_names(self, user_id: int) -> frozenset[str]:
+        from tasks.models import User
+
+        names = self.role_names()
+        user_roles = self._user_roles
+        with self._lock:
+            role_ids = user_roles.get(user_id)
+            if role_ids is not None:
+                user_roles.move_to_end(user_id)
+
+        if role_ids is None:
+            role_ids = frozenset(
+                User.roles.through.objects.using(ROLES_DB)
+                .filter(user_id=user_id)
+                .values_list("role_id", flat=True)
+            )
+            with self._lock:
+                user_roles[user_id] = role_ids
+                while len(user_roles) > settings.ROLE_CACHE_MAX_USERS:
+                    user_roles.popitem(last=False)
+
+        return frozenset(names[role_id] for role_id in role_ids if role_id in names)
+
+    @staticmethod
+    def invalidate() -> None:
+        bump_version(VERSION_KEY)
+
+
+role_cache = RoleCache()
@@ -0,0 +1,44 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+STICKY_KEY = "tasks:replica:sticky:{user_id}"
+
+replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to a replica while ``replica_reads`` is set; everything else uses the primary.
+
+    Only read-only requests enable replica reads (see ``ReplicaReadMixin``), so queries made
+    while handling a write, and in Celery tasks and commands, always see the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and replica_reads.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+def stick_to_primary(user_id: int) -> None:
+    """Route the user's reads to the primary until the replicas have caught up."""
+    cache.set(STICKY_KEY.format(user_id=user_id), True, timeout=settings.REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(user_id: int) -> bool:
+    return cache.get(STICKY_KEY.format(user_id=user_id), False)
@@ -1,10 +1,166 @@
+import copy
+from typing import NamedTuple
+
+from django.conf import settings
 from django.contrib.auth.hashers import make_password
-from rest_framework import serializers
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model
+from django.utils import timezone
+from rest_framework import exceptions, permissions, serializers
 
+from tasks.cache import bump_generation
 from tasks.models import Role, Task, User
+from tasks.outbox import record_events, task_events
+
+
+def select_fields(request, available) -> list[str] | None:
+    """
+    Names of ``available`` picked by the ``fields`` and ``exclude`` query parameters.
+
+    Returns ``None`` when neither parameter is given.
+    """
+    params = {
+        param: [name for name in request.query_params.get(param, "").split(",") if name]
+        for param in ("fields", "exclude")
+        if param in request.query_params
+    }
+    if not params:
+        return None
+
+    errors = {
+        param: f"Unknown fields: {', '.join(unknown)}."
+        for param, names in params.items()
+        if (unknown := [name for name in names if name not in available])
+    }
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    selected = params.get("fields") or list(available)
+    excluded = set(params.get("exclude", ()))
+    return [name for name in available if name in selected and name not in excluded]
+
+
+class SparseFieldsMixin:
+    """Serializes only the fields selected by ``?fields=`` and ``?exclude=``."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return
+
+        selected = select_fields(request, self.fields)
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+
+class ExpandableFieldsMixin:
+    """
+    Renders the relations named by ``?expand=`` with nested serializers instead of ids.
+
+    ``expandable_fields`` maps field names to the serializer classes of the related models.
+    Serializers with ``admin_only = True`` render objects only admins may read, so only admins
+    can expand them.
+    """
+
+    expandable_fields: dict[str, type[serializers.ModelSerializer]] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return
+        if "expand" not in request.query_params:
+            return
+
+        names = [name for name in request.query_params["expand"].split(",") if name]
+        unknown = [name for name in names if name not in self.expandable_fields]
+        if unknown:
+            raise serializers.ValidationError({"expand": f"Unknown fields: {', '.join(unknown)}."})
+        if not request.user.is_admin:
+            denied = [
+                name
+                for name in names
+                if getattr(self.expandable_fields[name], "admin_only", False)
+            ]
+            if denied:
+                raise exceptions.PermissionDenied(
+                    {"expand": f"Only admins can expand: {', '.join(denied)}."}
+                )
+
+        for name in names:
+            field = self.fields.get(name)
+            if field is not None:
+                many = isinstance(field, serializers.ManyRelatedField)
+                self.fields[name] = self.expandable_fields[name](many=many, read_only=True)
+
+
+class RelatedPlan(NamedTuple):
+    select_related: list[str]
+    prefetch_related: list[str]
+    # Models rendered by nested serializers.
+    models: list[type[Model]]
+
+
+def plan_related(
+    serializer: serializers.ModelSerializer, prefix: str = "", joined: bool = True
+) -> RelatedPlan:
+    """
+    Lookups that load every relation ``serializer`` reads, so rendering runs no queries.
+
+    Forward foreign keys behind nested serializers are joined, many-to-many relations are
+    prefetched. Relations read in other ways are declared in ``Meta.select_related`` and
+    ``Meta.prefetch_related``.
+    """
+    meta = serializer.Meta
+    declared_select = [prefix + lookup for lookup in getattr(meta, "select_related", ())]
+    declared_prefetch = [prefix + lookup for lookup in getattr(meta, "prefetch_related", ())]
+    plan = RelatedPlan(
+        declared_select if joined else [],
+        declared_prefetch if joined else declared_select + declared_prefetch,
+        [],
+    )
+    for field in serializer.fields.values():
+        try:
+            model_field = meta.model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+
+        lookup = prefix + field.source
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if isinstance(nested, serializers.ModelSerializer):
+            join = joined and (model_field.many_to_one or model_field.one_to_one)
+            (plan.select_related if join else plan.prefetch_related).append(lookup)
+            plan.models.append(nested.Meta.model)
+            for lookups, nested_lookups in zip(plan, plan_related(nested, f"{lookup}__", join)):
+                lookups.extend(nested_lookups)
+        elif isinstance(field, serializers.ManyRelatedField):
+            plan.prefetch_related.append(lookup)
+
+    return plan
+
+
+class UserSummarySerializer(serializers.ModelSerializer):
+    # Users are listed to admins only, see ``UserListView``.
+    admin_only = True
+
+    class Meta:
+        model = User
+        fields = ("id", "email", "first_name", "last_name")
+
+
+class RoleSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Role
+        fields = ("id", "name")
+
 
+class RoleSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {"updated_by": UserSummarySerializer}
 
-class RoleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = "__all__"
@@ -16,7 +172,9 @@ class RoleCreateSerializer(serializers.ModelSerializer):
         exclude = ("created_at", "updated_at", "updated_by")
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {"roles": RoleSummarySerializer, "updated_by": UserSummarySerializer}
+
     class Meta:
         model = User
         fields = "__all__"
@@ -45,13 +203,164 @@ class UserUpdateSerializer(UserUpdateAdminSerializer):
         exclude = ("created_at", "updated_at", "updated_by", "roles", "is_active")
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsMixin, ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        "created_by": UserSummarySerializer,
+        "assigned_to": UserSummarySerializer,
+        "updated_by": UserSummarySerializer,
+    }
+
     class Meta:
         model = Task
-        fields = "__all__"
+        exclude = ("search_vector",)
 
 
 class TaskCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
-        exclude = ("created_by", "created_at", "updated_at", "updated_by")
+        exclude = ("created_by", "created_at", "updated_at", "updated_by", "search_vector")
+
+
+class TaskImportSerializer(TaskCreateSerializer):
+    """Row of ``manage.py import_tasks``; users are given by email and resolved per batch."""
+
+    created_by = serializers.EmailField()
+    assigned_to = serializers.EmailField(required=False, allow_null=True)
+
+    class Meta(TaskCreateSerializer.Meta):
+        exclude = ("created_at", "updated_at", "updated_by", "search_vector")
+
+    def resolve_user(self, email: str) -> int:
+        user_id = self.context["user_ids"].get(email)
+        if user_id is None:
+            raise serializers.ValidationError(f"User {email} does not exist.")
+        return user_id
+
+    def validate_created_by(self, value: str) -> int:
+        return self.resolve_user(value)
+
+    def validate_assigned_to(self, value: str | None) -> int | None:
+        return self.resolve_user(value) if value else None
+
+
+def as_pk(value) -> int | None:
+    """``value`` as an integer id, like ``PrefetchedUserField`` reads it; None if it isn't one."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class PrefetchedUserField(serializers.PrimaryKeyRelatedField):
+    """Resolves ids against ``context["users"]`` fetched once for the whole batch."""
+
+    def to_internal_value(self, data):
+        pk = as_pk(data)
+        if pk is None:
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+        user = self.context["users"].get(pk)
+        if user is None:
+            self.fail("does_not_exist", pk_value=data)
+
+        return user
+
+
+class TaskBulkItemSerializer(TaskCreateSerializer):
+    assigned_to = PrefetchedUserField(queryset=User.objects.all(), allow_null=True, required=False)
+
+
+class TaskBulkSerializer(serializers.Serializer):
+    def get_fields(self):
+        # Declared here because "create" and "update" clash with the serializer methods.
+        return {
+            "create": serializers.ListField(child=serializers.DictField(), default=list),
+            "update": serializers.ListField(child=serializers.DictField(), default=list),
+            "delete": serializers.ListField(child=serializers.IntegerField(), default=list),
+        }
+
+    def validate(self, attrs):
+        if sum(len(items) for items in attrs.values()) > settings.TASKS_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"At most {settings.TASKS_BULK_MAX_ITEMS} operations are allowed per request."
+            )
+
+        # Ids may come as strings, e.g. from form data; values that aren't ids fail per item.
+        user_ids = {as_pk(item.get("assigned_to")) for item in attrs["create"] + attrs["update"]}
+        task_ids = {as_pk(item.get("id")) for item in attrs["update"]}
+        user_ids.discard(None)
+        task_ids.discard(None)
+        context = {"users": User.objects.in_bulk(user_ids)}
+        tasks = Task.objects.visible_to(self.context["request"].user).in_bulk(
+            task_ids | set(attrs["delete"])
+        )
+
+        errors = {}
+        create, create_errors = [], []
+        for item in attrs["create"]:
+            serializer = TaskBulkItemSerializer(data=item, context=context)
+            serializer.is_valid()
+            create.append(serializer.validated_data)
+            create_errors.append(serializer.errors)
+
+        update, update_errors = [], []
+        for item in attrs["update"]:
+            item = dict(item)
+            task = tasks.get(as_pk(item.pop("id", None)))
+            serializer = TaskBulkItemSerializer(data=item, partial=True, context=context)
+            serializer.is_valid()
+            update.append((task, serializer.validated_data))
+            update_errors.append(
+                {"id": ["Not found."], **serializer.errors} if task is None else serializer.errors
+            )
+
+        delete_errors = [{} if pk in tasks else {"id": ["Not found."]} for pk in attrs["delete"]]
+
+        for key, item_errors in (
+            ("create", create_errors),
+            ("update", update_errors),
+            ("delete", delete_errors),
+        ):
+            if any(item_errors):
+                errors[key] = item_errors
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return {
+            "create": create,
+            "update": update,
+            "delete": [tasks[pk] for pk in dict.fromkeys(attrs["delete"])],
+        }
+
+    def create(self, validated_data) -> dict:
+        user_id = self.context["request"].user.id
+        now = timezone.now()
+
+        created = Task.objects.bulk_create(
+            Task(**data, created_by_id=user_id) for data in validated_data["create"]
+        )
+
+        events = [event for task in created for event in task_events(task)]
+        updated, fields = [], {"updated_at", "updated_by"}
+        for task, data in validated_data["update"]:
+            previous = copy.copy(task)
+            for attr, value in data.items():
+                setattr(task, attr, value)
+            task.updated_at, task.updated_by_id = now, user_id
+            fields.update(data)
+            updated.append(task)
+            events.extend(task_events(task, previous))
+        Task.objects.bulk_update(updated, fields)
+
+        deleted = [task.id for task in validated_data["delete"]]
+        Task.objects.filter(id__in=deleted).delete()
+
+        # bulk_create/bulk_update don't send model signals.
+        bump_generation(Task)
+        record_events(events)
+
+        return {
+            "created": TaskSerializer(created, many=True).data,
+            "updated": TaskSerializer(updated, many=True).data,
+            "deleted": deleted,
+        }
@@ -0,0 +1,29 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from tasks.cache import bump_generation
+from tasks.models import Role, Task, User
+from tasks.role_cache import role_cache
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_role_cache(sender, **kwargs):
+    role_cache.invalidate()
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_user_roles_cache(sender, action: str, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        role_cache.invalidate()
+        bump_generation(User)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def bump_response_cache_generation(sender, **kwargs):
+    bump_generation(sender)
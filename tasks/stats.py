@@ -0,0 +1,107 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from tasks.models import TASK_STATUS_CHOICES, Task, TaskCounter, TaskCounterState
+
+COMPLETED = "C"
+# Day the counters are bucketed for, see ``TaskCounterState``.
+AS_OF_KEY = "tasks:counters:as_of"
+
+
+def rebucket_task_counters(today: datetime.date | None = None) -> int:
+    """
+    Moves the counters to the due buckets of ``today``; returns the number of tasks moved.
+
+    Only tasks due between the Monday of the previous day and the Sunday of ``today`` are
+    recounted. Does nothing if the counters are bucketed for ``today`` or a later day.
+    """
+    today = today or timezone.localdate()
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT * FROM tasks_task_counter_rebucket(%s)", [today])
+        as_of, moved = cursor.fetchone()
+
+    cache.set(AS_OF_KEY, as_of, timeout=None)
+    return moved
+
+
+def counters_as_of(today: datetime.date) -> datetime.date:
+    """The day the counters are bucketed for; read from the primary until it is ``today``."""
+    as_of = cache.get(AS_OF_KEY)
+    if as_of != today:
+        as_of = (
+            TaskCounterState.objects.using(DEFAULT_DB_ALIAS).values_list("as_of", flat=True).get()
+        )
+        cache.set(AS_OF_KEY, as_of, timeout=None)
+    return as_of
+
+
+def task_stats(user, today: datetime.date | None = None) -> dict:
+    """
+    Task counts visible to ``user``, read from ``TaskCounter`` instead of the tasks table.
+
+    ``overdue`` and ``due_this_week`` count open tasks; the week runs Monday to Sunday. Until
+    the daily rebucketing has run they are counted from the tasks table: reads never move the
+    counters, which would hold off task writes.
+    """
+    today = today or timezone.localdate()
+    counters = TaskCounter.objects.all()
+    tasks = Task.objects.exclude(status=COMPLETED)
+    if not user.is_admin:
+        visible = Q(created_by=user.id) | Q(assigned_to=user.id)
+        counters = counters.filter(visible)
+        tasks = tasks.filter(visible)
+
+    is_open = ~Q(status=COMPLETED)
+    rows = (
+        counters.values("status", "assigned_to")
+        .annotate(
+            total=Sum("count"),
+            overdue=Sum(
+                "count", filter=is_open & Q(due_bucket__in=("past", "week_past")), default=0
+            ),
+            due_this_week=Sum(
+                "count", filter=is_open & Q(due_bucket__in=("week_past", "week")), default=0
+            ),
+        )
+        .order_by()
+    )
+
+    stats = {
+        "total": 0,
+        "by_status": {status: 0 for status, _ in TASK_STATUS_CHOICES},
+        "overdue": 0,
+        "due_this_week": 0,
+    }
+    by_assignee: dict[int | None, int] = {}
+    for row in rows:
+        stats["total"] += row["total"]
+        stats["by_status"][row["status"]] += row["total"]
+        stats["overdue"] += row["overdue"]
+        stats["due_this_week"] += row["due_this_week"]
+        by_assignee[row["assigned_to"]] = by_assignee.get(row["assigned_to"], 0) + row["total"]
+
+    if counters_as_of(today) != today:
+        monday = today - datetime.timedelta(days=today.weekday())
+        stats.update(
+            tasks.aggregate(
+                overdue=Count("id", filter=Q(due_date__lt=today)),
+                due_this_week=Count(
+                    "id",
+                    filter=Q(
+                        due_date__gte=monday, due_date__lt=monday + datetime.timedelta(days=7)
+                    ),
+                ),
+            )
+        )
+
+    stats["by_assignee"] = [
+        {"assigned_to": assigned_to, "count": count}
+        for assigned_to, count in sorted(
+            by_assignee.items(), key=lambda item: (-item[1], item[0] or 0)
+        )
+    ]
+    return stats
@@ -1,7 +1,19 @@
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def primary_only(settings):
+    # Test data is uncommitted, so replica connections can't see it; see test_replicas.py.
+    settings.DATABASE_REPLICAS = []
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
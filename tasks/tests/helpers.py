@@ -1,3 +1,127 @@
 from datetime import date, timedelta
+from typing import NamedTuple
+
+from django.contrib.auth.hashers import make_password
+
+from tasks.cache import bump_generation
+from tasks.constants import SystemRole
+from tasks.models import Role, Task, User
+from tasks.partitions import analyze_tasks_table
+from tasks.role_cache import role_cache
 
 TOMORROW = str(date.today() + timedelta(days=1))
+SEED_PASSWORD = "seed@35762!"
+
+
+class Endpoint(NamedTuple):
+    method: str
+    # Formatted with the ids of the seeded task and user.
+    url: str
+    # SQL queries per request, checked with a warm role cache and the response cache off.
+    # Must not grow with the number of rows.
+    budget: int
+    as_admin: bool = True
+    authenticated: bool = True
+    data: dict | None = None
+
+
+ENDPOINTS = {
+    "tasks": Endpoint("get", "/api/tasks/?page_size=50", 2),
+    "tasks_filtered": Endpoint("get", "/api/tasks/?status=N&ordering=due_date&page_size=50", 2),
+    "tasks_search": Endpoint("get", "/api/tasks/?search=report&page_size=50", 2),
+    "tasks_visible": Endpoint("get", "/api/tasks/?page_size=50", 2, as_admin=False),
+    "tasks_with_archived": Endpoint("get", "/api/tasks/?include_archived=1&page_size=50", 2),
+    "tasks_expanded": Endpoint(
+        "get", "/api/tasks/?expand=created_by,assigned_to,updated_by&page_size=50", 2
+    ),
+    "task_detail": Endpoint("get", "/api/tasks/{task}/", 2),
+    "task_detail_expanded": Endpoint("get", "/api/tasks/{task}/?expand=created_by", 2),
+    "task_create": Endpoint(
+        "post",
+        "/api/tasks/",
+        6,
+        data={"title": "new task", "description": "created", "assigned_to": "{user}"},
+    ),
+    "task_stats": Endpoint("get", "/api/tasks/stats/", 2, as_admin=False),
+    "users": Endpoint("get", "/api/users/", 3),
+    "users_expanded": Endpoint("get", "/api/users/?expand=roles,updated_by", 3),
+    "user_detail": Endpoint("get", "/api/users/{user}/", 3),
+    "roles": Endpoint("get", "/api/roles/", 2),
+    "roles_expanded": Endpoint("get", "/api/roles/?expand=updated_by", 2),
+    "token": Endpoint(
+        "post",
+        "/api/token/",
+        1,
+        as_admin=False,
+        authenticated=False,
+        data={"email": "{email}", "password": "{password}"},
+    ),
+}
+
+
+def build_request(
+    endpoint: Endpoint, seeded: dict, password: str
+) -> tuple[str, dict | None, User]:
+    user = seeded["admin"] if endpoint.as_admin else seeded["users"][0]
+    params = {
+        "task": seeded["task"].id,
+        "user": seeded["users"][0].id,
+        "email": user.email,
+        "password": password,
+    }
+    data = endpoint.data and {key: value.format(**params) for key, value in endpoint.data.items()}
+    return endpoint.url.format(**params), data, user
+
+
+def seed_volume(users: int, roles: int, tasks: int, password: str) -> dict:
+    """
+    Bulk inserts ``users`` users, ``roles`` extra roles and ``tasks`` tasks.
+
+    Can be called again to add more rows; the admin is created by the first call.
+    """
+    admin = User.objects.filter(email="admin@mail.com").first()
+    if admin is None:
+        admin = User.objects.create_superuser(email="admin@mail.com", password=password)
+
+    offset = Role.objects.count()
+    Role.objects.bulk_create(Role(name=f"role {offset + index}") for index in range(roles))
+    assignable = list(Role.objects.exclude(name=SystemRole.ADMIN).order_by("id"))
+
+    hashed = make_password(password)
+    offset = User.objects.count()
+    created = User.objects.bulk_create(
+        (
+            User(email=f"user{offset + index}@mail.com", first_name="User", password=hashed)
+            for index in range(users)
+        ),
+        batch_size=5000,
+    )
+    User.roles.through.objects.bulk_create(
+        (
+            User.roles.through(user_id=user.id, role_id=role.id)
+            for index, user in enumerate(created)
+            for role in {assignable[index % len(assignable)], assignable[index // 2 % 2]}
+        ),
+        batch_size=5000,
+    )
+    owners = created or [admin]
+    Task.objects.bulk_create(
+        (
+            Task(
+                title=f"task {index}" if index % 10 else f"report {index}",
+                description=f"description of task {index}",
+                status="NIC"[index % 3],
+                due_date=date.today() + timedelta(days=index % 60 - 30) if index % 5 else None,
+                created_by=owners[index % len(owners)],
+                assigned_to=owners[(index * 7 + 1) % len(owners)] if index % 4 else None,
+            )
+            for index in range(tasks)
+        ),
+        batch_size=5000,
+    )
+    # Like the daily partition job, so the planner sees the rows just inserted.
+    analyze_tasks_table()
+    # bulk_create doesn't send the signals that invalidate these.
+    role_cache.invalidate()
+    bump_generation(Task, User, Role)
+    return {"admin": admin, "users": created, "task": Task.objects.order_by("id").first()}
@@ -0,0 +1,141 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from tasks.archive import archive_completed_tasks
+from tasks.constants import SystemRole
+from tasks.models import ArchivedTask, Task, User
+from tasks.tests.conftest import sign_in
+
+
+@pytest.mark.django_db
+class TestTaskArchive:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.operator = User.objects.create_user(
+            email="operator@mail.com", password="operator@35762!", roles=[SystemRole.OPERATOR]
+        )
+        self.old = [
+            Task.objects.create(
+                title=f"old {index}",
+                description="done long ago",
+                status="C",
+                created_by=self.manager,
+                assigned_to=self.operator if index % 2 else None,
+            )
+            for index in range(5)
+        ]
+        self.recent = Task.objects.create(
+            title="recent", description="done today", status="C", created_by=self.manager
+        )
+        self.open = Task.objects.create(
+            title="open", description="not done", status="I", created_by=self.manager
+        )
+        long_ago = timezone.now() - datetime.timedelta(days=100)
+        Task.objects.filter(title__startswith="old").update(updated_at=long_ago)
+        Task.objects.filter(id=self.open.id).update(updated_at=long_ago)
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def get(self, api_client, url: str, token: str | None = None, **headers):
+        token = token or self.token
+        return api_client.get(url, headers={"Authorization": f"Bearer {token}", **headers})
+
+    def titles(self, response) -> list[str]:
+        data = response.json()
+        if isinstance(data, dict):
+            data = data["results"]
+        return sorted(task["title"] for task in data)
+
+    def test_archive(self, setup, api_client):
+        stats = self.get(api_client, "/api/tasks/stats/").json()
+        assert stats["by_status"]["C"] == 6
+
+        assert archive_completed_tasks(after_days=90, batch_size=2, pause=0) == 5
+        assert archive_completed_tasks(after_days=90, batch_size=2, pause=0) == 0
+
+        assert sorted(Task.objects.values_list("title", flat=True)) == ["open", "recent"]
+        archived = ArchivedTask.objects.get(id=self.old[1].id)
+        assert (archived.title, archived.created_by_id, archived.assigned_to_id) == (
+            "old 1",
+            self.manager.id,
+            self.operator.id,
+        )
+        assert archived.created_at == self.old[1].created_at
+        assert archived.archived_at is not None
+
+        # The stats count the tasks the list shows.
+        stats = self.get(api_client, "/api/tasks/stats/").json()
+        assert stats["by_status"]["C"] == 1
+        assert stats["total"] == 2
+
+    @pytest.mark.parametrize("urlconf", ["task_manager.urls", "task_manager.urls_async"])
+    @pytest.mark.parametrize("values_serialization", [True, False])
+    def test_list(self, setup, api_client, settings, urlconf, values_serialization):
+        settings.ROOT_URLCONF = urlconf
+        settings.LIST_VALUES_SERIALIZATION = values_serialization
+        before = self.get(api_client, "/api/tasks/?include_archived=1").json()
+        etag = self.get(api_client, "/api/tasks/")["ETag"]
+        archive_completed_tasks(after_days=90, pause=0)
+
+        response = self.get(api_client, "/api/tasks/", **{"If-None-Match": etag})
+        assert response.status_code == 200
+        assert self.titles(response) == ["open", "recent"]
+
+        response = self.get(api_client, "/api/tasks/?include_archived=1")
+        assert sorted(response.json(), key=lambda task: task["id"]) == sorted(
+            before, key=lambda task: task["id"]
+        )
+
+    def test_list_filters(self, setup, api_client):
+        archive_completed_tasks(after_days=90, pause=0)
+
+        response = self.get(api_client, "/api/tasks/?include_archived=1&status=C&page_size=2")
+        assert [task["title"] for task in response.json()["results"]] == ["recent", "old 4"]
+        response = self.get(api_client, response.json()["next"])
+        assert [task["title"] for task in response.json()["results"]] == ["old 3", "old 2"]
+
+        response = self.get(
+            api_client, "/api/tasks/?include_archived=1&search=old&expand=assigned_to"
+        )
+        assert self.titles(response) == [f"old {index}" for index in range(5)]
+
+        operator = sign_in(api_client, "operator@mail.com", "operator@35762!")
+        response = self.get(api_client, "/api/tasks/?include_archived=1", operator)
+        assert self.titles(response) == ["old 1", "old 3"]
+
+    @pytest.mark.parametrize("urlconf", ["task_manager.urls", "task_manager.urls_async"])
+    def test_detail(self, setup, api_client, settings, urlconf):
+        settings.ROOT_URLCONF = urlconf
+        url = f"/api/tasks/{self.old[1].id}/"
+        before = self.get(api_client, url)
+        archive_completed_tasks(after_days=90, pause=0)
+
+        response = self.get(api_client, url)
+        assert response.status_code == 200
+        assert response.json() == before.json()
+        assert response["ETag"] == before["ETag"]
+
+        response = self.get(api_client, f"{url}?fields=title,created_by&expand=created_by")
+        assert response.json()["created_by"]["email"] == "manager@mail.com"
+
+        operator = sign_in(api_client, "operator@mail.com", "operator@35762!")
+        assert self.get(api_client, url, operator).status_code == 200
+        assert self.get(api_client, f"/api/tasks/{self.old[0].id}/", operator).status_code == 403
+
+    def test_archived_read_only(self, setup, api_client):
+        archive_completed_tasks(after_days=90, pause=0)
+        headers = {"Authorization": f"Bearer {self.token}"}
+
+        url = f"/api/tasks/{self.old[0].id}/"
+        assert api_client.post(url, {"status": "I"}, headers=headers).status_code == 404
+        assert api_client.delete(url, headers=headers).status_code == 404
+        assert ArchivedTask.objects.filter(id=self.old[0].id).exists()
+        assert not Task.objects.filter(id=self.old[0].id).exists()
+
+    def test_missing(self, setup, api_client):
+        assert self.get(api_client, "/api/tasks/0/").status_code == 404
@@ -0,0 +1,108 @@
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.urls import resolve
+
+from tasks.constants import SystemRole
+from tasks.models import Role, Task, User
+from tasks.tests.conftest import sign_in
+
+ASYNC_URLCONF = "task_manager.urls_async"
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.task1 = Task.objects.create(
+            title="task 1", description="description 1", created_by=self.admin
+        )
+        self.task2 = Task.objects.create(
+            title="task 2",
+            description="description 2",
+            created_by=self.manager,
+            assigned_to=self.admin,
+        )
+        self.role = Role.objects.get(name=SystemRole.MANAGER)
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def request(self, api_client, method: str, url: str, **kwargs):
+        headers = {"Authorization": f"Bearer {self.token}", **kwargs.pop("headers", {})}
+        return getattr(api_client, method)(url, headers=headers, **kwargs)
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_views_are_async(self):
+        for url in ("/api/tasks/", "/api/tasks/1/", "/api/tasks/export/", "/api/users/"):
+            assert iscoroutinefunction(resolve(url).func)
+        for url in ("/api/users/1/", "/api/roles/", "/api/roles/1/"):
+            assert iscoroutinefunction(resolve(url).func)
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/tasks/",
+            "/api/tasks/?page_size=1",
+            "/api/tasks/?status=N&ordering=due_date&page_size=1",
+            "/api/tasks/{task}/",
+            "/api/users/",
+            "/api/users/{user}/",
+            "/api/roles/",
+            "/api/roles/{role}/",
+        ],
+    )
+    def test_same_responses(self, setup, api_client, settings, url):
+        url = url.format(task=self.task2.id, user=self.manager.id, role=self.role.id)
+        sync_response = self.request(api_client, "get", url)
+
+        settings.ROOT_URLCONF = ASYNC_URLCONF
+        async_response = self.request(api_client, "get", url)
+
+        assert async_response.status_code == sync_response.status_code == 200
+        assert async_response.json() == sync_response.json()
+        assert async_response.get("Last-Modified") == sync_response.get("Last-Modified")
+
+        response = self.request(
+            api_client, "get", url, headers={"If-None-Match": async_response["ETag"]}
+        )
+        assert response.status_code == 304
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_list_cache(self, setup, api_client, django_assert_max_num_queries):
+        self.request(api_client, "get", "/api/tasks/")
+
+        # Only the authenticated user.
+        with django_assert_max_num_queries(1):
+            response = self.request(api_client, "get", "/api/tasks/")
+        assert len(response.json()) == 2
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_writes(self, setup, api_client):
+        response = self.request(
+            api_client, "post", "/api/tasks/", data={"title": "new", "description": "desc"}
+        )
+        assert response.status_code == 201
+
+        task_id = response.json()["id"]
+        response = self.request(api_client, "post", f"/api/tasks/{task_id}/", data={"status": "I"})
+        assert response.status_code == 200
+        assert Task.objects.get(id=task_id).status == "I"
+
+        response = self.request(api_client, "delete", f"/api/tasks/{task_id}/")
+        assert response.status_code == 200
+        assert not Task.objects.filter(id=task_id).exists()
+
+    @pytest.mark.urls(ASYNC_URLCONF)
+    def test_errors(self, setup, api_client):
+        assert api_client.get("/api/tasks/").status_code == 401
+        assert self.request(api_client, "get", "/api/users/0/").status_code == 404
+        assert self.request(api_client, "get", "/api/roles/0/").status_code == 404
+        assert self.request(api_client, "put", "/api/roles/0/").status_code == 405
+
+        token = sign_in(api_client, "manager@mail.com", "manager@35762!")
+        response = api_client.get(
+            f"/api/users/{self.admin.id}/", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 403
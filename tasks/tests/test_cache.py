@@ -0,0 +1,85 @@
+import pytest
+
+from tasks.cache import response_cache_stats
+from tasks.constants import SystemRole
+from tasks.models import Role, Task, User
+from tasks.role_cache import RoleCache
+from tasks.tests.conftest import sign_in
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.task = Task.objects.create(
+            title="task 1", description="description 1", created_by=self.manager
+        )
+        self.admin_token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+        self.manager_token = sign_in(api_client, "manager@mail.com", "manager@35762!")
+
+    @staticmethod
+    def get(api_client, url: str, token: str, **params):
+        return api_client.get(url, data=params, headers={"Authorization": f"Bearer {token}"})
+
+    @pytest.mark.parametrize(
+        "url, view",
+        [
+            ("/api/tasks/", "TaskListView"),
+            ("/api/users/", "UserListView"),
+            ("/api/roles/", "RoleListView"),
+        ],
+    )
+    def test_hit(self, setup, api_client, url, view, django_assert_max_num_queries):
+        hits = response_cache_stats().get(view, {"hits": 0})["hits"]
+        first = self.get(api_client, url, self.admin_token)
+
+        # Only authentication is left on a hit.
+        with django_assert_max_num_queries(1):
+            second = self.get(api_client, url, self.admin_token)
+
+        assert second.json() == first.json()
+        assert response_cache_stats()[view]["hits"] == hits + 1
+
+    def test_scopes_and_params(self, setup, api_client):
+        Task.objects.create(title="task 2", description="description 2", created_by=self.admin)
+
+        assert len(self.get(api_client, "/api/tasks/", self.admin_token).json()) == 2
+        assert len(self.get(api_client, "/api/tasks/", self.manager_token).json()) == 1
+        assert len(self.get(api_client, "/api/tasks/", self.admin_token, status="P").json()) == 0
+
+    def test_invalidated_on_save_and_delete(self, setup, api_client):
+        self.get(api_client, "/api/tasks/", self.manager_token)
+
+        self.task.title = "renamed"
+        self.task.save()
+        resp_data = self.get(api_client, "/api/tasks/", self.manager_token).json()
+        assert resp_data[0]["title"] == "renamed"
+
+        self.task.delete()
+        assert self.get(api_client, "/api/tasks/", self.manager_token).json() == []
+
+    def test_invalidated_on_roles_change(self, setup, api_client):
+        resp_data = self.get(api_client, "/api/users/", self.admin_token).json()
+        manager_data = next(user for user in resp_data if user["id"] == self.manager.id)
+        assert len(manager_data["roles"]) == 1
+
+        self.manager.roles.add(Role.objects.get(name=SystemRole.OPERATOR))
+        resp_data = self.get(api_client, "/api/users/", self.admin_token).json()
+        manager_data = next(user for user in resp_data if user["id"] == self.manager.id)
+        assert len(manager_data["roles"]) == 2
+
+    def test_role_cache_bounded(self, setup, settings, django_assert_num_queries):
+        settings.ROLE_CACHE_MAX_USERS = 1
+        roles = RoleCache()
+        assert roles.user_role_names(self.admin.id) == {SystemRole.ADMIN}
+        assert roles.user_role_names(self.manager.id) == {SystemRole.MANAGER}
+
+        # The admin's roles were evicted, the manager's are still cached.
+        with django_assert_num_queries(0):
+            roles.user_role_names(self.manager.id)
+        with django_assert_num_queries(1):
+            roles.user_role_names(self.admin.id)
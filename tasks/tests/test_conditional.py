@@ -0,0 +1,102 @@
+import pytest
+
+from tasks.constants import SystemRole
+from tasks.models import Role, Task, User
+from tasks.tests.conftest import sign_in
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.task = Task.objects.create(
+            title="task 1", description="description 1", created_by=self.manager
+        )
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def get(self, api_client, url: str, **headers):
+        return api_client.get(url, headers={"Authorization": f"Bearer {self.token}", **headers})
+
+    @pytest.mark.parametrize(
+        "url, detail",
+        [
+            ("/api/tasks/", False),
+            ("/api/users/", False),
+            ("/api/roles/", False),
+            ("/api/tasks/{task}/", True),
+            ("/api/users/{user}/", True),
+        ],
+    )
+    def test_not_modified(self, setup, api_client, url, detail):
+        url = url.format(task=self.task.id, user=self.manager.id)
+        response = self.get(api_client, url)
+        etag = response["ETag"]
+
+        assert response.status_code == 200
+        # Lists are validated by the ETag only.
+        assert response.has_header("Last-Modified") == detail
+
+        response = self.get(api_client, url, **{"If-None-Match": etag})
+        assert response.status_code == 304
+        assert not response.content
+
+    def test_task_changes(self, setup, api_client):
+        etag = self.get(api_client, "/api/tasks/")["ETag"]
+        detail_etag = self.get(api_client, f"/api/tasks/{self.task.id}/")["ETag"]
+
+        self.task.status = "I"
+        self.task.save()
+        response = self.get(api_client, "/api/tasks/", **{"If-None-Match": etag})
+        assert response.status_code == 200
+        detail_response = self.get(
+            api_client, f"/api/tasks/{self.task.id}/", **{"If-None-Match": detail_etag}
+        )
+        assert detail_response.status_code == 200
+
+        self.task.delete()
+        response = self.get(api_client, "/api/tasks/", **{"If-None-Match": response["ETag"]})
+        assert response.status_code == 200
+
+    def test_role_changes(self, setup, api_client):
+        etag = self.get(api_client, f"/api/users/{self.manager.id}/")["ETag"]
+
+        self.manager.roles.add(Role.objects.get(name=SystemRole.OPERATOR))
+        response = self.get(
+            api_client, f"/api/users/{self.manager.id}/", **{"If-None-Match": etag}
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()["roles"]) == 2
+
+    def test_if_modified_since(self, setup, api_client):
+        url = f"/api/tasks/{self.task.id}/"
+        last_modified = self.get(api_client, url)["Last-Modified"]
+        response = self.get(api_client, url, **{"If-Modified-Since": last_modified})
+
+        assert response.status_code == 304
+
+    def test_list_changes_without_updated_at(self, setup, api_client):
+        etag = self.get(api_client, "/api/users/")["ETag"]
+        self.manager.roles.add(Role.objects.get(name=SystemRole.OPERATOR))
+        response = self.get(api_client, "/api/users/", **{"If-None-Match": etag})
+        assert response.status_code == 200
+
+        etag = self.get(api_client, "/api/tasks/")["ETag"]
+        Task.objects.filter(id=self.task.id).delete()
+        response = self.get(api_client, "/api/tasks/", **{"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_list_not_modified_reads_no_rows(
+        self, setup, api_client, django_assert_max_num_queries
+    ):
+        etag = self.get(api_client, "/api/tasks/?page_size=1")["ETag"]
+
+        # Only the authenticated user.
+        with django_assert_max_num_queries(1):
+            response = self.get(api_client, "/api/tasks/?page_size=1", **{"If-None-Match": etag})
+        assert response.status_code == 304
@@ -0,0 +1,14 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from task_manager.db import check_connection_capacity
+
+
+@pytest.mark.django_db
+class TestConnectionCapacity:
+    def test_enough_connections(self):
+        assert check_connection_capacity(1) >= 1
+
+    def test_not_enough_connections(self):
+        with pytest.raises(ImproperlyConfigured):
+            check_connection_capacity(100000)
@@ -0,0 +1,168 @@
+from types import SimpleNamespace
+
+import pytest
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tasks.constants import SystemRole
+from tasks.models import Role, Task, User
+from tasks.serializers import TaskSerializer, UserSerializer, plan_related
+from tasks.tests.conftest import sign_in
+
+
+def serializer_for(serializer_class, query: str):
+    request = Request(APIRequestFactory().get(f"/?{query}"))
+    request.user = SimpleNamespace(is_admin=True)
+    return serializer_class(context={"request": request})
+
+
+@pytest.mark.django_db
+class TestExpand:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com",
+            password="manager@35762!",
+            roles=[SystemRole.MANAGER],
+            first_name="Ann",
+        )
+        self.task1 = Task.objects.create(
+            title="task 1", description="description 1", created_by=self.admin
+        )
+        self.task2 = Task.objects.create(
+            title="task 2",
+            description="description 2",
+            created_by=self.manager,
+            assigned_to=self.admin,
+        )
+        self.role = Role.objects.get(name=SystemRole.MANAGER)
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def get(self, api_client, url: str, **headers):
+        return api_client.get(url, headers={"Authorization": f"Bearer {self.token}", **headers})
+
+    def summary(self, user: User) -> dict:
+        return {
+            "id": user.id,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+        }
+
+    @pytest.mark.parametrize("urlconf", ["task_manager.urls", "task_manager.urls_async"])
+    def test_task_list(self, setup, api_client, settings, urlconf):
+        settings.ROOT_URLCONF = urlconf
+        response = self.get(
+            api_client, "/api/tasks/?expand=created_by,assigned_to&ordering=updated_at"
+        )
+
+        assert response.status_code == 200
+        task1, task2 = response.json()
+        assert task1["created_by"] == self.summary(self.admin)
+        assert task1["assigned_to"] is None
+        assert task2["created_by"] == self.summary(self.manager)
+        assert task2["assigned_to"] == self.summary(self.admin)
+        assert task2["updated_by"] is None
+
+    @pytest.mark.parametrize("urlconf", ["task_manager.urls", "task_manager.urls_async"])
+    def test_user_detail(self, setup, api_client, settings, urlconf):
+        settings.ROOT_URLCONF = urlconf
+        response = self.get(api_client, f"/api/users/{self.manager.id}/?expand=roles")
+
+        assert response.status_code == 200
+        assert response.json()["roles"] == [{"id": self.role.id, "name": SystemRole.MANAGER}]
+
+    def test_with_fields(self, setup, api_client):
+        response = self.get(
+            api_client, f"/api/tasks/{self.task2.id}/?fields=title,created_by&expand=created_by"
+        )
+        assert response.json() == {"title": "task 2", "created_by": self.summary(self.manager)}
+
+        # Relations dropped by ?fields= are not expanded.
+        response = self.get(api_client, f"/api/tasks/{self.task2.id}/?fields=id&expand=created_by")
+        assert response.json() == {"id": self.task2.id}
+
+    def test_unknown_field(self, setup, api_client):
+        response = self.get(api_client, "/api/tasks/?expand=created_by,description")
+
+        assert response.status_code == 400
+        assert response.json() == {"expand": "Unknown fields: description."}
+
+    @pytest.mark.parametrize("urlconf", ["task_manager.urls", "task_manager.urls_async"])
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/tasks/?expand=created_by",
+            "/api/tasks/{task}/?expand=assigned_to",
+            "/api/tasks/{task}/?fields=id,updated_by&expand=updated_by",
+            "/api/users/{user}/?expand=updated_by",
+        ],
+    )
+    def test_users_admin_only(self, setup, api_client, settings, urlconf, url):
+        settings.ROOT_URLCONF = urlconf
+        self.manager.updated_by = self.admin
+        self.manager.save()
+        token = sign_in(api_client, "manager@mail.com", "manager@35762!")
+        url = url.format(task=self.task2.id, user=self.manager.id)
+
+        response = api_client.get(url, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 403
+        assert "admin@mail.com" not in response.content.decode()
+
+        response = api_client.get(
+            f"/api/users/{self.manager.id}/?expand=roles",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.json()["roles"] == [{"id": self.role.id, "name": SystemRole.MANAGER}]
+
+    @pytest.mark.parametrize(
+        "url", ["/api/tasks/?expand=created_by", "/api/tasks/{task}/?expand=created_by"]
+    )
+    def test_related_change(self, setup, api_client, url):
+        url = url.format(task=self.task2.id)
+        etag = self.get(api_client, url)["ETag"]
+
+        self.manager.first_name = "Kate"
+        self.manager.save()
+
+        response = self.get(api_client, url, **{"If-None-Match": etag})
+        assert response.status_code == 200
+        assert "Kate" in response.content.decode()
+
+    def test_plan(self):
+        plan = plan_related(serializer_for(TaskSerializer, "expand=created_by,updated_by"))
+        assert plan == (["created_by", "updated_by"], [], [User, User])
+
+        plan = plan_related(serializer_for(TaskSerializer, "fields=id,title"))
+        assert plan == ([], [], [])
+
+        plan = plan_related(serializer_for(UserSerializer, ""))
+        assert plan == ([], ["roles"], [])
+
+        plan = plan_related(serializer_for(UserSerializer, "expand=roles,updated_by"))
+        assert plan == (["updated_by"], ["roles"], [User, Role])
+
+    def test_declared_lookups(self):
+        class CreatorSerializer(serializers.ModelSerializer):
+            roles = serializers.SerializerMethodField()
+
+            class Meta:
+                model = User
+                fields = ("id", "roles")
+                prefetch_related = ("roles",)
+
+            def get_roles(self, user: User) -> list[str]:
+                return [role.name for role in user.roles.all()]
+
+        class TaskCreatorSerializer(serializers.ModelSerializer):
+            created_by = CreatorSerializer()
+
+            class Meta:
+                model = Task
+                fields = ("id", "created_by")
+                select_related = ("assigned_to",)
+
+        plan = plan_related(TaskCreatorSerializer())
+        assert plan == (["assigned_to", "created_by"], ["created_by__roles"], [User])
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.asgi import get_asgi_application
+from django.db import connection
+
+from tasks.constants import SystemRole
+from tasks.models import Task
+from tasks.tests.conftest import sign_in
+from tasks.tests.test_tasks import TestTasksBase
+
+
+@pytest.mark.django_db
+class TestTasksExport(TestTasksBase):
+    def export(self, api_client, role: SystemRole, **params):
+        email, password = self.ROLE_TO_USER_DATA.get(role)
+        token = sign_in(api_client, email, password)
+        response = api_client.get(
+            "/api/tasks/export/", data=params, headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+        content = b"".join(response.streaming_content).decode()
+        list_data = api_client.get(
+            "/api/tasks/",
+            data={key: value for key, value in params.items() if key != "format"},
+            headers={"Authorization": f"Bearer {token}"},
+        ).json()
+        return response, content, sorted(list_data, key=lambda task: task["id"])
+
+    @pytest.mark.parametrize("role", [SystemRole.ADMIN, SystemRole.OPERATOR])
+    def test_ndjson(self, setup, api_client, role):
+        response, content, list_data = self.export(api_client, role)
+
+        assert response["Content-Type"] == "application/x-ndjson; charset=utf-8"
+        assert [json.loads(line) for line in content.splitlines()] == list_data
+
+    def test_csv(self, setup, api_client):
+        response, content, list_data = self.export(
+            api_client, SystemRole.ADMIN, format="csv", status="N"
+        )
+        rows = list(csv.DictReader(io.StringIO(content)))
+
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        assert [int(row["id"]) for row in rows] == [task["id"] for task in list_data]
+        assert rows[0]["title"] == list_data[0]["title"]
+        assert rows[0]["due_date"] == list_data[0]["due_date"]
+        assert rows[0]["created_at"] == list_data[0]["created_at"]
+
+    @pytest.mark.django_db(transaction=True, serialized_rollback=True)
+    def test_streams_in_transaction(self, setup, api_client, settings):
+        settings.TASKS_EXPORT_CHUNK_SIZE = 1
+        token = sign_in(api_client, *self.ROLE_TO_USER_DATA[SystemRole.ADMIN])
+        response = api_client.get(
+            "/api/tasks/export/", headers={"Authorization": f"Bearer {token}"}
+        )
+        content = iter(response.streaming_content)
+        next(content)
+
+        # A cursor WITH HOLD would be materialized in full before the first row.
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT is_holdable FROM pg_cursors")
+            assert cursor.fetchall() == [(False,)]
+
+        response.close()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM pg_cursors")
+            assert cursor.fetchone()[0] == 0
+
+    @pytest.mark.django_db(transaction=True, serialized_rollback=True)
+    def test_asgi_streams(self, setup, api_client, settings):
+        settings.TASKS_EXPORT_CHUNK_SIZE = 1
+        settings.ROOT_URLCONF = "task_manager.urls_async"
+        token = sign_in(api_client, *self.ROLE_TO_USER_DATA[SystemRole.ADMIN])
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/tasks/export/",
+            "query_string": b"",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+        body = []
+        cursors_open = []
+
+        def count_cursors() -> int:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT count(*) FROM pg_cursors")
+                return cursor.fetchone()[0]
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                body.append(message["body"])
+                cursors_open.append(await sync_to_async(count_cursors)())
+
+        async_to_sync(get_asgi_application())(scope, receive, send)
+
+        lines = b"".join(body).decode().splitlines()
+        assert len(lines) == len(body) == Task.objects.count()
+        # Each row is sent while the cursor is still open, not after reading them all.
+        assert cursors_open == [1] * len(body)
+        assert count_cursors() == 0
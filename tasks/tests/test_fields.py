@@ -0,0 +1,137 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tasks.constants import SystemRole
+from tasks.models import Role, Task, User
+from tasks.tests.conftest import sign_in
+
+
+@pytest.mark.django_db
+class TestSparseFields:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.task1 = Task.objects.create(
+            title="task 1", description="description 1", created_by=self.admin
+        )
+        self.task2 = Task.objects.create(
+            title="task 2",
+            description="description 2",
+            created_by=self.manager,
+            assigned_to=self.admin,
+        )
+        self.role = Role.objects.get(name=SystemRole.MANAGER)
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def get(self, api_client, url: str, **headers):
+        return api_client.get(url, headers={"Authorization": f"Bearer {self.token}", **headers})
+
+    @pytest.mark.parametrize(
+        "url, fields",
+        [
+            ("/api/tasks/?fields=id,title", {"id", "title"}),
+            ("/api/tasks/?fields=title&page_size=1", {"title"}),
+            ("/api/tasks/{task}/?fields=status,assigned_to", {"status", "assigned_to"}),
+            ("/api/users/?fields=email", {"email"}),
+            ("/api/users/{user}/?fields=id,roles", {"id", "roles"}),
+            ("/api/roles/?fields=name", {"name"}),
+            ("/api/roles/{role}/?fields=id,name", {"id", "name"}),
+        ],
+    )
+    def test_fields(self, setup, api_client, url, fields):
+        url = url.format(task=self.task2.id, user=self.manager.id, role=self.role.id)
+        response = self.get(api_client, url)
+
+        assert response.status_code == 200
+        data = response.json()
+        if isinstance(data, dict) and "results" in data:
+            data = data["results"]
+        for item in data if isinstance(data, list) else [data]:
+            assert set(item) == fields
+
+    def test_values(self, setup, api_client):
+        response = self.get(api_client, f"/api/tasks/{self.task2.id}/?fields=title,assigned_to")
+        assert response.json() == {"title": "task 2", "assigned_to": self.admin.id}
+
+        response = self.get(api_client, f"/api/users/{self.manager.id}/?fields=roles")
+        assert response.json() == {"roles": [self.role.id]}
+
+    def test_exclude(self, setup, api_client):
+        full = self.get(api_client, "/api/tasks/").json()
+        response = self.get(api_client, "/api/tasks/?exclude=description,created_by")
+
+        assert response.status_code == 200
+        for item, full_item in zip(response.json(), full):
+            del full_item["description"], full_item["created_by"]
+            assert item == full_item
+
+        response = self.get(api_client, "/api/tasks/?fields=id,title,description&exclude=title")
+        assert {tuple(item) for item in response.json()} == {("id", "description")}
+
+    @pytest.mark.parametrize(
+        "url, param",
+        [
+            ("/api/tasks/?fields=title,secret", "fields"),
+            ("/api/tasks/{task}/?exclude=search_vector", "exclude"),
+            ("/api/users/?fields=token", "fields"),
+            ("/api/roles/{role}/?fields=nam", "fields"),
+        ],
+    )
+    def test_unknown_field(self, setup, api_client, url, param):
+        url = url.format(task=self.task2.id, role=self.role.id)
+        response = self.get(api_client, url)
+
+        assert response.status_code == 400
+        assert param in response.json()
+
+    @pytest.mark.parametrize(
+        "url", ["/api/tasks/?fields=id,title", "/api/tasks/{task}/?fields=id"]
+    )
+    def test_narrow_select(self, setup, api_client, url):
+        url = url.format(task=self.task2.id)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(api_client, url)
+
+        assert response.status_code == 200
+        selects = [query["sql"] for query in queries if 'FROM "tasks_task"' in query["sql"]]
+        assert selects
+        assert not any('"tasks_task"."description"' in sql for sql in selects)
+
+    def test_pagination(self, setup, api_client):
+        response = self.get(api_client, "/api/tasks/?fields=title&page_size=1")
+        next_link = response.json()["next"]
+        assert next_link
+
+        response = self.get(api_client, next_link)
+        assert response.json() == {"next": None, "results": [{"title": "task 1"}]}
+
+    def test_cache_key(self, setup, api_client):
+        assert set(self.get(api_client, "/api/tasks/?fields=id").json()[0]) == {"id"}
+        assert set(self.get(api_client, "/api/tasks/?fields=title").json()[0]) == {"title"}
+
+    def test_writes_not_trimmed(self, setup, api_client):
+        response = api_client.post(
+            f"/api/tasks/{self.task1.id}/?fields=id",
+            data={"title": "renamed"},
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["title"] == "renamed"
+
+    @pytest.mark.parametrize(
+        "url", ["/api/tasks/?fields=id,title", "/api/users/{user}/?exclude=password,roles"]
+    )
+    def test_async(self, setup, api_client, settings, url):
+        url = url.format(user=self.manager.id)
+        sync_response = self.get(api_client, url)
+
+        settings.ROOT_URLCONF = "task_manager.urls_async"
+        async_response = self.get(api_client, url)
+
+        assert async_response.status_code == sync_response.status_code == 200
+        assert async_response.json() == sync_response.json()
@@ -0,0 +1,157 @@
+import datetime
+import decimal
+import gzip
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tasks.constants import SystemRole
+from tasks.models import Task, User
+from tasks.renderers import ORJSONRenderer
+from tasks.tests.conftest import sign_in
+
+msgpack = pytest.importorskip("msgpack")
+brotli = pytest.importorskip("brotli")
+
+
+class TestORJSONRenderer:
+    @pytest.mark.parametrize(
+        "data",
+        [
+            {"title": 'задача "1" \\ </script>', "ids": [1, 2, None], "done": True},
+            [{"created_at": datetime.datetime(2030, 1, 2, 3, 4, 5, 678901)}],
+            {"due_date": datetime.date(2030, 1, 2), "cost": decimal.Decimal("1.50")},
+            {"separators": "line\u2028paragraph\u2029end"},
+            {None: 1, 2: "two"},
+            {},
+        ],
+    )
+    def test_same_bytes(self, data):
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    @pytest.mark.parametrize(
+        "data",
+        [{"big": 2**64}, {"small": -(2**63) - 1}, [{"count": 10**30}]],
+    )
+    def test_wide_integers(self, data):
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+    def test_non_finite_floats(self, value):
+        data = {"ratio": [1.5, value], "assigned_to": None}
+        with pytest.raises(ValueError):
+            JSONRenderer().render(data)
+        with pytest.raises(ValueError):
+            ORJSONRenderer().render(data)
+
+        # STRICT_JSON off: written as NaN and Infinity, not null.
+        renderers = [JSONRenderer(), ORJSONRenderer()]
+        for renderer in renderers:
+            renderer.strict = False
+        assert renderers[1].render(data) == renderers[0].render(data)
+
+    @pytest.mark.parametrize(
+        "value", [1e16, -2.5e300, 1e-7, 1.5e-5, 5e-324, 1e-4, 123.456, 1e15, 0.0, -0.0]
+    )
+    def test_floats(self, value):
+        data = {"ratio": [value, 0.5], "id": "5e0f"}
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent(self):
+        data = {"id": 1}
+        assert ORJSONRenderer().render(data, "application/json; indent=2") == (
+            JSONRenderer().render(data, "application/json; indent=2")
+        )
+
+
+@pytest.mark.django_db
+class TestResponseFormats:
+    @pytest.fixture
+    def setup(self, api_client, settings):
+        settings.RESPONSE_COMPRESSION_MIN_SIZE = 512
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        Task.objects.bulk_create(
+            Task(title=f"task {index}", description="description " * 5, created_by=self.admin)
+            for index in range(30)
+        )
+        self.task = Task.objects.first()
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def get(self, api_client, url: str, **headers):
+        return api_client.get(url, headers={"Authorization": f"Bearer {self.token}", **headers})
+
+    def test_json(self, setup, api_client):
+        response = self.get(api_client, "/api/tasks/")
+
+        assert response["Content-Type"] == "application/json"
+        assert response.content == JSONRenderer().render(response.data)
+
+    @pytest.mark.parametrize("url", ["/api/tasks/", "/api/tasks/{task}/", "/api/users/"])
+    def test_msgpack(self, setup, api_client, url):
+        url = url.format(task=self.task.id)
+        expected = self.get(api_client, url).json()
+        response = self.get(api_client, url, Accept="application/msgpack")
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(response.content) == expected
+
+    def test_not_acceptable(self, setup, api_client):
+        response = self.get(api_client, "/api/tasks/", Accept="application/xml")
+        assert response.status_code == 406
+
+    @pytest.mark.parametrize(
+        "accept_encoding, encoding, decompress",
+        [
+            ("gzip, deflate", "gzip", gzip.decompress),
+            ("gzip, deflate, br", "br", brotli.decompress),
+            ("br;q=1.0", "br", brotli.decompress),
+            ("br;q=0.5, gzip", "gzip", gzip.decompress),
+            ("gzip;q=0, *", "br", brotli.decompress),
+            ("br;q=0, *;q=0.1", "gzip", gzip.decompress),
+        ],
+    )
+    def test_compressed(self, setup, api_client, accept_encoding, encoding, decompress):
+        expected = self.get(api_client, "/api/tasks/").content
+        response = self.get(api_client, "/api/tasks/", **{"Accept-Encoding": accept_encoding})
+
+        assert response["Content-Encoding"] == encoding
+        assert "Accept-Encoding" in response["Vary"]
+        assert int(response["Content-Length"]) == len(response.content) < len(expected)
+        assert decompress(response.content) == expected
+
+    def test_small_not_compressed(self, setup, api_client):
+        response = self.get(
+            api_client, f"/api/tasks/{self.task.id}/", **{"Accept-Encoding": "gzip, br"}
+        )
+
+        assert response.status_code == 200
+        assert not response.has_header("Content-Encoding")
+        assert response.json()["id"] == self.task.id
+
+    @pytest.mark.parametrize("accept_encoding", ["identity", "gzip;q=0, br;q=0", "*;q=0"])
+    def test_not_accepted(self, setup, api_client, accept_encoding):
+        response = self.get(api_client, "/api/tasks/", **{"Accept-Encoding": accept_encoding})
+
+        assert not response.has_header("Content-Encoding")
+        assert len(response.json()) == 30
+
+    def test_conditional(self, setup, api_client):
+        response = self.get(api_client, "/api/tasks/", **{"Accept-Encoding": "gzip"})
+        etag = response["ETag"]
+        assert etag.startswith('W/"')
+
+        response = self.get(
+            api_client, "/api/tasks/", **{"Accept-Encoding": "gzip", "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    def test_streaming(self, setup, api_client):
+        expected = b"".join(self.get(api_client, "/api/tasks/export/").streaming_content)
+        response = self.get(api_client, "/api/tasks/export/", **{"Accept-Encoding": "br"})
+
+        assert response["Content-Encoding"] == "br"
+        assert brotli.decompress(b"".join(response.streaming_content)) == expected
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+from tasks.constants import SystemRole
+from tasks.models import Task, TaskEvent, User
+from tasks.tests.helpers import TOMORROW
+
+
+@pytest.mark.django_db
+class TestImportTasks:
+    @pytest.fixture
+    def setup(self):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+
+    def test_csv(self, setup, tmp_path, capsys):
+        path = tmp_path / "tasks.csv"
+        path.write_text(
+            "title,description,status,due_date,created_by,assigned_to\n"
+            f'task 1,"multi\nline, desc",P,{TOMORROW},admin@mail.com,manager@mail.com\n'
+            "task 2,desc 2,,,manager@mail.com,\n"
+            "task 3,desc 3,X,,unknown@mail.com,\n"
+        )
+
+        call_command("import_tasks", str(path), batch_size=2)
+        captured = capsys.readouterr()
+
+        task1, task2 = Task.objects.order_by("title")
+        assert (task1.description, task1.status, str(task1.due_date)) == (
+            "multi\nline, desc",
+            "P",
+            TOMORROW,
+        )
+        assert (task1.created_by, task1.assigned_to) == (self.admin, self.manager)
+        assert (task2.status, task2.due_date, task2.assigned_to) == ("N", None, None)
+        assert task2.created_at and task2.updated_at
+        assert list(TaskEvent.objects.values_list("task_id", "kind", "payload")) == [
+            (task1.id, "created", {"created_by": self.admin.id}),
+            (task2.id, "created", {"created_by": self.manager.id}),
+        ]
+        assert "Loaded 2 tasks, skipped 1" in captured.out
+        assert "Row 3" in captured.err and "status" in captured.err
+
+    def test_ndjson(self, setup, tmp_path):
+        path = tmp_path / "tasks.ndjson"
+        path.write_text(
+            "\n".join(
+                json.dumps(
+                    {"title": f"task {i}", "description": "desc", "created_by": "admin@mail.com"}
+                )
+                for i in range(25)
+            )
+        )
+
+        call_command("import_tasks", str(path), batch_size=10)
+
+        assert Task.objects.filter(created_by=self.admin).count() == 25
@@ -0,0 +1,192 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from prometheus_client import REGISTRY
+
+from tasks.constants import SystemRole
+from tasks.models import Task, TaskEvent, User
+from tasks.tests.conftest import sign_in
+
+SERVER_TIMING = re.compile(
+    r'^db;dur=[\d.]+;desc="(\d+) queries", serialize;dur=([\d.]+), total;dur=([\d.]+)$'
+)
+
+RECORD_REQUEST = """
+from tasks.metrics import RequestMetrics, record_request
+record_request("api/tasks/", "GET", 200, RequestMetrics(), 0.01)
+"""
+RENDER = "import sys; from tasks.metrics import render; sys.stdout.buffer.write(render())"
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.task = Task.objects.create(
+            title="task 1", description="description 1", created_by=self.manager
+        )
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def get(self, api_client, url: str, **headers):
+        return api_client.get(url, headers={"Authorization": f"Bearer {self.token}", **headers})
+
+    @pytest.mark.parametrize("url", ["/api/tasks/", "/api/tasks/{task}/", "/api/users/"])
+    def test_server_timing(self, setup, api_client, url):
+        url = url.format(task=self.task.id)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(api_client, url)
+
+        match = SERVER_TIMING.match(response["Server-Timing"])
+        assert match
+        queries_count, serialize, total = match.groups()
+        assert int(queries_count) == len(queries)
+        assert 0 < float(serialize) <= float(total)
+
+    def test_async(self, setup, api_client, settings):
+        settings.ROOT_URLCONF = "task_manager.urls_async"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(api_client, "/api/tasks/")
+
+        assert response.status_code == 200
+        queries_count = SERVER_TIMING.match(response["Server-Timing"]).group(1)
+        assert int(queries_count) == len(queries) > 0
+
+    def test_streaming(self, setup, api_client):
+        Task.objects.bulk_create(
+            Task(title=f"task {index}", description="description", created_by=self.admin)
+            for index in range(5)
+        )
+        labels = {"route": "api/tasks/export/", "method": "GET"}
+        count = sample("tasks_http_request_duration_seconds_count", **labels)
+        sql_queries = sample("tasks_http_request_sql_queries_total", **labels)
+        response = self.get(api_client, "/api/tasks/export/")
+        # Not recorded before the body is produced.
+        assert sample("tasks_http_request_duration_seconds_count", **labels) == count
+
+        with CaptureQueriesContext(connection) as queries:
+            content = b"".join(response.streaming_content)
+        response.close()
+
+        assert len(content.splitlines()) == 6
+        assert sample("tasks_http_request_duration_seconds_count", **labels) == count + 1
+        # The queries of the stream count too.
+        assert len(queries) > 0
+        assert sample("tasks_http_request_sql_queries_total", **labels) >= (
+            sql_queries + len(queries) + 1
+        )
+
+    def test_disabled(self, setup, api_client, settings):
+        settings.SERVER_TIMING = False
+        response = self.get(api_client, "/api/tasks/")
+        assert not response.has_header("Server-Timing")
+
+    def test_metrics(self, setup, api_client):
+        route = {"route": "api/tasks/", "method": "GET"}
+        before = {
+            "list": sample("tasks_http_requests_total", **route, status="200"),
+            "detail": sample(
+                "tasks_http_requests_total",
+                route="api/tasks/<int:pk>/",
+                method="GET",
+                status="200",
+            ),
+            "missing": sample(
+                "tasks_http_requests_total", route="unmatched", method="GET", status="404"
+            ),
+            "count": sample("tasks_http_request_duration_seconds_count", **route),
+        }
+        self.get(api_client, "/api/tasks/")
+        self.get(api_client, "/api/tasks/")
+        self.get(api_client, f"/api/tasks/{self.task.id}/")
+        self.get(api_client, "/api/missing/")
+        TaskEvent.objects.create(task_id=self.task.id, kind="created", payload={})
+
+        response = api_client.get("/metrics")
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = response.content.decode()
+
+        assert (
+            'tasks_http_requests_total{method="GET",route="api/tasks/",status="200"} '
+            f'{before["list"] + 2}' in body
+        )
+        assert (
+            'tasks_http_requests_total{method="GET",route="api/tasks/<int:pk>/",status="200"} '
+            f'{before["detail"] + 1}' in body
+        )
+        assert (
+            'tasks_http_requests_total{method="GET",route="unmatched",status="404"} '
+            f'{before["missing"] + 1}' in body
+        )
+        assert (
+            'tasks_http_request_duration_seconds_bucket{le="+Inf",method="GET",route="api/tasks/"} '
+            f'{before["count"] + 2}' in body
+        )
+        assert (
+            'tasks_http_request_duration_seconds_count{method="GET",route="api/tasks/"} '
+            f'{before["count"] + 2}' in body
+        )
+        assert re.search(
+            r'tasks_http_request_sql_queries_total\{method="GET",route="api/tasks/"\} [1-9]', body
+        )
+        assert re.search(
+            r'tasks_response_cache_requests_total\{result="hits",view="TaskListView"\} [1-9]', body
+        )
+        assert "tasks_outbox_pending 1" in body
+
+    def test_buckets(self, setup, api_client):
+        count = sample(
+            "tasks_http_request_duration_seconds_count", route="api/tasks/", method="GET"
+        )
+        for _ in range(3):
+            self.get(api_client, "/api/tasks/")
+        body = api_client.get("/metrics").content.decode()
+
+        counts = [
+            float(count)
+            for count in re.findall(
+                r'tasks_http_request_duration_seconds_bucket\{le="[^"]+",method="GET",'
+                r'route="api/tasks/"\} ([\d.]+)',
+                body,
+            )
+        ]
+        assert counts == sorted(counts)
+        assert counts[-1] == count + 3
+
+    def test_token(self, setup, api_client, settings):
+        settings.METRICS_TOKEN = "secret"
+
+        assert api_client.get("/metrics").status_code == 401
+        response = api_client.get("/metrics", headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 200
+
+    def test_merged_across_processes(self, tmp_path):
+        # Like the gunicorn workers: each process writes its own files, any of them renders all.
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", RECORD_REQUEST], env=env, check=True)
+
+        body = subprocess.run(
+            [sys.executable, "-c", RENDER], env=env, check=True, capture_output=True
+        ).stdout.decode()
+
+        assert (
+            'tasks_http_requests_total{method="GET",route="api/tasks/",status="200"} 2.0' in body
+        )
+        assert (
+            'tasks_http_request_duration_seconds_count{method="GET",route="api/tasks/"} 2.0'
+            in body
+        )
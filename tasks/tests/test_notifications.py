@@ -0,0 +1,150 @@
+import datetime
+import unittest.mock
+import uuid
+
+import pytest
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.utils import timezone
+
+from tasks.helpers import FLUSH_SCHEDULED_KEY, celery_flush_notifications, queue_notifications
+from tasks.models import Notification
+
+
+@pytest.mark.django_db
+class TestNotifications:
+    SUBJECT = "You have been assigned a new task"
+
+    def test_flush_coalesces_per_recipient(self):
+        queue_notifications(
+            [
+                (self.SUBJECT, "Task id - 1", "manager@mail.com"),
+                (self.SUBJECT, "Task id - 2", "operator@mail.com"),
+                (self.SUBJECT, "Task id - 3", "manager@mail.com"),
+            ]
+        )
+
+        with unittest.mock.patch(
+            "tasks.helpers.get_connection", wraps=get_connection
+        ) as mock_connection:
+            metrics = celery_flush_notifications()
+
+        mock_connection.assert_called_once()
+        assert metrics["messages"] == 2
+        assert metrics["notifications"] == 3
+        assert sorted((message.to[0], message.body) for message in mail.outbox) == [
+            ("manager@mail.com", "Task id - 1\nTask id - 3"),
+            ("operator@mail.com", "Task id - 2"),
+        ]
+        assert all(message.subject == self.SUBJECT for message in mail.outbox)
+        assert not Notification.objects.filter(sent_at__isnull=True).exists()
+
+        # Already sent notifications are not delivered again.
+        assert celery_flush_notifications()["messages"] == 0
+        assert len(mail.outbox) == 2
+
+    def test_flush_mixed_subjects(self):
+        queue_notifications(
+            [
+                (self.SUBJECT, "Task id - 1", "manager@mail.com"),
+                ("Task was closed", "Task id - 2", "manager@mail.com"),
+            ]
+        )
+
+        celery_flush_notifications()
+
+        assert [message.subject for message in mail.outbox] == ["You have 2 notifications"]
+
+    @unittest.mock.patch("tasks.helpers.celery_flush_notifications")
+    def test_flush_scheduled_once_per_window(
+        self, mock_flush, settings, django_capture_on_commit_callbacks
+    ):
+        settings.NOTIFICATIONS_BATCH_WINDOW = 10
+        settings.NOTIFICATIONS_BATCH_SIZE = 3
+
+        with django_capture_on_commit_callbacks(execute=True):
+            queue_notifications([(self.SUBJECT, "Task id - 1", "manager@mail.com")])
+        with django_capture_on_commit_callbacks(execute=True):
+            queue_notifications([(self.SUBJECT, "Task id - 2", "manager@mail.com")])
+
+        mock_flush.apply_async.assert_called_once_with(countdown=10)
+        mock_flush.delay.assert_not_called()
+
+        # Reaching the size limit flushes right away.
+        with django_capture_on_commit_callbacks(execute=True):
+            queue_notifications([(self.SUBJECT, "Task id - 3", "manager@mail.com")])
+
+        mock_flush.delay.assert_called_once_with()
+
+    def test_flush_releases_window(self):
+        cache.set(FLUSH_SCHEDULED_KEY, True)
+        celery_flush_notifications()
+
+        assert cache.get(FLUSH_SCHEDULED_KEY) is None
+
+    def test_send_outside_transaction(self):
+        queue_notifications([(self.SUBJECT, "Task id - 1", "manager@mail.com")])
+        # The test itself runs in a transaction.
+        depth = len(connection.atomic_blocks)
+        send_messages = EmailBackend.send_messages
+
+        def send_unlocked(backend, messages):
+            assert len(connection.atomic_blocks) == depth
+            # Claimed, so a concurrent flush skips it.
+            assert Notification.objects.get().claim is not None
+            return send_messages(backend, messages)
+
+        with unittest.mock.patch.object(EmailBackend, "send_messages", send_unlocked):
+            assert celery_flush_notifications()["messages"] == 1
+
+    def test_failed_send_released(self):
+        queue_notifications(
+            [
+                (self.SUBJECT, "Task id - 1", "manager@mail.com"),
+                (self.SUBJECT, "Task id - 2", "operator@mail.com"),
+            ]
+        )
+        send_messages = EmailBackend.send_messages
+
+        def fail_for_operator(backend, messages):
+            if messages[0].to == ["operator@mail.com"]:
+                raise ConnectionError("SMTP is down")
+            return send_messages(backend, messages)
+
+        with unittest.mock.patch.object(EmailBackend, "send_messages", fail_for_operator):
+            with pytest.raises(ConnectionError):
+                celery_flush_notifications()
+
+        sent = Notification.objects.get(recipient="manager@mail.com")
+        failed = Notification.objects.get(recipient="operator@mail.com")
+        assert sent.sent_at is not None
+        assert (failed.sent_at, failed.claim, failed.claimed_at) == (None, None, None)
+
+        assert celery_flush_notifications()["notifications"] == 1
+        assert [message.to for message in mail.outbox] == [
+            ["manager@mail.com"],
+            ["operator@mail.com"],
+        ]
+
+    def test_stale_claim_taken_over(self, settings):
+        settings.NOTIFICATIONS_CLAIM_TIMEOUT = 60
+        queue_notifications(
+            [
+                (self.SUBJECT, "Task id - 1", "manager@mail.com"),
+                (self.SUBJECT, "Task id - 2", "operator@mail.com"),
+            ]
+        )
+        now = timezone.now()
+        # Another flush is sending one, a dead one left the other.
+        Notification.objects.filter(recipient="manager@mail.com").update(
+            claim=uuid.uuid4(), claimed_at=now
+        )
+        Notification.objects.filter(recipient="operator@mail.com").update(
+            claim=uuid.uuid4(), claimed_at=now - datetime.timedelta(seconds=61)
+        )
+
+        assert celery_flush_notifications()["notifications"] == 1
+        assert [message.to for message in mail.outbox] == [["operator@mail.com"]]
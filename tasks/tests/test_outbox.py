@@ -0,0 +1,136 @@
+import datetime
+import unittest.mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from tasks.constants import SystemRole
+from tasks.helpers import celery_flush_notifications, celery_process_task_events
+from tasks.models import Notification, Task, TaskEvent, User
+from tasks.outbox import record_events, relay_lag, relay_task_events, task_events
+from tasks.tests.conftest import sign_in
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    @pytest.fixture
+    def setup(self):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.task = Task.objects.create(title="task", description="desc", created_by=self.admin)
+
+    def test_create_records_event(self, setup, api_client):
+        token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+        response = api_client.post(
+            "/api/tasks/",
+            data={"title": "new task", "description": "desc"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 201
+        event = TaskEvent.objects.get()
+        assert (event.task_id, event.kind, event.payload, event.published_at) == (
+            response.json()["id"],
+            "created",
+            {"created_by": self.admin.id},
+            None,
+        )
+
+    def test_events_roll_back_with_task(self, setup):
+        previous = Task.objects.get(id=self.task.id)
+        with pytest.raises(RuntimeError), transaction.atomic():
+            self.task.assigned_to = self.manager
+            self.task.save()
+            record_events(task_events(self.task, previous))
+            raise RuntimeError
+
+        assert not TaskEvent.objects.exists()
+
+    @unittest.mock.patch("tasks.helpers.celery_process_task_events.delay")
+    def test_relay(self, mock_publish, setup, settings):
+        settings.TASK_EVENTS_RELAY_BATCH_SIZE = 2
+        previous = Task.objects.get(id=self.task.id)
+        self.task.assigned_to, self.task.status = self.manager, "I"
+        record_events(task_events(self.task, previous) + task_events(self.task))
+
+        assert relay_lag()["pending"] == 3
+        assert relay_task_events() == 2
+        assert relay_task_events() == 1
+        assert relay_task_events() == 0
+        assert relay_lag() == {"pending": 0, "lag_seconds": 0.0}
+
+        # One job per batch.
+        assert mock_publish.call_count == 2
+        assigned, status_changed, created = TaskEvent.objects.order_by("id")
+        mock_publish.assert_any_call(
+            [
+                (
+                    assigned.id,
+                    self.task.id,
+                    "assigned",
+                    {
+                        "assigned_to": self.manager.id,
+                        "email": self.manager.email,
+                        "previous": None,
+                    },
+                ),
+                (
+                    status_changed.id,
+                    self.task.id,
+                    "status_changed",
+                    {"status": "I", "previous": "N"},
+                ),
+            ]
+        )
+
+    @unittest.mock.patch("tasks.helpers.celery_process_task_events.delay")
+    def test_relay_failure_keeps_events(self, mock_publish, setup):
+        mock_publish.side_effect = ConnectionError
+        record_events(task_events(self.task))
+
+        with pytest.raises(ConnectionError):
+            relay_task_events()
+
+        assert relay_lag()["pending"] == 1
+
+    def test_relay_lag(self, setup):
+        record_events(task_events(self.task))
+        TaskEvent.objects.update(created_at=timezone.now() - datetime.timedelta(minutes=1))
+
+        lag = relay_lag()
+
+        assert lag["pending"] == 1
+        assert lag["lag_seconds"] >= 60
+
+    @unittest.mock.patch("tasks.helpers.celery_process_task_events.delay")
+    def test_relay_command(self, mock_publish, setup, capsys):
+        record_events(task_events(self.task))
+
+        call_command("relay_task_events", once=True)
+
+        # The lag is measured after the relay.
+        assert "Relayed 1 events, pending 0, lag 0.0s" in capsys.readouterr().out
+        assert not TaskEvent.objects.filter(published_at__isnull=True).exists()
+
+    @unittest.mock.patch("tasks.helpers.schedule_notifications_flush")
+    def test_assigned_event_queues_notification(self, mock_schedule, setup):
+        payload = {"assigned_to": self.manager.id, "email": self.manager.email, "previous": None}
+        batch = [
+            (1, self.task.id, "assigned", payload),
+            (2, self.task.id, "status_changed", {"status": "I"}),
+        ]
+        celery_process_task_events(batch)
+        # Published again after the relay failed to commit.
+        celery_process_task_events(batch)
+
+        assert Notification.objects.count() == 1
+        celery_flush_notifications()
+        assert [(message.to, message.body) for message in mail.outbox] == [
+            ([self.manager.email], f"Task id - {self.task.id}")
+        ]
@@ -0,0 +1,120 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.utils import timezone
+
+from tasks.constants import SystemRole
+from tasks.filters import TaskFilter
+from tasks.models import Task, TaskCounter, User
+from tasks.partitions import (
+    analyze_tasks_table,
+    create_task_partitions,
+    partition_months,
+    partition_name,
+)
+from tasks.tests.conftest import sign_in
+
+
+def partition_of(task: Task) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT tableoid::regclass::text FROM tasks_task WHERE id = %s", [task.id])
+        return cursor.fetchone()[0]
+
+
+def counted_tasks() -> int:
+    return TaskCounter.objects.aggregate(total=Sum("count"))["total"]
+
+
+@pytest.mark.django_db
+class TestTaskPartitions:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.task = Task.objects.create(
+            title="task 1", description="description 1", created_by=self.manager
+        )
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def test_partitioned(self, setup):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT relkind FROM pg_class WHERE relname = 'tasks_task'")
+            assert cursor.fetchone()[0] == "p"
+
+        # Rows older than the migration stay in the table it attached as a partition.
+        assert partition_of(self.task) == "tasks_task_history"
+        assert create_task_partitions(0) == []
+
+    def test_months(self):
+        assert partition_months(2, datetime.date(2026, 11, 30)) == [
+            datetime.date(2026, 11, 1),
+            datetime.date(2026, 12, 1),
+            datetime.date(2027, 1, 1),
+        ]
+
+    def test_create_ahead(self, setup, settings):
+        # The migration creates the months after the history partition up to three ahead.
+        months = partition_months(5)
+        assert create_task_partitions(5) == [partition_name(month) for month in months[4:]]
+        assert create_task_partitions(5) == []
+
+        call_command("create_task_partitions", ahead=6)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [partition_name(partition_months(6)[6])])
+            assert cursor.fetchone()[0] is not None
+
+    def test_move_from_default(self, setup, api_client):
+        later = timezone.now() + datetime.timedelta(days=400)
+        Task.objects.filter(id=self.task.id).update(created_at=later)
+        assert partition_of(self.task) == "tasks_task_default"
+        counted = counted_tasks()
+
+        assert create_task_partitions(0, later.date()) == [partition_name(later.date())]
+        assert partition_of(self.task) == partition_name(later.date())
+        assert counted_tasks() == counted
+
+        response = api_client.get(
+            f"/api/tasks/{self.task.id}/", headers={"Authorization": f"Bearer {self.token}"}
+        )
+        assert response.status_code == 200
+        assert response.json()["title"] == "task 1"
+
+    def test_created_filter(self, setup, api_client):
+        today = timezone.now().date()
+        Task.objects.create(title="task 2", description="description 2", created_by=self.admin)
+        Task.objects.filter(title="task 2").update(
+            created_at=timezone.now() - datetime.timedelta(days=3)
+        )
+
+        for params, titles in (
+            ({"created_from": str(today)}, ["task 1"]),
+            ({"created_to": str(today - datetime.timedelta(days=1))}, ["task 2"]),
+            ({"created_from": str(today - datetime.timedelta(days=3))}, ["task 1", "task 2"]),
+        ):
+            response = api_client.get(
+                "/api/tasks/", params, headers={"Authorization": f"Bearer {self.token}"}
+            )
+            assert sorted(task["title"] for task in response.json()) == titles
+
+    def test_pruning(self, setup):
+        today = str(timezone.now().date())
+        queryset = TaskFilter(
+            {"created_from": today, "created_to": today}, queryset=Task.objects.all()
+        ).qs
+        plan = queryset.explain()
+
+        assert "tasks_task_history" in plan
+        assert "tasks_task_default" not in plan
+        assert partition_name(partition_months(1)[1]) not in plan
+
+    def test_analyze(self, setup):
+        analyze_tasks_table()
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM pg_stats WHERE tablename = 'tasks_task'")
+            assert cursor.fetchone()[0] > 0
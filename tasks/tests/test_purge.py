@@ -0,0 +1,265 @@
+import datetime
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.utils import timezone
+
+from tasks.archive import archive_completed_tasks
+from tasks.constants import SystemRole
+from tasks.helpers import celery_purge_users
+from tasks.management.commands.rebuild_task_counters import DRIFT_SQL
+from tasks.models import ArchivedTask, Role, Task, User, UserPurge
+from tasks.purge import purge_batch, purge_users, schedule_deactivated_purges, schedule_user_purge
+from tasks.tests.conftest import sign_in
+
+
+def counter_drift() -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(DRIFT_SQL)
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestUserPurge:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.operator = User.objects.create_user(
+            email="operator@mail.com",
+            password="operator@35762!",
+            roles=[SystemRole.OPERATOR],
+            updated_by=self.manager,
+        )
+        self.created = [
+            Task.objects.create(
+                title=f"task {index}",
+                description="by the manager",
+                status="C" if index < 2 else "N",
+                created_by=self.manager,
+                assigned_to=self.operator if index % 2 else None,
+            )
+            for index in range(5)
+        ]
+        self.assigned = Task.objects.create(
+            title="assigned",
+            description="to the manager",
+            created_by=self.operator,
+            assigned_to=self.manager,
+            updated_by=self.manager,
+        )
+        # The first two tasks go to the archive.
+        Task.objects.filter(status="C").update(updated_by=self.manager)
+        archive_completed_tasks(after_days=-1, pause=0)
+        Role.objects.filter(name=SystemRole.OPERATOR).update(updated_by=self.manager)
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def deactivate(self, api_client, user: User) -> None:
+        response = api_client.delete(
+            f"/api/users/{user.id}/", headers={"Authorization": f"Bearer {self.token}"}
+        )
+        assert response.status_code == 200
+        user.refresh_from_db()
+
+    def assert_references_cleared(self) -> None:
+        assert Task.objects.get(id=self.assigned.id).assigned_to_id is None
+        for model in (Task, ArchivedTask):
+            assert not model.objects.filter(assigned_to_id=self.manager.id).exists()
+            assert not model.objects.filter(updated_by_id=self.manager.id).exists()
+        assert Role.objects.get(name=SystemRole.OPERATOR).updated_by_id is None
+        assert User.objects.get(id=self.operator.id).updated_by_id is None
+        assert not User.objects.filter(id=self.manager.id).exists()
+        assert counter_drift() == 0
+
+    def test_schedule(self, setup, api_client):
+        with pytest.raises(ValueError):
+            schedule_user_purge(self.manager)
+
+        self.deactivate(api_client, self.manager)
+        with pytest.raises(ValueError):
+            schedule_user_purge(self.manager, reassign_to=self.manager)
+
+        self.deactivate(api_client, self.operator)
+        with pytest.raises(ValueError):
+            schedule_user_purge(self.manager, reassign_to=self.operator)
+
+        purge = schedule_user_purge(self.manager)
+        assert (purge.step, purge.processed, purge.finished_at) == ("tasks", 0, None)
+
+    def test_reassign(self, setup, api_client):
+        self.deactivate(api_client, self.manager)
+        schedule_user_purge(self.manager, reassign_to=self.admin)
+
+        assert purge_users(batch_size=2, pause=0) > 0
+
+        assert sorted(
+            Task.objects.filter(created_by=self.admin).values_list("title", flat=True)
+        ) == [
+            "task 2",
+            "task 3",
+            "task 4",
+        ]
+        archived = ArchivedTask.objects.get(id=self.created[1].id)
+        assert (archived.created_by_id, archived.assigned_to_id) == (
+            self.admin.id,
+            self.operator.id,
+        )
+        assert Task.objects.get(id=self.created[3].id).assigned_to_id == self.operator.id
+        self.assert_references_cleared()
+
+        purge = UserPurge.objects.get(user_id=self.manager.id)
+        assert purge.step == "done"
+        assert purge.finished_at is not None
+
+    def test_delete(self, setup, api_client):
+        self.deactivate(api_client, self.manager)
+        schedule_user_purge(self.manager)
+
+        purge_users(batch_size=2, pause=0)
+
+        assert list(Task.objects.values_list("title", flat=True)) == ["assigned"]
+        assert not ArchivedTask.objects.exists()
+        # Rows the user only referenced are kept.
+        assert Role.objects.filter(name=SystemRole.OPERATOR).exists()
+        assert User.objects.filter(id=self.operator.id).exists()
+        self.assert_references_cleared()
+
+    def test_resume(self, setup, api_client):
+        self.deactivate(api_client, self.manager)
+        schedule_user_purge(self.manager, reassign_to=self.admin)
+
+        assert purge_batch(batch_size=2) == 2
+        purge = UserPurge.objects.get(user_id=self.manager.id)
+        assert (purge.step, purge.processed) == ("tasks", 2)
+        assert Task.objects.filter(created_by=self.manager).count() == 1
+
+        # Out of time before the first batch.
+        assert purge_users(batch_size=2, pause=0, max_seconds=0) == 0
+
+        assert purge_batch(batch_size=2) == 1
+        purge.refresh_from_db()
+        assert (purge.step, purge.processed) == ("archived_tasks", 3)
+
+        purge_users(batch_size=2, pause=0)
+        purge.refresh_from_db()
+        assert purge.step == "done"
+        self.assert_references_cleared()
+        assert purge_batch() is None
+
+    def test_reactivated(self, setup, api_client):
+        self.deactivate(api_client, self.manager)
+        schedule_user_purge(self.manager)
+        purge_batch(batch_size=2)
+        User.objects.filter(id=self.manager.id).update(is_active=True)
+
+        assert purge_users(pause=0) == 0
+
+        assert UserPurge.objects.get(user_id=self.manager.id).step == "cancelled"
+        assert Task.objects.filter(created_by=self.manager).count() == 1
+        assert User.objects.filter(id=self.manager.id).exists()
+
+    def test_list_after_purge(self, setup, api_client):
+        url = "/api/tasks/"
+        headers = {"Authorization": f"Bearer {self.token}"}
+        etag = api_client.get(url, headers=headers)["ETag"]
+        self.deactivate(api_client, self.manager)
+        schedule_user_purge(self.manager, reassign_to=self.admin)
+        purge_users(pause=0)
+
+        response = api_client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert {task["created_by"] for task in response.json()} == {
+            self.admin.id,
+            self.operator.id,
+        }
+        stats = api_client.get("/api/tasks/stats/", headers=headers).json()
+        assert stats["total"] == 4
+
+    def test_scheduled_after_grace(self, setup, api_client, settings):
+        settings.USER_PURGE_GRACE_DAYS = 30
+        self.deactivate(api_client, self.manager)
+        assert schedule_deactivated_purges() == 0
+
+        User.objects.filter(id=self.manager.id).update(
+            updated_at=timezone.now() - datetime.timedelta(days=31)
+        )
+        settings.USER_PURGE_BATCH_PAUSE = 0
+        metrics = celery_purge_users()
+
+        assert (metrics["scheduled"], metrics["processed"] > 0) == (1, True)
+        purge = UserPurge.objects.get(user_id=self.manager.id)
+        assert (purge.reassign_to_id, purge.step) == (None, "done")
+        assert not Task.objects.filter(title__startswith="task").exists()
+        self.assert_references_cleared()
+
+    def test_grace_keeps_scheduled(self, setup, api_client):
+        self.deactivate(api_client, self.manager)
+        schedule_user_purge(self.manager, reassign_to=self.admin)
+        assert schedule_deactivated_purges(grace_days=-1) == 0
+        assert UserPurge.objects.get().reassign_to_id == self.admin.id
+
+        # Cancelled by a reactivation, then deactivated again.
+        User.objects.filter(id=self.manager.id).update(is_active=True)
+        purge_batch()
+        self.deactivate(api_client, self.manager)
+        assert schedule_deactivated_purges(grace_days=-1) == 1
+        assert UserPurge.objects.get().step == "tasks"
+
+    def test_purge_reassign_target(self, setup, api_client):
+        self.deactivate(api_client, self.manager)
+        schedule_user_purge(self.manager, reassign_to=self.operator)
+        purge_users(pause=0)
+        assert UserPurge.objects.get(user_id=self.manager.id).reassign_to_id is None
+
+        self.deactivate(api_client, self.operator)
+        schedule_user_purge(self.operator)
+        purge_users(pause=0)
+
+        assert UserPurge.objects.get(user_id=self.operator.id).step == "done"
+        assert not User.objects.filter(id=self.operator.id).exists()
+        assert not Task.objects.exists()
+
+    def test_failed_purge_set_aside(self, setup, api_client):
+        other = User.objects.create_user(email="other@mail.com", password="other@35762!")
+        for user in (self.manager, other):
+            self.deactivate(api_client, user)
+        stuck = schedule_user_purge(self.manager)
+        # An unfinished purge that gives tasks to the manager keeps them from being deleted.
+        blocking = UserPurge.objects.create(
+            user_id=self.operator.id,
+            reassign_to=self.manager,
+            retry_at=timezone.now() + datetime.timedelta(days=1),
+        )
+        schedule_user_purge(other)
+
+        purge_users(pause=0)
+
+        stuck.refresh_from_db()
+        assert (stuck.step, stuck.finished_at) == ("user", None)
+        assert "protected" in stuck.error
+        assert stuck.retry_at > timezone.now()
+        assert User.objects.filter(id=self.manager.id).exists()
+        # The purge queued after it went on.
+        assert UserPurge.objects.get(user_id=other.id).step == "done"
+        assert not User.objects.filter(id=other.id).exists()
+
+        blocking.delete()
+        UserPurge.objects.filter(id=stuck.id).update(retry_at=timezone.now())
+        purge_users(pause=0)
+
+        stuck.refresh_from_db()
+        assert (stuck.step, stuck.error, stuck.retry_at) == ("done", "", None)
+        self.assert_references_cleared()
+
+    def test_command(self, setup, api_client):
+        with pytest.raises(CommandError):
+            call_command("purge_user", self.manager.id)
+
+        self.deactivate(api_client, self.manager)
+        call_command("purge_user", self.manager.id, reassign_to=self.admin.id, now=True)
+
+        assert Task.objects.filter(created_by=self.admin).count() == 3
+        self.assert_references_cleared()
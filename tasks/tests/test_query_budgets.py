@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tasks.tests.conftest import sign_in
+from tasks.tests.helpers import ENDPOINTS, SEED_PASSWORD, build_request, seed_volume
+
+
+def count_queries(api_client, seeded: dict, name: str) -> int:
+    endpoint = ENDPOINTS[name]
+    url, data, user = build_request(endpoint, seeded, SEED_PASSWORD)
+    headers = {}
+    if endpoint.authenticated:
+        headers["Authorization"] = f"Bearer {sign_in(api_client, user.email, SEED_PASSWORD)}"
+
+    # Warms the role cache, like any request after the first one of a process.
+    getattr(api_client, endpoint.method)(url, data=data, headers=headers)
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(api_client, endpoint.method)(url, data=data, headers=headers)
+
+    assert response.status_code in (200, 201)
+    return len(queries)
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    @pytest.fixture(autouse=True)
+    def no_response_cache(self, settings):
+        settings.RESPONSE_CACHE_TIMEOUT = 0
+
+    @pytest.mark.parametrize("name", ENDPOINTS)
+    def test_budget(self, api_client, name):
+        seeded = seed_volume(users=20, roles=3, tasks=200, password=SEED_PASSWORD)
+        assert count_queries(api_client, seeded, name) <= ENDPOINTS[name].budget
+
+    # The budgets hold for lists served from model instances too.
+    @pytest.mark.parametrize("values_serialization", [True, False])
+    @pytest.mark.parametrize("name", ENDPOINTS)
+    def test_independent_of_volume(self, api_client, settings, name, values_serialization):
+        settings.LIST_VALUES_SERIALIZATION = values_serialization
+        seeded = seed_volume(users=3, roles=1, tasks=10, password=SEED_PASSWORD)
+        small = count_queries(api_client, seeded, name)
+        assert small <= ENDPOINTS[name].budget
+
+        seed_volume(users=40, roles=5, tasks=400, password=SEED_PASSWORD)
+        assert count_queries(api_client, seeded, name) == small
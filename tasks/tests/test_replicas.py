@@ -0,0 +1,131 @@
+import pytest
+from django.conf import settings as django_settings
+from django.core.cache import cache
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from tasks.constants import SystemRole
+from tasks.models import Role, Task, User
+from tasks.role_cache import role_cache
+from tasks.routers import STICKY_KEY, replica_reads
+from tasks.tests.conftest import sign_in
+
+REPLICA = "replica_0"
+
+pytestmark = [
+    pytest.mark.skipif(REPLICA not in django_settings.DATABASES, reason="DB_REPLICA_HOSTS unset"),
+    # The replica is a test mirror with its own connection, it only sees committed rows.
+    pytest.mark.django_db(
+        transaction=True, databases=["default", REPLICA], serialized_rollback=True
+    ),
+]
+
+
+class TestReplicaRouting:
+    @pytest.fixture
+    def setup(self, api_client, settings):
+        settings.DATABASE_REPLICAS = [REPLICA]
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.task = Task.objects.create(title="task", description="desc", created_by=self.admin)
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def request(self, api_client, method: str, url: str, **kwargs):
+        with CaptureQueriesContext(connections["default"]) as primary, CaptureQueriesContext(
+            connections[REPLICA]
+        ) as replica:
+            response = getattr(api_client, method)(
+                url, headers={"Authorization": f"Bearer {self.token}"}, **kwargs
+            )
+            if response.streaming:
+                response.body = b"".join(response.streaming_content)
+        return response, primary, replica
+
+    @staticmethod
+    def tables(queries) -> set[str]:
+        return {
+            table
+            for query in queries
+            for table in ("tasks_task", "tasks_user", "tasks_role")
+            if f'"{table}"' in query["sql"]
+        }
+
+    @pytest.mark.parametrize(
+        "url",
+        ["/api/tasks/", "/api/tasks/{task}/", "/api/users/", "/api/roles/", "/api/tasks/export/"],
+    )
+    def test_reads_use_replica(self, setup, api_client, url):
+        response, primary, replica = self.request(api_client, "get", url.format(task=self.task.id))
+
+        assert response.status_code == 200
+        assert self.tables(replica)
+        # Only the authenticated user is loaded before the view enables replica reads.
+        assert self.tables(primary) <= {"tasks_user"}
+
+    def test_async_reads_use_replica(self, setup, api_client, settings):
+        settings.ROOT_URLCONF = "task_manager.urls_async"
+        response, primary, replica = self.request(api_client, "get", "/api/tasks/")
+
+        assert response.status_code == 200
+        assert "tasks_task" in self.tables(replica)
+        assert "tasks_task" not in self.tables(primary)
+
+    def test_read_your_writes(self, setup, api_client):
+        response, primary, replica = self.request(
+            api_client, "post", f"/api/tasks/{self.task.id}/", data={"status": "I"}
+        )
+        assert response.status_code == 200
+        assert not replica.captured_queries
+
+        response, primary, replica = self.request(api_client, "get", f"/api/tasks/{self.task.id}/")
+        assert response.json()["status"] == "I"
+        assert "tasks_task" in self.tables(primary)
+        assert not replica.captured_queries
+
+        # The stickiness window is over.
+        cache.delete(STICKY_KEY.format(user_id=self.admin.id))
+        response, primary, replica = self.request(api_client, "get", f"/api/tasks/{self.task.id}/")
+        assert "tasks_task" in self.tables(replica)
+
+    def test_failed_write_does_not_stick(self, setup, api_client):
+        response, _, _ = self.request(
+            api_client, "post", f"/api/tasks/{self.task.id}/", data={"status": "X"}
+        )
+
+        assert response.status_code == 400
+        assert cache.get(STICKY_KEY.format(user_id=self.admin.id)) is None
+
+    def test_outside_requests_use_primary(self, setup):
+        with CaptureQueriesContext(connections[REPLICA]) as replica:
+            assert Task.objects.count() == 1
+
+        assert not replica.captured_queries
+
+    def test_roles_read_from_primary(self, setup):
+        # Revoke the admin role: a lagging replica must not bring it back into the cache.
+        self.admin.roles.set([Role.objects.get(name=SystemRole.MANAGER)])
+        token = replica_reads.set(True)
+        try:
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                assert role_cache.user_role_names(self.admin.id) == {SystemRole.MANAGER}
+        finally:
+            replica_reads.reset(token)
+
+        assert not replica.captured_queries
+
+    def test_no_list_etag_while_replica_may_lag(self, setup, api_client, settings):
+        settings.REPLICA_STICKY_SECONDS = 60
+        Task.objects.create(title="new", description="desc", created_by=self.manager)
+
+        # Read from the replica right after the write: not validated, not cached.
+        response, _, replica = self.request(api_client, "get", "/api/tasks/")
+        assert "tasks_task" in self.tables(replica)
+        assert not response.has_header("ETag")
+        response, _, replica = self.request(api_client, "get", "/api/tasks/")
+        assert "tasks_task" in self.tables(replica)
+
+        settings.REPLICA_STICKY_SECONDS = 0
+        response, _, _ = self.request(api_client, "get", "/api/tasks/")
+        assert response.has_header("ETag")
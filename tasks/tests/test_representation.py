@@ -0,0 +1,130 @@
+import datetime
+import zoneinfo
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from tasks.constants import SystemRole
+from tasks.models import Role, Task, User
+from tasks.representation import ValuesRepresentation
+from tasks.serializers import RoleSerializer, TaskSerializer, UserSerializer
+from tasks.tests.conftest import sign_in
+
+
+@pytest.mark.django_db
+class TestValuesRepresentation:
+    @pytest.fixture
+    def setup(self, api_client):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com",
+            password="manager@35762!",
+            first_name="Мария",
+            roles=[SystemRole.MANAGER, SystemRole.OPERATOR],
+        )
+        self.operator = User.objects.create_user(
+            email="operator@mail.com", password="operator@35762!", roles=[]
+        )
+        for index in range(5):
+            Task.objects.create(
+                title=f'задача {index} "quoted" \\ <tag>',
+                description="line\nbreak",
+                status="NIC"[index % 3],
+                due_date=datetime.date(2030, 1, index + 1) if index % 2 else None,
+                created_by=self.manager if index % 2 else self.admin,
+                assigned_to=self.operator if index % 3 else None,
+                updated_by=self.admin if index == 4 else None,
+            )
+        self.token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+
+    def get(self, api_client, url: str):
+        return api_client.get(url, headers={"Authorization": f"Bearer {self.token}"})
+
+    @pytest.mark.parametrize(
+        "serializer_class, queryset",
+        [
+            (TaskSerializer, Task.objects.order_by("id")),
+            (UserSerializer, User.objects.order_by("id")),
+            (RoleSerializer, Role.objects.order_by("id")),
+        ],
+    )
+    def test_same_bytes(self, setup, serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+        representation = ValuesRepresentation(serializer_class())
+        rows = list(queryset.values("id", *representation.columns))
+        assert JSONRenderer().render(representation.to_representation(rows)) == expected
+
+    def test_current_timezone(self, setup):
+        queryset = Task.objects.order_by("id")
+        with timezone.override(zoneinfo.ZoneInfo("Asia/Almaty")):
+            expected = JSONRenderer().render(TaskSerializer(queryset, many=True).data)
+            representation = ValuesRepresentation(TaskSerializer())
+            rows = list(queryset.values("id", *representation.columns))
+            content = JSONRenderer().render(representation.to_representation(rows))
+
+        assert b"+05:00" in content or b"+06:00" in content
+        assert content == expected
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "/api/tasks/",
+            "/api/tasks/?page_size=2",
+            "/api/tasks/?page_size=2&ordering=due_date",
+            "/api/tasks/?fields=title,due_date&exclude=title",
+            "/api/tasks/?status=N",
+            "/api/users/",
+            "/api/users/?fields=email,roles",
+            "/api/roles/",
+        ],
+    )
+    @pytest.mark.parametrize("urlconf", ["task_manager.urls", "task_manager.urls_async"])
+    def test_same_response(self, setup, api_client, settings, url, urlconf):
+        settings.ROOT_URLCONF = urlconf
+        settings.LIST_VALUES_SERIALIZATION = False
+        expected = self.get(api_client, url)
+
+        cache.clear()
+        settings.LIST_VALUES_SERIALIZATION = True
+        response = self.get(api_client, url)
+
+        assert response.status_code == expected.status_code == 200
+        assert response.content == expected.content
+
+        next_link = response.json().get("next") if url.endswith("page_size=2") else None
+        if next_link:
+            settings.LIST_VALUES_SERIALIZATION = False
+            expected = self.get(api_client, next_link)
+            cache.clear()
+            settings.LIST_VALUES_SERIALIZATION = True
+            assert self.get(api_client, next_link).content == expected.content
+
+    def test_queries(self, setup, api_client, django_assert_num_queries):
+        for index in range(10):
+            User.objects.create_user(
+                email=f"user{index}@mail.com", password="user@35762!", roles=[SystemRole.OPERATOR]
+            )
+
+        # Loads the admin's roles into the role cache.
+        self.get(api_client, "/api/roles/")
+
+        # The authenticated user, the users and their roles.
+        with django_assert_num_queries(3):
+            response = self.get(api_client, "/api/users/")
+        assert len(response.json()) == 13
+
+    def test_unsupported_field(self):
+        class TitleSerializer(serializers.ModelSerializer):
+            title = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Task
+                fields = ("id", "title")
+
+        with pytest.raises(ImproperlyConfigured):
+            ValuesRepresentation(TitleSerializer())
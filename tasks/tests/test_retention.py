@@ -0,0 +1,58 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from tasks.helpers import celery_delete_delivered
+from tasks.models import Notification, TaskEvent
+from tasks.retention import delete_delivered
+
+
+@pytest.mark.django_db
+class TestRetention:
+    @pytest.fixture
+    def setup(self, settings):
+        settings.TASK_EVENTS_RETENTION_DAYS = 7
+        settings.NOTIFICATIONS_RETENTION_DAYS = 30
+        now = timezone.now()
+        self.old_event, self.old_pending, self.new_event = (
+            TaskEvent.objects.create(task_id=1, kind="created", published_at=published)
+            for published in (now, None, now)
+        )
+        TaskEvent.objects.filter(id__in=[self.old_event.id, self.old_pending.id]).update(
+            created_at=now - datetime.timedelta(days=8)
+        )
+        self.old_sent, self.old_unsent, self.new_sent = (
+            Notification.objects.create(
+                recipient="manager@mail.com", subject="subject", message="message", sent_at=sent
+            )
+            for sent in (now, None, now)
+        )
+        Notification.objects.filter(id__in=[self.old_sent.id, self.old_unsent.id]).update(
+            created_at=now - datetime.timedelta(days=31)
+        )
+
+    def test_delete_delivered(self, setup):
+        assert delete_delivered(batch_size=1, pause=0) == {"task_events": 1, "notifications": 1}
+
+        assert set(TaskEvent.objects.values_list("id", flat=True)) == {
+            self.old_pending.id,
+            self.new_event.id,
+        }
+        assert set(Notification.objects.values_list("id", flat=True)) == {
+            self.old_unsent.id,
+            self.new_sent.id,
+        }
+        assert delete_delivered(pause=0) == {"task_events": 0, "notifications": 0}
+
+    def test_nothing_kept(self, setup):
+        TaskEvent.objects.filter(id=self.new_event.id).delete()
+        Notification.objects.filter(id=self.new_sent.id).delete()
+
+        assert delete_delivered(pause=0) == {"task_events": 1, "notifications": 1}
+
+    def test_task(self, setup, settings):
+        settings.RETENTION_BATCH_PAUSE = 0
+        metrics = celery_delete_delivered()
+
+        assert (metrics["task_events"], metrics["notifications"]) == (1, 1)
@@ -97,3 +97,40 @@ class TestRoles:
         not_deleted = Role.objects.filter(id=self.admin_role.id).first()
         assert response.status_code == 403
         assert not_deleted
+
+
+@pytest.mark.django_db
+class TestRoleCache:
+    @pytest.fixture
+    def setup(self):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.operator = User.objects.create_user(
+            email="operator@mail.com", password="operator@35762!", roles=[SystemRole.OPERATOR]
+        )
+
+    def test_is_admin_memoized(self, setup, django_assert_num_queries):
+        admin = User.objects.get(id=self.admin.id)
+        operator = User.objects.get(id=self.operator.id)
+        assert admin.is_admin
+        assert not operator.is_admin
+
+        with django_assert_num_queries(0):
+            assert User(id=self.admin.id).is_admin
+            assert not User(id=self.operator.id).is_admin
+
+    def test_invalidated_on_roles_change(self, setup):
+        assert not User(id=self.operator.id).is_admin
+
+        self.operator.roles.add(Role.objects.get(name=SystemRole.ADMIN))
+        assert User(id=self.operator.id).is_admin
+
+        self.operator.roles.clear()
+        assert not User(id=self.operator.id).is_admin
+
+    def test_invalidated_on_role_rename(self, setup):
+        role = Role.objects.get(name=SystemRole.OPERATOR)
+        assert User(id=self.operator.id).role_names == {SystemRole.OPERATOR}
+
+        role.name = "developer"
+        role.save()
+        assert User(id=self.operator.id).role_names == {"developer"}
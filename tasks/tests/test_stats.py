@@ -0,0 +1,194 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from tasks.constants import SystemRole
+from tasks.management.commands.rebuild_task_counters import DRIFT_SQL
+from tasks.models import Task, TaskCounter, TaskCounterState, User
+from tasks.stats import rebucket_task_counters, task_stats
+from tasks.tests.conftest import sign_in
+
+
+def assert_counters_match():
+    with connection.cursor() as cursor:
+        cursor.execute(DRIFT_SQL)
+        assert cursor.fetchone()[0] == 0
+    assert not TaskCounter.objects.filter(count__lte=0).exists()
+
+
+def counters() -> dict:
+    return {
+        (row.created_by_id, row.assigned_to_id, row.status, row.due_bucket): row.count
+        for row in TaskCounter.objects.all()
+    }
+
+
+@pytest.mark.django_db
+class TestTaskStats:
+    @pytest.fixture
+    def setup(self):
+        self.today = timezone.localdate()
+        monday = self.today - datetime.timedelta(days=self.today.weekday())
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.operator = User.objects.create_user(
+            email="operator@mail.com", password="operator@35762!", roles=[SystemRole.OPERATOR]
+        )
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+        self.overdue = Task.objects.create(
+            title="overdue",
+            description="desc",
+            due_date=monday - datetime.timedelta(days=1),
+            created_by=self.operator,
+            assigned_to=self.manager,
+        )
+        self.this_week = Task.objects.create(
+            title="this week",
+            description="desc",
+            status="I",
+            due_date=monday + datetime.timedelta(days=6),
+            created_by=self.operator,
+        )
+        self.completed = Task.objects.create(
+            title="completed",
+            description="desc",
+            status="C",
+            due_date=monday - datetime.timedelta(days=1),
+            created_by=self.admin,
+            assigned_to=self.manager,
+        )
+        self.hidden = Task.objects.create(
+            title="hidden", description="desc", created_by=self.admin, assigned_to=self.admin
+        )
+
+    def get_stats(self, api_client, email: str, password: str):
+        token = sign_in(api_client, email, password)
+        return api_client.get("/api/tasks/stats/", headers={"Authorization": f"Bearer {token}"})
+
+    def test_admin(self, setup, api_client, django_assert_max_num_queries):
+        token = sign_in(api_client, "admin@mail.com", "admin@35762!")
+        # The first request reads the day the counters are bucketed for.
+        api_client.get("/api/tasks/stats/", headers={"Authorization": f"Bearer {token}"})
+        # The authenticated user and one counter query.
+        with django_assert_max_num_queries(2):
+            response = api_client.get(
+                "/api/tasks/stats/", headers={"Authorization": f"Bearer {token}"}
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "total": 4,
+            "by_status": {"N": 2, "P": 0, "I": 1, "C": 1},
+            "overdue": 1,
+            "due_this_week": 1,
+            "by_assignee": [
+                {"assigned_to": self.manager.id, "count": 2},
+                {"assigned_to": None, "count": 1},
+                {"assigned_to": self.admin.id, "count": 1},
+            ],
+        }
+
+    def test_visibility(self, setup, api_client):
+        response = self.get_stats(api_client, "manager@mail.com", "manager@35762!")
+
+        stats = response.json()
+        assert stats["total"] == 2
+        assert stats["by_status"] == {"N": 1, "P": 0, "I": 0, "C": 1}
+        assert stats["overdue"] == 1
+        assert stats["by_assignee"] == [{"assigned_to": self.manager.id, "count": 2}]
+
+    def test_counters_follow_writes(self, setup, api_client):
+        assert_counters_match()
+
+        self.overdue.status = "C"
+        self.overdue.save()
+        Task.objects.filter(id=self.this_week.id).update(due_date=None, assigned_to=self.admin)
+        Task.objects.bulk_create(
+            [Task(title=f"bulk {i}", description="desc", created_by=self.admin) for i in range(3)]
+        )
+        self.completed.delete()
+        assert_counters_match()
+
+        # Cascades and SET NULL run without model signals.
+        self.manager.delete()
+        self.operator.delete()
+        assert_counters_match()
+
+    def test_rebuild(self, setup, capsys):
+        TaskCounter.objects.filter(status="N").update(count=10)
+        TaskCounter.objects.filter(status="I").delete()
+
+        call_command("rebuild_task_counters")
+
+        assert_counters_match()
+        assert "Rebuilt 4 counters, 3 had drifted." in capsys.readouterr().out
+
+    def test_counters_bounded(self, setup):
+        due = self.today + datetime.timedelta(days=30)
+        for index in range(5):
+            Task.objects.create(
+                title=f"later {index}",
+                description="desc",
+                due_date=due + datetime.timedelta(days=index),
+                created_by=self.operator,
+            )
+
+        # Distinct due dates after this week share one counter.
+        assert counters()[self.operator.id, None, "N", "later"] == 5
+        Task.objects.filter(title__startswith="later").delete()
+        assert (self.operator.id, None, "N", "later") not in counters()
+        assert_counters_match()
+
+    @pytest.mark.parametrize("days", [1, 3, 7, 40])
+    def test_rebucket(self, setup, days):
+        Task.objects.create(
+            title="today", description="desc", due_date=self.today, created_by=self.manager
+        )
+        Task.objects.create(
+            title="soon",
+            description="desc",
+            due_date=self.today + datetime.timedelta(days=days),
+            created_by=self.manager,
+        )
+        later = self.today + datetime.timedelta(days=days)
+        monday = later - datetime.timedelta(days=later.weekday())
+        due_dates = [task.due_date for task in Task.objects.exclude(status="C") if task.due_date]
+        expected = {
+            "overdue": sum(due < later for due in due_dates),
+            "due_this_week": sum(
+                monday <= due <= monday + datetime.timedelta(days=6) for due in due_dates
+            ),
+            "total": 6,
+        }
+
+        # Before the rebucketing the due counts come from the tasks, and nothing moves.
+        stats = task_stats(self.admin, later)
+        assert {key: stats[key] for key in expected} == expected
+        assert TaskCounterState.objects.get().as_of == self.today
+
+        rebucket_task_counters(later)
+        assert TaskCounterState.objects.get().as_of == later
+        assert_counters_match()
+        stats = task_stats(self.admin, later)
+        assert {key: stats[key] for key in expected} == expected
+
+        # Going back is a no-op.
+        assert rebucket_task_counters(self.today) == 0
+        assert TaskCounterState.objects.get().as_of == later
+
+    def test_no_lock(self, setup):
+        task_stats(self.operator)
+        task_stats(self.operator, self.today + datetime.timedelta(days=1))
+        # Already bucketed for today.
+        assert rebucket_task_counters(self.today) == 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_locks WHERE pid = pg_backend_pid()"
+                " AND relation = 'tasks_task'::regclass AND mode = 'ShareLock'"
+            )
+            assert cursor.fetchone()[0] == 0
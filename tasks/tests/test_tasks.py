@@ -1,9 +1,9 @@
-import unittest.mock
-
 import pytest
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection, transaction
 
 from tasks.constants import SystemRole
-from tasks.models import Task, User
+from tasks.models import TASK_SEARCH_CONFIG, Task, TaskEvent, User
 from tasks.tests.conftest import sign_in
 from tasks.tests.helpers import TOMORROW
 
@@ -110,8 +110,7 @@ class TestTasks(TestTasksBase):
         assert resp_data["status"] == task_data["status"]
         assert resp_data["assigned_to"] == task_data["assigned_to"]
 
-    @unittest.mock.patch("tasks.views.tasks.celery_send_email.delay")
-    def test_update(self, mock_send_email, setup, api_client):
+    def test_update(self, setup, api_client):
         email, password = self.ROLE_TO_USER_DATA.get(SystemRole.OPERATOR)
         token = sign_in(api_client, email, password)
 
@@ -128,7 +127,10 @@ class TestTasks(TestTasksBase):
         )
         resp_data = response.json()
 
-        mock_send_email.assert_called_once()
+        assert list(TaskEvent.objects.order_by("id").values_list("task_id", "kind")) == [
+            (self.task2.id, "assigned"),
+            (self.task2.id, "status_changed"),
+        ]
         assert resp_data["title"] == update_data["title"]
         assert resp_data["description"] == update_data["description"]
         assert resp_data["status"] == update_data["status"]
@@ -193,8 +195,7 @@ class TestTasksPermissions(TestTasksBase):
         )
         assert response.status_code == 403
 
-    @unittest.mock.patch("tasks.views.tasks.celery_send_email.delay")
-    def test_update_any_task_by_admin(self, mock_send_email, setup, api_client):
+    def test_update_any_task_by_admin(self, setup, api_client):
         email, password = self.ROLE_TO_USER_DATA.get(SystemRole.ADMIN)
         token = sign_in(api_client, email, password)
 
@@ -207,7 +208,9 @@ class TestTasksPermissions(TestTasksBase):
 
         resp_data = response.json()
         assert resp_data["status"] == "I"
-        mock_send_email.assert_not_called()
+        assert list(TaskEvent.objects.values_list("kind", "payload")) == [
+            ("status_changed", {"status": "I", "previous": "N"})
+        ]
 
     def test_delete_owned_task(self, setup, api_client):
         email, password = self.ROLE_TO_USER_DATA.get(SystemRole.OPERATOR)
@@ -247,3 +250,273 @@ class TestTasksPermissions(TestTasksBase):
         assert response.status_code == 200
         deleted = Task.objects.filter(id=self.task3.id).first()
         assert not deleted
+
+
+@pytest.mark.django_db
+class TestTasksPagination(TestTasksBase):
+    def test_not_paginated_by_default(self, setup, api_client):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.ADMIN)
+        token = sign_in(api_client, email, password)
+        response = api_client.get("/api/tasks/", headers={"Authorization": f"Bearer {token}"})
+
+        assert isinstance(response.json(), list)
+
+    @pytest.mark.parametrize("ordering", ["-updated_at", "due_date"])
+    def test_not_paginated_ordering(self, setup, api_client, ordering):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.ADMIN)
+        token = sign_in(api_client, email, password)
+        response = api_client.get(
+            "/api/tasks/",
+            data={"ordering": ordering},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        id_ordering = "-id" if ordering.startswith("-") else "id"
+        expected = Task.objects.order_by(ordering, id_ordering)
+        assert [task["id"] for task in response.json()] == [task.id for task in expected]
+
+    @pytest.mark.parametrize("ordering", ["-updated_at", "updated_at", "due_date", "-due_date"])
+    def test_walk_pages(self, setup, api_client, ordering):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.ADMIN)
+        token = sign_in(api_client, email, password)
+
+        seen = []
+        url = "/api/tasks/"
+        params = {"page_size": 2, "ordering": ordering}
+        while url:
+            response = api_client.get(
+                url, data=params, headers={"Authorization": f"Bearer {token}"}
+            )
+            resp_data = response.json()
+            assert response.status_code == 200
+            assert len(resp_data["results"]) <= 2
+            seen.extend(task["id"] for task in resp_data["results"])
+            url, params = resp_data["next"], None
+
+        id_ordering = "-id" if ordering.startswith("-") else "id"
+        expected = Task.objects.order_by(ordering, id_ordering)
+        assert seen == [task.id for task in expected]
+
+    def test_max_page_size(self, setup, api_client, settings):
+        settings.TASKS_MAX_PAGE_SIZE = 1
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.ADMIN)
+        token = sign_in(api_client, email, password)
+        response = api_client.get(
+            "/api/tasks/", data={"page_size": 100}, headers={"Authorization": f"Bearer {token}"}
+        )
+        resp_data = response.json()
+
+        assert len(resp_data["results"]) == 1
+        assert resp_data["next"]
+
+    def test_visibility_applies_to_pages(self, setup, api_client):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.MANAGER)
+        token = sign_in(api_client, email, password)
+        response = api_client.get(
+            "/api/tasks/", data={"page_size": 10}, headers={"Authorization": f"Bearer {token}"}
+        )
+        resp_data = response.json()
+
+        assert [task["id"] for task in resp_data["results"]] == [self.task3.id]
+        assert resp_data["next"] is None
+
+    @pytest.mark.parametrize("params", [{"page_size": 2}, {}])
+    def test_unsupported_ordering(self, setup, api_client, params):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.ADMIN)
+        token = sign_in(api_client, email, password)
+        response = api_client.get(
+            "/api/tasks/",
+            data={**params, "ordering": "title"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestTasksBulk(TestTasksBase):
+    def test_bulk(self, setup, api_client):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.OPERATOR)
+        token = sign_in(api_client, email, password)
+
+        payload = {
+            "create": [
+                {"title": "new task 1", "description": "desc 1"},
+                {"title": "new task 2", "description": "desc 2", "assigned_to": self.manager.id},
+            ],
+            "update": [
+                {"id": self.task2.id, "status": "I", "assigned_to": self.manager.id},
+                {"id": self.task3.id, "title": "renamed"},
+            ],
+            "delete": [self.task3.id],
+        }
+        response = api_client.post(
+            "/api/tasks/bulk/",
+            data=payload,
+            format="json",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        resp_data = response.json()
+
+        assert response.status_code == 200
+        assert [task["title"] for task in resp_data["created"]] == ["new task 1", "new task 2"]
+        assert all(task["created_by"] == self.operator.id for task in resp_data["created"])
+        assert resp_data["deleted"] == [self.task3.id]
+        self.task2.refresh_from_db()
+        assert self.task2.status == "I"
+        assert self.task2.updated_by_id == self.operator.id
+        assert not Task.objects.filter(id=self.task3.id).exists()
+        created_ids = [task["id"] for task in resp_data["created"]]
+        assert list(TaskEvent.objects.order_by("id").values_list("task_id", "kind")) == [
+            (created_ids[0], "created"),
+            (created_ids[1], "created"),
+            (self.task2.id, "assigned"),
+            (self.task2.id, "status_changed"),
+        ]
+
+    def test_bulk_errors_per_item(self, setup, api_client):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.OPERATOR)
+        token = sign_in(api_client, email, password)
+
+        payload = {
+            "create": [
+                {"title": "new task", "description": "desc"},
+                {"title": "new task", "description": "desc", "assigned_to": 0},
+            ],
+            "update": [{"id": self.task1.id, "status": "I"}],
+            "delete": [self.task2.id],
+        }
+        response = api_client.post(
+            "/api/tasks/bulk/",
+            data=payload,
+            format="json",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        resp_data = response.json()
+
+        assert response.status_code == 400
+        assert resp_data["create"][0] == {}
+        assert "assigned_to" in resp_data["create"][1]
+        assert resp_data["update"] == [{"id": ["Not found."]}]
+        assert "delete" not in resp_data
+        assert Task.objects.count() == 3
+
+    def test_bulk_string_ids(self, setup, api_client):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.ADMIN)
+        token = sign_in(api_client, email, password)
+
+        payload = {
+            "create": [
+                {"title": "new task", "description": "desc", "assigned_to": str(self.manager.id)}
+            ],
+            "update": [
+                {"id": str(self.task1.id), "assigned_to": str(self.manager.id)},
+                {"id": "task", "status": "I"},
+            ],
+        }
+        response = api_client.post(
+            "/api/tasks/bulk/",
+            data=payload,
+            format="json",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 400
+        assert response.json() == {"update": [{}, {"id": ["Not found."]}]}
+
+        payload["update"].pop()
+        response = api_client.post(
+            "/api/tasks/bulk/",
+            data=payload,
+            format="json",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        assert Task.objects.get(title="new task").assigned_to_id == self.manager.id
+        assert Task.objects.get(id=self.task1.id).assigned_to_id == self.manager.id
+
+    def test_bulk_query_count(self, setup, api_client, django_assert_max_num_queries):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.ADMIN)
+        token = sign_in(api_client, email, password)
+
+        payload = {
+            "create": [
+                {"title": f"task {i}", "description": "desc", "assigned_to": self.manager.id}
+                for i in range(50)
+            ],
+            "update": [{"id": task.id, "status": "I"} for task in Task.objects.all()],
+        }
+        with django_assert_max_num_queries(8):
+            response = api_client.post(
+                "/api/tasks/bulk/",
+                data=payload,
+                format="json",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+        assert response.status_code == 200
+        assert Task.objects.count() == 53
+
+
+@pytest.mark.django_db
+class TestTasksSearch(TestTasksBase):
+    @pytest.fixture
+    def search_tasks(self, setup):
+        self.report = Task.objects.create(
+            title="Quarterly report",
+            description="collect the numbers",
+            status="I",
+            created_by=self.admin,
+        )
+        self.numbers = Task.objects.create(
+            title="Budget", description="check report numbers", created_by=self.admin
+        )
+
+    @pytest.mark.parametrize(
+        "params, expected",
+        [
+            ({"search": "report"}, ["report", "numbers"]),
+            ({"search": "budget numbers"}, ["numbers"]),
+            ({"search": "quarterli"}, ["report"]),
+            ({"search": "report", "status": "N"}, ["numbers"]),
+            ({"search": "unrelated"}, []),
+            ({"search": "report", "ordering": "updated_at"}, ["report", "numbers"]),
+            ({"search": "report", "ordering": "-updated_at"}, ["numbers", "report"]),
+        ],
+    )
+    def test_search(self, search_tasks, api_client, params, expected):
+        email, password = self.ROLE_TO_USER_DATA.get(SystemRole.ADMIN)
+        token = sign_in(api_client, email, password)
+        response = api_client.get(
+            "/api/tasks/", data=params, headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+        assert [task["id"] for task in response.json()] == [
+            getattr(self, name).id for name in expected
+        ]
+        assert all("search_vector" not in task for task in response.json())
+
+    def test_search_vector_follows_updates(self, search_tasks):
+        self.numbers.title = "Annual plan"
+        self.numbers.description = "nothing else"
+        self.numbers.save()
+
+        query = SearchQuery("numbers", config=TASK_SEARCH_CONFIG)
+        assert list(Task.objects.filter(search_vector=query)) == [self.report]
+
+
+@pytest.mark.django_db
+class TestTasksVisibilityPlan(TestTasksBase):
+    def test_index_driven_plan(self, setup):
+        queryset = Task.objects.filter(status="N").visible_to(self.operator)
+        with transaction.atomic(), connection.cursor() as cursor:
+            # The test table is tiny; make the planner show what it does at scale. Statistics
+            # left behind by earlier tests that truncate the table skew the join choice.
+            cursor.execute("ANALYZE tasks_task")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+
+        assert "task_creator_status_due_idx" in plan
+        assert "task_assignee_status_due_idx" in plan
+        assert "Seq Scan" not in plan
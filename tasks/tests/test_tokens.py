@@ -1,7 +1,11 @@
 import pytest
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
 
+from tasks.authentication import ClaimsUser, StatelessJWTAuthentication
 from tasks.constants import SystemRole
-from tasks.models import User
+from tasks.models import Role, User
+from tasks.tests.conftest import sign_in
 
 
 @pytest.mark.django_db
@@ -52,3 +56,61 @@ class TestTokens:
             "/api/token/", data={"email": self.operator_email, "password": self.operator_password}
         )
         assert response.status_code == 401
+
+
+@pytest.mark.django_db
+class TestStatelessTokens:
+    @pytest.fixture
+    def setup(self):
+        self.admin = User.objects.create_superuser(email="admin@mail.com", password="admin@35762!")
+        self.manager = User.objects.create_user(
+            email="manager@mail.com", password="manager@35762!", roles=[SystemRole.MANAGER]
+        )
+
+    @staticmethod
+    def authenticate(token: str):
+        request = APIRequestFactory().get("/api/tasks/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return StatelessJWTAuthentication().authenticate(request)
+
+    def test_claims(self, setup, api_client):
+        token = AccessToken(sign_in(api_client, "admin@mail.com", "admin@35762!"))
+
+        assert token["roles"] == [SystemRole.ADMIN]
+        assert token["is_active"] is True
+
+    def test_authenticate_without_queries(self, setup, api_client, django_assert_num_queries):
+        token = sign_in(api_client, "manager@mail.com", "manager@35762!")
+
+        with django_assert_num_queries(0):
+            user, _ = self.authenticate(token)
+            assert isinstance(user, ClaimsUser)
+            assert user.id == self.manager.id
+            assert not user.is_admin
+
+        assert user.instance == self.manager
+
+    def test_refresh_picks_up_role_change(self, setup, api_client):
+        response = api_client.post(
+            "/api/token/", data={"email": "manager@mail.com", "password": "manager@35762!"}
+        )
+        self.manager.roles.add(Role.objects.get(name=SystemRole.ADMIN))
+
+        response = api_client.post(
+            "/api/token/refresh/", data={"refresh": response.json()["refresh"]}
+        )
+        user, _ = self.authenticate(response.json()["access"])
+
+        assert response.status_code == 200
+        assert user.is_admin
+
+    def test_refresh_for_deactivated_user(self, setup, api_client):
+        response = api_client.post(
+            "/api/token/", data={"email": "manager@mail.com", "password": "manager@35762!"}
+        )
+        User.objects.filter(id=self.manager.id).update(is_active=False)
+
+        response = api_client.post(
+            "/api/token/refresh/", data={"refresh": response.json()["refresh"]}
+        )
+
+        assert response.status_code == 401
@@ -1,11 +1,14 @@
 from django.urls import path
 
 from .views.roles import RoleDetailView, RoleListView
-from .views.tasks import TaskDetailView, TaskListView
+from .views.tasks import TaskBulkView, TaskDetailView, TaskExportView, TaskListView, TaskStatsView
 from .views.users import UserDetailView, UserListView
 
 urlpatterns = [
     path("tasks/", TaskListView.as_view(), name="tasks_list"),
+    path("tasks/export/", TaskExportView.as_view(), name="tasks_export"),
+    path("tasks/bulk/", TaskBulkView.as_view(), name="tasks_bulk"),
+    path("tasks/stats/", TaskStatsView.as_view(), name="tasks_stats"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task_detail"),
     path("users/", UserListView.as_view(), name="user_list"),
     path("users/<int:pk>/", UserDetailView.as_view(), name="user_detail"),
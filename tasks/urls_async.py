@@ -0,0 +1,23 @@
+from django.urls import path
+
+from .views.roles import AsyncRoleDetailView, AsyncRoleListView
+from .views.tasks import (
+    AsyncTaskDetailView,
+    AsyncTaskExportView,
+    AsyncTaskListView,
+    TaskBulkView,
+    TaskStatsView,
+)
+from .views.users import AsyncUserDetailView, AsyncUserListView
+
+urlpatterns = [
+    path("tasks/", AsyncTaskListView.as_view(), name="tasks_list"),
+    path("tasks/export/", AsyncTaskExportView.as_view(), name="tasks_export"),
+    path("tasks/bulk/", TaskBulkView.as_view(), name="tasks_bulk"),
+    path("tasks/stats/", TaskStatsView.as_view(), name="tasks_stats"),
+    path("tasks/<int:pk>/", AsyncTaskDetailView.as_view(), name="task_detail"),
+    path("users/", AsyncUserListView.as_view(), name="user_list"),
+    path("users/<int:pk>/", AsyncUserDetailView.as_view(), name="user_detail"),
+    path("roles/", AsyncRoleListView.as_view(), name="role_list"),
+    path("roles/<int:pk>/", AsyncRoleDetailView.as_view(), name="role_detail"),
+]
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from tasks.metrics import gauge, render
+from tasks.outbox import relay_lag
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Metrics of all the processes serving the app in the Prometheus text format."""
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not constant_time_compare(request.headers.get("Authorization", ""), expected):
+            return HttpResponse(status=401)
+
+    lag = relay_lag()
+    extra = [
+        *gauge("tasks_outbox_pending", "Task events not published yet.", lag["pending"]),
+        *gauge(
+            "tasks_outbox_lag_seconds",
+            "Age of the oldest unpublished task event.",
+            lag["lag_seconds"],
+        ),
+    ]
+    return HttpResponse(render(extra), content_type=CONTENT_TYPE)
@@ -0,0 +1,358 @@
+import hashlib
+from datetime import datetime
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, QuerySet
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from tasks.cache import (
+    get_cached_response,
+    get_generations,
+    response_cache_key,
+    set_cached_response,
+    version_age,
+)
+from tasks.metrics import measure_serialization
+from tasks.representation import ValuesRepresentation
+from tasks.routers import is_sticky, replica_reads
+from tasks.serializers import plan_related
+
+
+class ResponseCacheMixin:
+    """
+    Caches list responses per visibility scope and query parameters.
+
+    Keys embed the generations of ``cache_models``; saving or deleting any of those models
+    bumps its generation, so stale entries are never read again and simply expire.
+    """
+
+    cache_models: tuple[type[Model], ...] = ()
+
+    def get_cache_scope(self) -> str:
+        if self.request.user.is_admin:
+            return "admin"
+        return f"user:{self.request.user.id}"
+
+    def get_cache_key_parts(self) -> tuple:
+        return ()
+
+    def get_response_cache_key(self, request) -> str:
+        models = dict.fromkeys([*self.cache_models, *getattr(self, "related_models", ())])
+        return response_cache_key(
+            type(self).__name__,
+            self.get_cache_scope(),
+            [*get_generations(*models), *self.get_cache_key_parts()],
+            request,
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(self, "use_response_cache", True):
+            return super().list(request, *args, **kwargs)
+
+        view = type(self).__name__
+        key = self.get_response_cache_key(request)
+        data = get_cached_response(view, key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_cached_response(key, response.data)
+
+        return response
+
+
+class ConditionalGetMixin:
+    """Strong ETag and Last-Modified validators; a match returns 304 before serialization."""
+
+    def get_etag(self, *parts) -> str:
+        # Expanded relations change without touching the validators of the rows themselves.
+        related_models = getattr(self, "related_models", ())
+        if related_models:
+            parts = (*parts, *get_generations(*related_models))
+
+        raw = repr(
+            (
+                type(self).__name__,
+                self.request.user.id,
+                self.request.accepted_media_type,
+                self.request.get_full_path(),
+                *parts,
+            )
+        )
+        return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+    def get_not_modified_response(
+        self, etag: str, last_modified: datetime | None
+    ) -> HttpResponseBase | None:
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+
+    @staticmethod
+    def set_validators(
+        response: HttpResponseBase, etag: str, last_modified: datetime | None
+    ) -> HttpResponseBase:
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(int(last_modified.timestamp()))
+
+        return response
+
+    def conditional_response(
+        self,
+        etag: str,
+        last_modified: datetime | None,
+        build_response: Callable[[], HttpResponseBase],
+    ) -> HttpResponseBase:
+        not_modified = self.get_not_modified_response(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        with measure_serialization():
+            response = build_response()
+        return self.set_validators(response, etag, last_modified)
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """
+    List ETags made of the generations of ``cache_models`` and of the expanded relations.
+
+    Every write to those models bumps a generation, so a 304 or a cache hit reads no rows.
+    Lists send no Last-Modified: deletes and changes that don't touch ``updated_at`` would
+    leave it in place.
+    """
+
+    cache_models: tuple[type[Model], ...] = ()
+
+    def get_list_etag_parts(self) -> tuple:
+        return ()
+
+    def get_list_generations(self) -> list[str]:
+        # Call after filter_queryset(), which finds the expanded relations.
+        models = dict.fromkeys([*self.cache_models, *getattr(self, "related_models", ())])
+        return get_generations(*models)
+
+    def get_list_etag(self) -> str | None:
+        """The ETag, or None while a replica read may predate the last generation bump."""
+        generations = self.get_list_generations()
+        if replica_may_lag(generations):
+            self.use_response_cache = False
+            return None
+        return self.get_etag(*generations, *self.get_list_etag_parts())
+
+    def list(self, request, *args, **kwargs):
+        self.filter_queryset(self.get_queryset())
+        etag = self.get_list_etag()
+        if etag is None:
+            with measure_serialization():
+                return super().list(request, *args, **kwargs)
+
+        return self.conditional_response(
+            etag, None, lambda: super(ConditionalListMixin, self).list(request, *args, **kwargs)
+        )
+
+
+def replica_may_lag(generations: list[str]) -> bool:
+    """
+    Whether rows read from a replica may be older than the newest of ``generations``.
+
+    Replicas are assumed to lag at most ``REPLICA_STICKY_SECONDS``, as for read-your-writes;
+    within that window a replica response must not be stored under the new generation.
+    """
+    return replica_reads.get() and any(
+        version_age(generation) < settings.REPLICA_STICKY_SECONDS for generation in generations
+    )
+
+
+class AsyncAPIViewMixin:
+    """
+    Turns a DRF view into a coroutine view served without a thread under ASGI.
+
+    Authentication, permissions and throttling are sync-only in DRF and run through
+    ``sync_to_async``; handlers are expected to be ``async def``.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # DRF's csrf_exempt wrapper is a plain function.
+        markcoroutinefunction(view)
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncListMixin:
+    """Coroutine ``get`` for list views built on the conditional and response cache mixins."""
+
+    async def get(self, request, *args, **kwargs):
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        etag = await sync_to_async(self.get_list_etag)()
+        if etag is None:
+            with measure_serialization():
+                return Response(await self.get_list_data(queryset))
+
+        not_modified = self.get_not_modified_response(etag, None)
+        if not_modified is not None:
+            return not_modified
+
+        view = type(self).__name__
+        key = await sync_to_async(self.get_response_cache_key)(request)
+        data = await sync_to_async(get_cached_response)(view, key)
+        if data is None:
+            with measure_serialization():
+                data = await self.get_list_data(queryset)
+            await sync_to_async(set_cached_response)(key, data)
+
+        return self.set_validators(Response(data), etag, None)
+
+    async def get_list_data(self, queryset: QuerySet):
+        # The querysets must load everything the serializer reads, it can't query lazily here.
+        representation = None
+        if isinstance(self, ValuesListMixin) and settings.LIST_VALUES_SERIALIZATION:
+            representation = self.get_representation()
+        if representation is not None:
+            queryset = self.get_values_queryset(queryset, representation)
+            to_representation = representation.ato_representation
+        else:
+            to_representation = self.ato_representation
+
+        paginator = self.paginator
+        if paginator is not None:
+            page_queryset = paginator.get_page_queryset(queryset, self.request)
+            if page_queryset is not None:
+                page = paginator.set_page([obj async for obj in page_queryset])
+                data = await to_representation(page)
+                return paginator.get_paginated_response(data).data
+
+        return await to_representation([obj async for obj in queryset])
+
+    async def ato_representation(self, instances: list) -> list:
+        return self.get_serializer(instances, many=True).data
+
+
+class ReplicaReadMixin:
+    """Serves read-only requests from a replica unless the user has written recently."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and not is_sticky(request.user.id)
+        ):
+            replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        replica_reads.set(False)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ValuesListMixin:
+    """
+    Serves list responses from ``values()`` rows instead of serializer instances.
+
+    The output is the one of ``serializer_class``; see ``ValuesRepresentation``.
+    """
+
+    def get_representation(self) -> ValuesRepresentation | None:
+        serializer = self.get_serializer()
+        # Expanded relations are nested serializers; those are served from instances.
+        if any(
+            isinstance(field, serializers.BaseSerializer) for field in serializer.fields.values()
+        ):
+            return None
+        return ValuesRepresentation(serializer)
+
+    def get_values_queryset(
+        self, queryset: QuerySet, representation: ValuesRepresentation
+    ) -> QuerySet:
+        # Columns read by the view itself, e.g. the pagination key, come along.
+        required = getattr(self, "required_fields", ("id",))
+        columns = dict.fromkeys([*required, *representation.columns])
+        return queryset.prefetch_related(None).values(*columns)
+
+    def list(self, request, *args, **kwargs):
+        representation = self.get_representation() if settings.LIST_VALUES_SERIALIZATION else None
+        if representation is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.get_values_queryset(
+            self.filter_queryset(self.get_queryset()), representation
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(representation.to_representation(page))
+
+        return Response(representation.to_representation(list(queryset)))
+
+
+class NarrowQuerysetMixin:
+    """
+    Loads only the columns behind the fields picked by ``?fields=`` and ``?exclude=``, and
+    joins or prefetches the relations the serializer reads; see ``plan_related``.
+    """
+
+    # Columns the view reads itself besides the serialized fields.
+    required_fields: tuple[str, ...] = ("id",)
+
+    def narrow_queryset(self, queryset: QuerySet) -> QuerySet:
+        serializer = self.serializer_class(context={"request": self.request})
+        plan = plan_related(serializer)
+        self.related_models = plan.models
+        if plan.select_related:
+            queryset = queryset.select_related(*plan.select_related)
+        if plan.prefetch_related:
+            queryset = queryset.prefetch_related(*plan.prefetch_related)
+
+        if not {"fields", "exclude"} & self.request.query_params.keys():
+            return queryset
+
+        columns = [
+            field.source
+            for field in serializer.fields.values()
+            if self.is_column(queryset.model, field.source)
+        ]
+        return queryset.only(*self.required_fields, *columns)
+
+    @staticmethod
+    def is_column(model: type[Model], name: str) -> bool:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return field.concrete and not field.many_to_many
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        # List views; detail views narrow the queryset of their GET lookup.
+        return self.narrow_queryset(super().filter_queryset(queryset))
@@ -1,3 +1,4 @@
+from asgiref.sync import sync_to_async
 from django.db.models import QuerySet
 from django.http import Http404
 from rest_framework import permissions
@@ -8,11 +9,29 @@ from rest_framework.views import APIView
 from tasks.models import Role
 from tasks.permissions import IsAdminOnly
 from tasks.serializers import RoleCreateSerializer, RoleSerializer
+from tasks.views.mixins import (
+    AsyncAPIViewMixin,
+    AsyncListMixin,
+    ConditionalGetMixin,
+    ConditionalListMixin,
+    NarrowQuerysetMixin,
+    ReplicaReadMixin,
+    ResponseCacheMixin,
+    ValuesListMixin,
+)
 
 
-class RoleListView(ListAPIView):
+class RoleListView(
+    ReplicaReadMixin,
+    ConditionalListMixin,
+    ResponseCacheMixin,
+    NarrowQuerysetMixin,
+    ValuesListMixin,
+    ListAPIView,
+):
     permission_classes = [IsAdminOnly, permissions.IsAuthenticated]
     serializer_class = RoleSerializer
+    cache_models = (Role,)
 
     def post(self, request):
         serializer = RoleCreateSerializer(data=request.data)
@@ -25,30 +44,36 @@ class RoleListView(ListAPIView):
         return Role.objects.all()
 
 
-class RoleDetailView(APIView):
+class RoleDetailView(ReplicaReadMixin, ConditionalGetMixin, NarrowQuerysetMixin, APIView):
     permission_classes = [IsAdminOnly, permissions.IsAuthenticated]
+    serializer_class = RoleSerializer
+    required_fields = ("id", "updated_at")
 
     @staticmethod
-    def get_role_or_404(pk: int):
+    def get_role_or_404(pk: int, queryset: QuerySet | None = None):
+        queryset = Role.objects.all() if queryset is None else queryset
         try:
-            role = Role.objects.get(id=pk)
+            role = queryset.get(id=pk)
         except Role.DoesNotExist:
             raise Http404
 
         return role
 
     def get(self, request, pk: int):
-        role = self.get_role_or_404(pk)
+        role = self.get_role_or_404(pk, self.narrow_queryset(Role.objects.all()))
         self.check_object_permissions(request, role)
-        response_data = RoleSerializer(role).data
-        return Response(response_data)
+        return self.conditional_response(
+            self.get_etag(role.pk, role.updated_at),
+            role.updated_at,
+            lambda: Response(RoleSerializer(role, context={"request": request}).data),
+        )
 
     def post(self, request, pk: int):
         role = self.get_role_or_404(pk)
         self.check_object_permissions(request, role)
         serializer = RoleCreateSerializer(role, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save(updated_by=request.user)
+        serializer.save(updated_by_id=request.user.id)
         return Response(serializer.data, status=200)
 
     def delete(self, request, pk: int):
@@ -57,3 +82,29 @@ class RoleDetailView(APIView):
         role.delete()
         response_data = RoleSerializer(role).data
         return Response(response_data)
+
+
+class AsyncRoleListView(AsyncAPIViewMixin, AsyncListMixin, RoleListView):
+    async def post(self, request):
+        return await sync_to_async(super().post)(request)
+
+
+class AsyncRoleDetailView(AsyncAPIViewMixin, RoleDetailView):
+    async def get(self, request, pk: int):
+        try:
+            role = await self.narrow_queryset(Role.objects.all()).aget(id=pk)
+        except Role.DoesNotExist:
+            raise Http404
+
+        await sync_to_async(self.check_object_permissions)(request, role)
+        return self.conditional_response(
+            self.get_etag(role.pk, role.updated_at),
+            role.updated_at,
+            lambda: Response(RoleSerializer(role, context={"request": request}).data),
+        )
+
+    async def post(self, request, pk: int):
+        return await sync_to_async(super().post)(request, pk)
+
+    async def delete(self, request, pk: int):
+        return await sync_to_async(super().delete)(request, pk)
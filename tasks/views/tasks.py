@@ -1,70 +1,221 @@
-from django.db.models import Q, QuerySet
+import copy
+from typing import AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.http import Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions
-from rest_framework.generics import ListAPIView
+from rest_framework.generics import GenericAPIView, ListAPIView
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from tasks.filters import TaskFilter
-from tasks.helpers import celery_send_email
-from tasks.models import Task
+from tasks.export import EXPORT_FIELDS, STREAMS, aiterate, stream_queryset
+from tasks.filters import TaskFilter, TaskWithArchivedFilter
+from tasks.models import ArchivedTask, Task, TaskWithArchived, User
+from tasks.outbox import record_events, task_events
+from tasks.pagination import TaskKeysetPagination
 from tasks.permissions import IsOwnerOrAssignedOrAdminOnly
-from tasks.serializers import TaskCreateSerializer, TaskSerializer
+from tasks.renderers import CSVRenderer, NDJSONRenderer
+from tasks.serializers import TaskBulkSerializer, TaskCreateSerializer, TaskSerializer
+from tasks.stats import task_stats
+from tasks.views.mixins import (
+    AsyncAPIViewMixin,
+    AsyncListMixin,
+    ConditionalGetMixin,
+    ConditionalListMixin,
+    NarrowQuerysetMixin,
+    ReplicaReadMixin,
+    ResponseCacheMixin,
+    ValuesListMixin,
+)
 
 
-class TaskListView(ListAPIView):
+class TaskListView(
+    ReplicaReadMixin,
+    ConditionalListMixin,
+    ResponseCacheMixin,
+    NarrowQuerysetMixin,
+    ValuesListMixin,
+    ListAPIView,
+):
     serializer_class = TaskSerializer
+    # Read by the keyset pagination.
+    required_fields = ("id", "updated_at", "due_date")
+    # Deleting a user nulls assigned_to without Task signals.
+    cache_models = (Task, User)
     filter_backends = (DjangoFilterBackend,)
-    filterset_class = TaskFilter
+    pagination_class = TaskKeysetPagination
+
+    @property
+    def include_archived(self) -> bool:
+        return self.request.query_params.get("include_archived") in ("1", "true")
+
+    @property
+    def filterset_class(self):
+        return TaskWithArchivedFilter if self.include_archived else TaskFilter
 
     def get_queryset(self) -> QuerySet:
-        tasks = Task.objects.all()
-        if not self.request.user.is_admin:
-            tasks = tasks.filter(
-                Q(created_by=self.request.user) | Q(assigned_to=self.request.user)
-            )
+        if self.include_archived:
+            return TaskWithArchived.objects.all()
+        return Task.objects.all()
 
-        return tasks
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        queryset = super().filter_queryset(queryset).visible_to(self.request.user)
+        if self.paginator.is_requested(self.request):
+            return queryset
+        return self.paginator.order_unpaginated(queryset, self.request)
 
     def post(self, request):
         serializer = TaskCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save(created_by=self.request.user)
+        with transaction.atomic():
+            task = serializer.save(created_by_id=self.request.user.id)
+            record_events(task_events(task))
 
         return Response(serializer.data, status=201)
 
 
-class TaskDetailView(APIView):
+class TaskExportView(ReplicaReadMixin, GenericAPIView):
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = TaskFilter
+    renderer_classes = (NDJSONRenderer, CSVRenderer)
+
+    def get_queryset(self) -> QuerySet:
+        return Task.objects.all()
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        return super().filter_queryset(queryset).visible_to(self.request.user)
+
+    def get(self, request):
+        return self.streaming_response(request, self.stream(request))
+
+    def stream(self, request) -> Iterator[str]:
+        # Rows are streamed through a server-side cursor, so neither memory nor the time to
+        # the first row depend on the size of the export. They are read after the view
+        # returns, so the database is pinned while replica reads are enabled.
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = stream_queryset(
+            queryset.using(queryset.db).order_by("id").values_list(*EXPORT_FIELDS),
+            settings.TASKS_EXPORT_CHUNK_SIZE,
+        )
+        return STREAMS[request.accepted_renderer.format](rows)
+
+    @staticmethod
+    def streaming_response(request, content: Iterator[str] | AsyncIterator[str]):
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            content, content_type=f"{renderer.media_type}; charset=utf-8"
+        )
+        response["Content-Disposition"] = f'attachment; filename="tasks.{renderer.format}"'
+        return response
+
+
+class TaskStatsView(ReplicaReadMixin, APIView):
+    def get(self, request):
+        return Response(task_stats(request.user))
+
+
+class TaskBulkView(APIView):
+    def post(self, request):
+        serializer = TaskBulkSerializer(data=request.data, context={"request": request})
+        with transaction.atomic():
+            serializer.is_valid(raise_exception=True)
+            response_data = serializer.save()
+
+        return Response(response_data, status=200)
+
+
+class TaskDetailView(ReplicaReadMixin, ConditionalGetMixin, NarrowQuerysetMixin, APIView):
     permission_classes = [IsOwnerOrAssignedOrAdminOnly, permissions.IsAuthenticated]
+    serializer_class = TaskSerializer
+    # Read by the permission check and the validators.
+    required_fields = ("id", "created_by", "assigned_to", "updated_at")
+
+    @staticmethod
+    def get_task_or_404(pk: int, queryset: QuerySet | None = None):
+        queryset = Task.objects.all() if queryset is None else queryset
+        try:
+            task = queryset.get(id=pk)
+        except queryset.model.DoesNotExist:
+            raise Http404
+
+        return task
 
     def get(self, request, pk: int):
-        task = Task.objects.get(id=pk)
+        try:
+            task = self.narrow_queryset(Task.objects.all()).get(id=pk)
+        except Task.DoesNotExist:
+            # Archived tasks are served read-only.
+            task = self.get_task_or_404(pk, self.narrow_queryset(ArchivedTask.objects.all()))
         self.check_object_permissions(request, task)
-        response_data = TaskSerializer(task).data
-        return Response(response_data)
+        return self.conditional_response(
+            self.get_etag(task.pk, task.updated_at),
+            task.updated_at,
+            lambda: Response(TaskSerializer(task, context={"request": request}).data),
+        )
 
     def post(self, request, pk: int):
-        task = Task.objects.get(id=pk)
-        initial_assigned = task.assigned_to
+        with transaction.atomic():
+            # The lock keeps the archive job from moving the task away between the read and
+            # the save, which would insert it again.
+            task = self.get_task_or_404(pk, Task.objects.select_for_update())
+            previous = copy.copy(task)
 
-        self.check_object_permissions(request, task)
-        serializer = TaskCreateSerializer(task, data=request.data, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(updated_by=request.user)
-
-        if assigned_to := serializer.validated_data.get("assigned_to"):
-            if assigned_to != initial_assigned:
-                celery_send_email.delay(
-                    subject="You have been assigned a new task",
-                    message=f"Task id - {task.id}",
-                    target_mail=assigned_to.email,
-                )
+            self.check_object_permissions(request, task)
+            serializer = TaskCreateSerializer(task, data=request.data, partial=True)
+            serializer.is_valid(raise_exception=True)
+            serializer.save(updated_by_id=request.user.id)
+            record_events(task_events(task, previous))
 
         return Response(serializer.data, status=200)
 
     def delete(self, request, pk: int):
-        task = Task.objects.get(id=pk)
+        task = self.get_task_or_404(pk)
         self.check_object_permissions(request, task)
         task.delete()
         response_data = TaskSerializer(task).data
         return Response(response_data)
+
+
+# Writes need transactions and DRF serializers, which are sync-only, so the async views run
+# the sync write handlers in a worker thread and serve reads from the async ORM.
+
+
+class AsyncTaskListView(AsyncAPIViewMixin, AsyncListMixin, TaskListView):
+    async def post(self, request):
+        return await sync_to_async(super().post)(request)
+
+
+class AsyncTaskExportView(AsyncAPIViewMixin, TaskExportView):
+    async def get(self, request):
+        content = await sync_to_async(self.stream)(request)
+        return self.streaming_response(
+            request, aiterate(content, settings.TASKS_EXPORT_CHUNK_SIZE)
+        )
+
+
+class AsyncTaskDetailView(AsyncAPIViewMixin, TaskDetailView):
+    async def get(self, request, pk: int):
+        try:
+            task = await self.narrow_queryset(Task.objects.all()).aget(id=pk)
+        except Task.DoesNotExist:
+            try:
+                task = await self.narrow_queryset(ArchivedTask.objects.all()).aget(id=pk)
+            except ArchivedTask.DoesNotExist:
+                raise Http404
+
+        await sync_to_async(self.check_object_permissions)(request, task)
+        return self.conditional_response(
+            self.get_etag(task.pk, task.updated_at),
+            task.updated_at,
+            lambda: Response(TaskSerializer(task, context={"request": request}).data),
+        )
+
+    async def post(self, request, pk: int):
+        return await sync_to_async(super().post)(request, pk)
+
+    async def delete(self, request, pk: int):
+        return await sync_to_async(super().delete)(request, pk)
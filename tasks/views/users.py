@@ -1,3 +1,4 @@
+from asgiref.sync import sync_to_async
 from django.db.models import QuerySet
 from django.http import Http404
 from django_filters.rest_framework import DjangoFilterBackend
@@ -8,19 +9,39 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from tasks.filters import UserFilter
-from tasks.models import User
+from tasks.models import Role, User
 from tasks.permissions import IsAdminOnly, IsOwnerOrAdminOnly
+from tasks.role_cache import role_cache
 from tasks.serializers import (
     UserCreateSerializer,
     UserSerializer,
     UserUpdateAdminSerializer,
     UserUpdateSerializer,
 )
+from tasks.views.mixins import (
+    AsyncAPIViewMixin,
+    AsyncListMixin,
+    ConditionalGetMixin,
+    ConditionalListMixin,
+    NarrowQuerysetMixin,
+    ReplicaReadMixin,
+    ResponseCacheMixin,
+    ValuesListMixin,
+)
 
 
-class UserListView(ListAPIView):
+class UserListView(
+    ReplicaReadMixin,
+    ConditionalListMixin,
+    ResponseCacheMixin,
+    NarrowQuerysetMixin,
+    ValuesListMixin,
+    ListAPIView,
+):
     permission_classes = [IsAdminOnly, permissions.IsAuthenticated]
     serializer_class = UserSerializer
+    # Deleting a role drops it from users without m2m signals.
+    cache_models = (User, Role)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = UserFilter
 
@@ -34,24 +55,35 @@ class UserListView(ListAPIView):
     def get_queryset(self) -> QuerySet:
         return User.objects.filter(is_active=True)
 
+    def get_list_etag_parts(self) -> tuple:
+        # Role changes don't touch updated_at; the role cache version covers them.
+        return (role_cache.version,)
+
 
-class UserDetailView(APIView):
+class UserDetailView(ReplicaReadMixin, ConditionalGetMixin, NarrowQuerysetMixin, APIView):
     permission_classes = [IsOwnerOrAdminOnly, permissions.IsAuthenticated]
+    serializer_class = UserSerializer
+    required_fields = ("id", "updated_at")
 
     @staticmethod
-    def get_user_or_404(pk: int):
+    def get_user_or_404(pk: int, queryset: QuerySet | None = None):
+        queryset = User.objects.all() if queryset is None else queryset
         try:
-            user = User.objects.get(id=pk, is_active=True)
+            user = queryset.get(id=pk, is_active=True)
         except User.DoesNotExist:
             raise Http404
 
         return user
 
     def get(self, request, pk: int):
-        user = self.get_user_or_404(pk)
+        user = self.get_user_or_404(pk, self.narrow_queryset(User.objects.all()))
         self.check_object_permissions(request, user)
-        response_data = UserSerializer(user).data
-        return Response(response_data)
+        # Role changes don't touch updated_at; the role cache version covers them.
+        return self.conditional_response(
+            self.get_etag(user.pk, user.updated_at, role_cache.version),
+            user.updated_at,
+            lambda: Response(UserSerializer(user, context={"request": request}).data),
+        )
 
     def post(self, request, pk: int):
         user = self.get_user_or_404(pk)
@@ -62,7 +94,7 @@ class UserDetailView(APIView):
             serializer = UserUpdateSerializer(user, data=request.data, partial=True)
 
         serializer.is_valid(raise_exception=True)
-        serializer.save(updated_by=request.user)
+        serializer.save(updated_by_id=request.user.id)
         return Response(serializer.data, status=200)
 
     def delete(self, request, pk: int):
@@ -71,9 +103,36 @@ class UserDetailView(APIView):
 
         user = self.get_user_or_404(pk)
         user.is_active = False
-        user.updated_by = request.user
+        user.updated_by_id = request.user.id
         user.save()
 
         updated = User.objects.get(id=user.id)
         response_data = UserSerializer(updated).data
         return Response(response_data)
+
+
+class AsyncUserListView(AsyncAPIViewMixin, AsyncListMixin, UserListView):
+    async def post(self, request):
+        return await sync_to_async(super().post)(request)
+
+
+class AsyncUserDetailView(AsyncAPIViewMixin, UserDetailView):
+    async def get(self, request, pk: int):
+        try:
+            user = await self.narrow_queryset(User.objects.all()).aget(id=pk, is_active=True)
+        except User.DoesNotExist:
+            raise Http404
+
+        await sync_to_async(self.check_object_permissions)(request, user)
+        version = await sync_to_async(getattr)(role_cache, "version")
+        return self.conditional_response(
+            self.get_etag(user.pk, user.updated_at, version),
+            user.updated_at,
+            lambda: Response(UserSerializer(user, context={"request": request}).data),
+        )
+
+    async def post(self, request, pk: int):
+        return await sync_to_async(super().post)(request, pk)
+
+    async def delete(self, request, pk: int):
+        return await sync_to_async(super().delete)(request, pk)